@@ -0,0 +1,115 @@
+# memori_sesi.py
+#
+# Profil memori per sesi halaman PDSPKP (tracemalloc): byte puncak satu
+# rerun (figure cache kosong / terisi) dan byte yang tetap dipegang sesi
+# (hasil siapkan_data) di atas data publish atau data sintetis.
+#
+#     python benchmarks/memori_sesi.py                  # data publish
+#     python benchmarks/memori_sesi.py --sizes 1e5 1e6  # data sintetis
+#
+# Struktur bersama proses (DataFrame, FilterIndex, cube, metrik) dibangun
+# sebelum pengukuran, sehingga yang terukur hanya biaya per sesi.
+
+import os
+import sys
+import gc
+import json
+import argparse
+import tempfile
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BENCH_DIR)
+
+from synth import buat_data_upi  # noqa: E402 (menambah src ke sys.path)
+
+from LIB import data_loader  # noqa: E402
+from LIB.data_loader import DATA_PATH, load_data_upi  # noqa: E402
+from LIB.figure_cache import FIGURE_CACHE  # noqa: E402
+from LIB.pdspkp import siapkan_data, bangun_figure_default  # noqa: E402
+
+
+def daftarkan_sintetis(n_rows, tmp_dir, seed=0):
+    """
+    Dataset sintetis sebagai snapshot Arrow yang valid untuk file
+    sumber tiruan, sehingga ``load_data_upi(path)`` memakainya tanpa
+    mem-parse Excel.
+    """
+    path = os.path.join(tmp_dir, f"sintetis_{n_rows}.xlsx")
+    with open(path, "wb") as f:
+        f.write(b"sintetis")
+
+    df = buat_data_upi(n_rows, seed=seed)
+    snapshot_path, meta_path = data_loader._snapshot_paths(path, tmp_dir)
+    data_loader._write_snapshot(df, snapshot_path)
+    mtime_ns, size = data_loader._stat_key(path)
+    data_loader._write_meta(meta_path, {
+        "source": os.path.basename(path),
+        "mtime_ns": mtime_ns,
+        "size": size,
+        "sha256": f"sintetis-{n_rows}-{seed}",
+        "schema_version": data_loader.SCHEMA_VERSION,
+    })
+    load_data_upi(path, cache_dir=tmp_dir)
+    return path
+
+
+def _puncak(fungsi):
+    """(byte puncak, byte tersisa, hasil) selama ``fungsi()``."""
+    gc.collect()
+    tracemalloc.reset_peak()
+    awal, _ = tracemalloc.get_traced_memory()
+    hasil = fungsi()
+    sekarang, puncak = tracemalloc.get_traced_memory()
+    return puncak - awal, sekarang - awal, hasil
+
+
+def ukur_sesi(path):
+    """Byte per sesi untuk satu dataset."""
+    # struktur bersama + figure default sekali (tidak ikut diukur)
+    bangun_figure_default(path)
+
+    FIGURE_CACHE.clear()
+    tracemalloc.start()
+    try:
+        dingin, _, _ = _puncak(lambda: bangun_figure_default(path))
+        hangat, _, _ = _puncak(lambda: bangun_figure_default(path))
+        _, dipegang, data = _puncak(lambda: siapkan_data(path=path))
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "n_rows": len(data["df"]),
+        "rerun_dingin": dingin,
+        "rerun_hangat": hangat,
+        "dipegang_sesi": dipegang,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profil memori per sesi halaman PDSPKP")
+    parser.add_argument("--sizes", nargs="*", default=[],
+                        help="jumlah baris data sintetis; kosong = data publish")
+    parser.add_argument("--output", default=None, help="file JSON hasil (opsional)")
+    args = parser.parse_args(argv)
+
+    hasil = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n in args.sizes or [None]:
+            path = DATA_PATH if n is None else daftarkan_sintetis(int(float(n)), tmp_dir)
+            baris = {"data": os.path.basename(path), **ukur_sesi(path)}
+            hasil.append(baris)
+            print(f"  {baris['data']:<32} {baris['n_rows']:>10,} baris"
+                  f"   rerun dingin {baris['rerun_dingin'] / 2**20:8.2f} MiB"
+                  f"   hangat {baris['rerun_hangat'] / 2**20:8.2f} MiB"
+                  f"   dipegang {baris['dipegang_sesi'] / 2**20:8.2f} MiB", flush=True)
+            data_loader.clear_cache()
+            FIGURE_CACHE.clear()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(hasil, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,456 @@
+# run_bench.py
+#
+# Benchmark jalur panas dashboard (builder chart, top-5, parse produksi,
+# kaskade filter sidebar) di atas data sintetis (synth.py).
+#
+#     python benchmarks/run_bench.py                       # 1e3 & 1e5 baris
+#     python benchmarks/run_bench.py --sizes 1e3 1e5 1e7   # + 1e7 (lama, RAM besar)
+#     python benchmarks/run_bench.py --filter tren --repeat 10
+#     python benchmarks/run_bench.py --compare lama.json baru.json
+#     python benchmarks/run_bench.py --payload             # + ukuran JSON figure penuh vs ringan
+#
+# Hasil disimpan sebagai JSON (default benchmarks/results/<commit>.json)
+# sehingga dua commit bisa dibandingkan dengan --compare.
+
+import os
+import sys
+import gc
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.append(BENCH_DIR)
+
+from synth import buat_data_upi, buat_kolom_produksi, buat_data_bedah  # noqa: E402 (menambah src ke sys.path)
+
+import plotly  # noqa: E402
+import plotly.io as pio  # noqa: E402
+
+from LIB.charts import (  # noqa: E402
+    plot_upi_per_kecamatan, plot_upi_jenis_proses_jenis_ikan_catplot,
+    donut_plot_kategori, donut_plot_binary, value_count_top5_with_others,
+    donut_plot_kategori_agregat, plot_tren_produksi_total, plot_bedah_upi_stack,
+    plot_line_chart, plot_produksi_stack_tahun, parse_produksi, parse_produksi_kolom,
+    value_count_top_k_with_others
+)
+from LIB.bedah_upi import IndeksNama, perkaya_bedah  # noqa: E402
+from LIB.cube import ProductionCube  # noqa: E402
+from LIB.data_loader import _buka_snapshot, _write_snapshot  # noqa: E402
+from LIB.downsample import kurangi_tren  # noqa: E402
+from LIB.figure_ringan import ke_figure, ringkas_figure, json_streamlit  # noqa: E402
+from LIB.filter_index import FilterIndex  # noqa: E402
+from LIB.filter_pipeline import FilterPipeline  # noqa: E402
+from LIB.metrics import HeadlineMetrics, KOLOM_METRIK  # noqa: E402
+from LIB.pdspkp import KOLOM_HALAMAN  # noqa: E402
+
+
+# ============================================================
+# KONFIGURASI
+# ============================================================
+UKURAN_DEFAULT = ["1e3", "1e5"]
+# (n_kecamatan, n_desa)
+KARDINALITAS_DEFAULT = ["10x47", "100x2000"]
+
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+
+# ============================================================
+# KONTEKS PER UKURAN DATA
+# ============================================================
+def siapkan_konteks(n_rows, n_kecamatan, n_desa, seed=0):
+    """Data sintetis + struktur turunan yang dipakai kasus benchmark."""
+    df = buat_data_upi(n_rows, n_kecamatan=n_kecamatan, n_desa=n_desa, seed=seed)
+    filter_index = FilterIndex(df)
+    cube = ProductionCube(df)
+
+    kecamatan = filter_index.kategori("KECAMATAN")
+    desa = filter_index.kategori("DESA")
+
+    # snapshot Arrow seperti di .data_cache (+ Parquet format lama) untuk kasus load.*
+    tmp_dir = tempfile.mkdtemp(prefix="bench_snapshot_")
+    snapshot = os.path.join(tmp_dir, "data.arrow")
+    _write_snapshot(df, snapshot)
+    df.to_parquet(os.path.join(tmp_dir, "data.parquet"), index=False)
+
+    # skenario sidebar: setengah kecamatan, lalu sebagian desanya
+    pilihan = {
+        "JENIS KEGIATAN": filter_index.kategori("JENIS KEGIATAN")[:10],
+        "JENIS IKAN": filter_index.kategori("JENIS IKAN"),
+        "KECAMATAN": kecamatan[: max(1, len(kecamatan) // 2)],
+        "DESA": desa[::2],
+        "NO TELP HASH": True,
+        "PENERIMAAN BANTUAN": ["sudah"],
+    }
+
+    return {
+        "df": df,
+        "df_upi": df[df["tahun bedah upi"].notna()],
+        "filter_index": filter_index,
+        "cube": cube,
+        "headline": HeadlineMetrics(df),
+        "top5": value_count_top5_with_others(df, group_col="JENIS KEGIATAN", value_name="jumlah_upi"),
+        "kolom_produksi": buat_kolom_produksi(n_rows, seed=seed),
+        "bedah": buat_data_bedah(df, seed=seed),
+        "indeks_nama": IndeksNama.dari_dataframe(df),
+        "pilihan": pilihan,
+        "snapshot": snapshot,
+        "tmp_dir": tmp_dir,
+    }
+
+
+def _kaskade_pandas(df, pilihan):
+    """Kaskade filter seperti page PDSPKP sebelum FilterIndex (isin berantai)."""
+    hasil = df[df["JENIS KEGIATAN"].isin(pilihan["JENIS KEGIATAN"])].copy()
+    hasil = hasil.loc[hasil["JENIS IKAN"].isin(pilihan["JENIS IKAN"])]
+    hasil = hasil.loc[hasil["KECAMATAN"].isin(pilihan["KECAMATAN"])]
+    sorted(hasil["DESA"].dropna().unique())
+    hasil = hasil.loc[hasil["DESA"].isin(pilihan["DESA"])]
+    hasil = hasil[hasil["NO TELP HASH"].notna()]
+    hasil = hasil[hasil["PENERIMAAN BANTUAN"] == "sudah"]
+    upi = hasil.loc[hasil["tahun bedah upi"].notna()].copy()
+    poklahsar = hasil.loc[hasil["tahun bedah upi"].isna()].copy()
+    return upi, poklahsar
+
+
+def _merge_bedah_pandas(df, bedah):
+    """Pengayaan bedah UPI seperti notebook lama (merge nama lower + dedup Kusuka)."""
+    bedah = bedah.assign(**{"Nama Poklahsar": bedah["Nama Poklahsar"].str.lower()})
+    hasil = bedah.merge(
+        df[["NAMA UPI", "DESA", "KECAMATAN"]],
+        left_on="Nama Poklahsar", right_on="NAMA UPI", how="left"
+    ).drop(columns=["NAMA UPI"])
+    hasil = hasil.dropna(subset=["DESA", "KECAMATAN"])
+    return hasil.drop_duplicates(subset=["Nomor Kusuka"], keep="first")
+
+
+def _metrik_pandas(df, filter_index, kategori, notna):
+    """Baris st.metric seperti page lama: nunique di baris terfilter."""
+    rows = df.take(filter_index.select(kategori=kategori, notna=notna))
+    return {k: rows[k].nunique() for k in KOLOM_METRIK}
+
+
+def _kaskade_pipeline(pipeline, df, pilihan, desa=None):
+    """Kaskade lewat FilterPipeline (opsi desa + dua take per tab)."""
+    if desa is not None:
+        pilihan = {**pilihan, "DESA": desa}
+    rows = pipeline.select(pilihan, sampai="KECAMATAN")
+    pipeline.index.nilai_tersedia("DESA", rows)
+    upi = df.take(pipeline.select(pilihan, notna={"tahun bedah upi": True}))
+    poklahsar = df.take(pipeline.select(pilihan, notna={"tahun bedah upi": False}))
+    return upi, poklahsar
+
+
+def daftar_kasus(ctx):
+    """
+    Kasus benchmark: ``{nama: (fungsi, setup)}``. ``setup`` (boleh None)
+    dipanggil sebelum setiap pengulangan dan tidak ikut diukur.
+    """
+    df = ctx["df"]
+    cube = ctx["cube"]
+    pilihan = ctx["pilihan"]
+    kategori = {k: v for k, v in pilihan.items() if k != "NO TELP HASH"}
+    kontak = {"NO TELP HASH": pilihan["NO TELP HASH"]}
+    tren = dict(
+        x_axis="TANGGAL", y_axis="PRODUKSI_BERSIH", y_label="Jumlah Produksi",
+        kolom_grup="PENERIMAAN BANTUAN", judul="Trend Produksi Terfilter",
+        figsize=(10, 5), tampil_legend=True, watermark_text="Data Dummy",
+    )
+    total = dict(
+        kolom_tanggal="TANGGAL", kolom_nilai="PRODUKSI_BERSIH",
+        judul="Trend Jumlah Produksi POKLAHSAR", watermark_text="DATA DUMMY",
+    )
+
+    # figure tren seperti tersimpan di FigureCache (penuh / ringan)
+    fig_tren = plot_line_chart(cube.slice(), **tren)
+    json_penuh = pio.to_json(fig_tren, validate=False)
+    json_ringan = json.dumps(ringkas_figure(fig_tren), separators=(",", ":"))
+
+    # deret harian 10 tahun (satu trace) untuk downsampling
+    rng = np.random.default_rng(0)
+    harian_x = pd.date_range("2015-01-01", "2024-12-31", freq="D").to_numpy()
+    harian_y = np.cumsum(rng.standard_normal(len(harian_x))) + 100
+    harian = (harian_x, harian_y, harian_y - rng.random(len(harian_x)), harian_y + rng.random(len(harian_x)))
+
+    pipeline = {"obj": None}
+    desa_baru = pilihan["DESA"][1:]
+
+    def pipeline_baru():
+        pipeline["obj"] = FilterPipeline(ctx["filter_index"])
+
+    def pipeline_hangat():
+        # prefiks sudah di-cache, lalu hanya DESA yang berubah
+        pipeline_baru()
+        _kaskade_pipeline(pipeline["obj"], df, pilihan)
+
+    kasus = {
+        # ---------- chart ----------
+        "chart.plot_upi_per_kecamatan": (lambda: plot_upi_per_kecamatan(df), None),
+        "chart.plot_upi_jenis_proses_jenis_ikan_catplot": (
+            lambda: plot_upi_jenis_proses_jenis_ikan_catplot(df), None),
+        "chart.donut_plot_kategori": (lambda: donut_plot_kategori(
+            df, "PENERIMAAN BANTUAN", kategori_urutan=["sudah", "belum"],
+            label_tampil=["Sudah Menerima Bantuan", "Belum Menerima Bantuan"],
+            judul="Persentase Penerimaan Bantuan"), None),
+        "chart.donut_plot_kategori_agregat": (lambda: donut_plot_kategori_agregat(
+            df=ctx["top5"], column_value="jumlah_upi",
+            label_tampil=ctx["top5"]["JENIS KEGIATAN"].tolist(),
+            judul="Proporsi Jenis Kegiatan POKLAHSAR"), None),
+        "chart.donut_plot_binary": (lambda: donut_plot_binary(
+            df, kolom="NO TELP HASH", label_true="Memiliki Kontak",
+            label_false="Tidak Memiliki Kontak", judul="Persentase Kontak"), None),
+        "chart.plot_tren_produksi_total[df]": (lambda: plot_tren_produksi_total(df=df, **total), None),
+        "chart.plot_tren_produksi_total[cube]": (
+            lambda: plot_tren_produksi_total(df=cube.slice(), **total), None),
+        "chart.plot_line_chart[df]": (lambda: plot_line_chart(df, **tren), None),
+        "chart.plot_line_chart[cube]": (lambda: plot_line_chart(cube.slice(), **tren), None),
+        "chart.plot_bedah_upi_stack": (lambda: plot_bedah_upi_stack(ctx["df_upi"], "DESA"), None),
+        "chart.plot_produksi_stack_tahun[df]": (lambda: plot_produksi_stack_tahun(df, "DESA"), None),
+        "chart.plot_produksi_stack_tahun[cube]": (
+            lambda: plot_produksi_stack_tahun(cube.slice(), "DESA"), None),
+
+        # ---------- figure: build & jalur rerun (cache -> JSON st.plotly_chart) ----------
+        "figure.build[penuh]": (lambda: plot_line_chart(cube.slice(), **tren), None),
+        "figure.build[ringan]": (lambda: plot_line_chart(cube.slice(), ringan=True, **tren), None),
+        "figure.rerun[penuh]": (lambda: json_streamlit(pio.from_json(json_penuh)), None),
+        "figure.rerun[ringan]": (lambda: json_streamlit(ke_figure(json.loads(json_ringan))), None),
+
+        "figure.downsample[lttb]": (lambda: kurangi_tren(*harian, max_points=1000, metode="lttb"), None),
+        "figure.downsample[minmax]": (lambda: kurangi_tren(*harian, max_points=1000, metode="minmax"), None),
+
+        # ---------- agregasi / parsing ----------
+        "agg.value_count_top5_with_others": (lambda: value_count_top5_with_others(
+            df, group_col="JENIS KEGIATAN", value_name="jumlah_upi"), None),
+        "agg.value_count_top_k_with_others[desa,bobot]": (lambda: value_count_top_k_with_others(
+            df, group_col="DESA", k=10, value_name="produksi", kolom_bobot="PRODUKSI_BERSIH"), None),
+        "parse.parse_produksi[map]": (lambda: ctx["kolom_produksi"].map(parse_produksi), None),
+        "parse.parse_produksi_kolom": (lambda: parse_produksi_kolom(ctx["kolom_produksi"]), None),
+
+        # ---------- kaskade filter sidebar ----------
+        "filter.kaskade_pandas": (lambda: _kaskade_pandas(df, pilihan), None),
+        "filter.filter_index": (lambda: (
+            df.take(ctx["filter_index"].select(kategori=kategori, notna={**kontak, "tahun bedah upi": True})),
+            df.take(ctx["filter_index"].select(kategori=kategori, notna={**kontak, "tahun bedah upi": False})),
+        ), None),
+        "filter.pipeline[dingin]": (
+            lambda: _kaskade_pipeline(pipeline["obj"], df, pilihan), pipeline_baru),
+        "filter.pipeline[desa_berubah]": (
+            lambda: _kaskade_pipeline(pipeline["obj"], df, pilihan, desa=desa_baru),
+            pipeline_hangat),
+
+        # ---------- baris st.metric ----------
+        "metrics.pandas_nunique": (lambda: _metrik_pandas(
+            df, ctx["filter_index"], kategori, {**kontak, "tahun bedah upi": True}), None),
+        "metrics.headline[dingin]": (
+            lambda: ctx["headline"].hitung(kategori, {**kontak, "tahun bedah upi": True}),
+            ctx["headline"].clear),
+
+        # ---------- pengayaan bedah UPI ----------
+        "enrich.merge_pandas": (lambda: _merge_bedah_pandas(df, ctx["bedah"]), None),
+        "enrich.perkaya_bedah": (
+            lambda: perkaya_bedah(df, ctx["bedah"], indeks=ctx["indeks_nama"]), None),
+
+        # ---------- muat snapshot (semua kolom vs kolom halaman PDSPKP) ----------
+        "load.snapshot[parquet]": (
+            lambda: pd.read_parquet(os.path.join(ctx["tmp_dir"], "data.parquet")), None),
+        "load.snapshot[semua]": (
+            lambda: _buka_snapshot(ctx["snapshot"]).to_pandas(split_blocks=True), None),
+        "load.snapshot[halaman]": (lambda: _buka_snapshot(ctx["snapshot"]).select(
+            [k for k in KOLOM_HALAMAN if k in df.columns]
+        ).to_pandas(split_blocks=True), None),
+
+        # ---------- struktur turunan ----------
+        "build.filter_index": (lambda: FilterIndex(df), None),
+        "build.production_cube": (lambda: ProductionCube(df), None),
+        "build.indeks_nama": (lambda: IndeksNama.dari_dataframe(df), None),
+        "build.headline_metrics": (lambda: HeadlineMetrics(df), None),
+    }
+    return kasus
+
+
+# ============================================================
+# RUNNER
+# ============================================================
+def ukur(fungsi, setup=None, repeat=5, warmup=1):
+    """Waktu eksekusi (detik) per pengulangan, GC dimatikan saat mengukur."""
+    for _ in range(warmup):
+        if setup is not None:
+            setup()
+        fungsi()
+
+    waktu = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            mulai = time.perf_counter()
+            fungsi()
+            waktu.append(time.perf_counter() - mulai)
+        finally:
+            gc.enable()
+    return waktu
+
+
+def _commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, text=True,
+            stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def ukur_payload(kasus):
+    """Ukuran JSON ``st.plotly_chart`` (byte) figure penuh vs ringan untuk kasus ``chart.*``."""
+    hasil = {}
+    for nama, (fungsi, _) in kasus.items():
+        if not nama.startswith("chart."):
+            continue
+        fig = fungsi()
+        hasil[nama] = {
+            "penuh": len(json_streamlit(fig)),
+            "ringan": len(json_streamlit(ke_figure(ringkas_figure(fig)))),
+        }
+    return hasil
+
+
+def jalankan(sizes, kardinalitas, repeat=5, filter_nama=None, seed=0, payload=False):
+    """
+    Menjalankan semua kasus untuk setiap kombinasi ukuran x kardinalitas.
+
+    Returns
+    -------
+    dict
+        ``{"meta": {...}, "hasil": [{kasus, n_rows, kecamatan, desa, ...}]}``.
+    """
+    hasil = []
+
+    for teks_ukuran in sizes:
+        n_rows = int(float(teks_ukuran))
+        # 1e7 baris: cukup 1 pengulangan terukur
+        n_repeat = repeat if n_rows < 10_000_000 else 1
+
+        for teks_kard in kardinalitas:
+            n_kecamatan, n_desa = (int(v) for v in teks_kard.split("x"))
+
+            mulai = time.perf_counter()
+            ctx = siapkan_konteks(n_rows, n_kecamatan, n_desa, seed=seed)
+            print(f"# {n_rows:,} baris, {n_kecamatan} kecamatan x {n_desa} desa "
+                  f"(data siap {time.perf_counter() - mulai:.1f} detik)", flush=True)
+
+            kasus = daftar_kasus(ctx)
+            for nama, (fungsi, setup) in kasus.items():
+                if filter_nama and filter_nama not in nama:
+                    continue
+                waktu = ukur(fungsi, setup, repeat=n_repeat)
+                baris = {
+                    "kasus": nama,
+                    "n_rows": n_rows,
+                    "kecamatan": n_kecamatan,
+                    "desa": n_desa,
+                    "repeat": len(waktu),
+                    "min": min(waktu),
+                    "median": statistics.median(waktu),
+                    "mean": statistics.fmean(waktu),
+                    "times": waktu,
+                }
+                hasil.append(baris)
+                print(f"  {nama:<48} median {baris['median'] * 1e3:10.2f} ms"
+                      f"   min {baris['min'] * 1e3:10.2f} ms", flush=True)
+
+            if payload:
+                for nama, ukuran in ukur_payload(kasus).items():
+                    hasil.append({
+                        "kasus": f"payload.{nama}",
+                        "n_rows": n_rows,
+                        "kecamatan": n_kecamatan,
+                        "desa": n_desa,
+                        **ukuran,
+                    })
+                    print(f"  payload.{nama:<40} {ukuran['penuh']:>10,} -> {ukuran['ringan']:>10,} byte",
+                          flush=True)
+
+            shutil.rmtree(ctx["tmp_dir"], ignore_errors=True)
+            del ctx
+            gc.collect()
+
+    meta = {
+        "commit": _commit(),
+        "waktu": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "plotly": plotly.__version__,
+        "seed": seed,
+    }
+    return {"meta": meta, "hasil": hasil}
+
+
+def bandingkan(path_lama, path_baru):
+    """Mencetak rasio median baru / lama per kasus yang ada di kedua file."""
+    with open(path_lama, encoding="utf-8") as f:
+        lama = json.load(f)
+    with open(path_baru, encoding="utf-8") as f:
+        baru = json.load(f)
+
+    def kunci(b):
+        return (b["kasus"], b["n_rows"], b["kecamatan"], b["desa"])
+
+    peta_lama = {kunci(b): b for b in lama["hasil"]}
+    print(f"# {lama['meta']['commit']} -> {baru['meta']['commit']}")
+    for b in baru["hasil"]:
+        a = peta_lama.get(kunci(b))
+        if a is None or "median" not in b:
+            continue
+        rasio = b["median"] / a["median"] if a["median"] else float("nan")
+        print(f"  {b['kasus']:<48} {b['n_rows']:>10,} {b['kecamatan']:>4}x{b['desa']:<6}"
+              f" {a['median'] * 1e3:10.2f} -> {b['median'] * 1e3:10.2f} ms  x{rasio:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark jalur panas dashboard DKP")
+    parser.add_argument("--sizes", nargs="+", default=UKURAN_DEFAULT,
+                        help="jumlah baris, mis. 1e3 1e5 1e7")
+    parser.add_argument("--cardinality", nargs="+", default=KARDINALITAS_DEFAULT,
+                        help="KECAMATANxDESA, mis. 10x47 100x2000")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", dest="filter_nama", default=None,
+                        help="hanya kasus yang namanya memuat teks ini")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None,
+                        help="file JSON hasil (default results/<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("LAMA", "BARU"),
+                        help="bandingkan dua file hasil, tanpa menjalankan benchmark")
+    parser.add_argument("--payload", action="store_true",
+                        help="ukur juga ukuran JSON figure penuh vs ringan")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        bandingkan(*args.compare)
+        return
+
+    laporan = jalankan(args.sizes, args.cardinality, repeat=args.repeat,
+                       filter_nama=args.filter_nama, seed=args.seed, payload=args.payload)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{laporan['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(laporan, f, indent=2)
+    print(f"# hasil: {output}")
+
+
+if __name__ == "__main__":
+    main()
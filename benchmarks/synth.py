@@ -0,0 +1,191 @@
+# synth.py
+#
+# Generator data sintetis untuk benchmark: frame UPI/POKLAHSAR dengan
+# skema kolom yang sama dengan hasil LIB.data_loader.load_data_upi
+# (kategori, float32, Int16), dalam ukuran dan kardinalitas wilayah
+# yang bisa diatur.
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
+
+from LIB.data_loader import SCHEMA
+
+
+# ============================================================
+# KONFIGURASI
+# ============================================================
+TANGGAL_AWAL = "2023-01-01"
+N_BULAN = 36                     # 2023-01 .. 2025-12, sama dengan data publish
+
+JENIS_KEGIATAN = [
+    "abon", "amplang", "bakso", "ikan asap", "ikan asin", "ikan kayu",
+    "kerupuk", "nugget", "otak-otak", "pempek", "penggaraman", "pindang",
+    "sambal", "terasi",
+]
+JENIS_IKAN = [
+    "cakalang", "cumi", "ekor kuning", "julung", "kembung", "layang",
+    "teri", "tongkol", "tuna",
+]
+
+PORSI_UPI = 0.10                 # entitas yang punya "tahun bedah upi"
+PORSI_KONTAK = 0.80              # entitas yang punya NO TELP HASH
+PORSI_PRODUKSI_KOSONG = 0.05
+
+
+def _kategori(kode, kategori):
+    return pd.Categorical.from_codes(kode, categories=kategori)
+
+
+def buat_data_upi(n_rows, n_kecamatan=10, n_desa=47, seed=0):
+    """
+    Membuat frame sintetis dengan skema data publish.
+
+    Satu entitas (NAMA UPI) = ``N_BULAN`` baris bulanan, sehingga jumlah
+    entitas ~ ``n_rows / N_BULAN``. Desa ke-i berada di kecamatan
+    ``i % n_kecamatan``; setiap entitas mendapat satu desa.
+
+    Parameters
+    ----------
+    n_rows : int
+        Jumlah baris.
+    n_kecamatan, n_desa : int
+        Kardinalitas KECAMATAN dan DESA.
+    seed : int
+        Seed generator (hasil deterministik).
+
+    Returns
+    -------
+    pandas.DataFrame
+    """
+    rng = np.random.default_rng(seed)
+
+    n_rows = int(n_rows)
+    n_desa = max(int(n_desa), int(n_kecamatan))
+    n_entitas = max(1, -(-n_rows // N_BULAN))
+
+    # ---------- atribut per entitas ----------
+    desa_ent = rng.integers(0, n_desa, n_entitas)
+    kec_ent = desa_ent % n_kecamatan
+    kegiatan_ent = rng.integers(0, len(JENIS_KEGIATAN), n_entitas)
+    ikan_ent = rng.integers(0, len(JENIS_IKAN), n_entitas)
+    bantuan_ent = rng.integers(0, 2, n_entitas)
+    kontak_ent = rng.random(n_entitas) < PORSI_KONTAK
+    upi_ent = rng.random(n_entitas) < PORSI_UPI
+    tahun_ent = rng.integers(2023, 2026, n_entitas)
+    basis_ent = rng.lognormal(mean=5.5, sigma=0.8, size=n_entitas)
+
+    # ---------- baris ----------
+    posisi = np.arange(n_rows)
+    ent = posisi // N_BULAN
+    bulan = posisi % N_BULAN
+
+    lebar = len(str(max(n_entitas, n_desa, n_kecamatan)))
+    nama_upi = [f"upi sintetis {i:0{lebar}d}" for i in range(n_entitas)]
+    kecamatan = [f"kec. sintetis {i:0{lebar}d}" for i in range(n_kecamatan)]
+    desa = [f"desa sintetis {i:0{lebar}d}" for i in range(n_desa)]
+    kontak = np.array([f"{i:064x}" for i in range(n_entitas)], dtype=object)
+    kontak[~kontak_ent] = None
+
+    produksi = basis_ent[ent] * rng.normal(1.0, 0.15, n_rows)
+    produksi[rng.random(n_rows) < PORSI_PRODUKSI_KOSONG] = np.nan
+
+    tahun = pd.array(np.where(upi_ent, tahun_ent, 0)[ent], dtype="Int16")
+    tahun[~upi_ent[ent]] = pd.NA
+
+    df = pd.DataFrame({
+        "NO": ent + 1,
+        "NAMA UPI": _kategori(ent, nama_upi),
+        "NAMA PEMILIK": np.array([f"pemilik {i}" for i in range(n_entitas)], dtype=object)[ent],
+        "DESA": _kategori(desa_ent[ent], desa),
+        "KECAMATAN": _kategori(kec_ent[ent], kecamatan),
+        "PENERIMAAN BANTUAN": _kategori(bantuan_ent[ent], ["belum", "sudah"]),
+        "JENIS KEGIATAN PENGOLAHAN": np.array(
+            [f"{JENIS_KEGIATAN[k]} ikan {JENIS_IKAN[i]}" for k, i in zip(kegiatan_ent, ikan_ent)],
+            dtype=object
+        )[ent],
+        "TANGGAL": pd.date_range(TANGGAL_AWAL, periods=N_BULAN, freq="MS").values[bulan],
+        "JENIS KEGIATAN": _kategori(kegiatan_ent[ent], JENIS_KEGIATAN),
+        "JENIS IKAN": _kategori(ikan_ent[ent], JENIS_IKAN),
+        "NO TELP HASH": kontak[ent],
+        "tahun bedah upi": tahun,
+        "PRODUKSI_BERSIH": produksi.astype(SCHEMA["PRODUKSI_BERSIH"]),
+    })
+
+    return df
+
+
+def buat_kolom_produksi(n_rows, seed=0):
+    """
+    Kolom produksi mentah (sebelum ``parse_produksi``) dengan campuran
+    format seperti sel bulanan di output.csv: kosong, 0, float,
+    string angka, rentang ``'200-300'`` dan pasangan ``'1600/400'``.
+
+    Returns
+    -------
+    pandas.Series
+        dtype object.
+    """
+    rng = np.random.default_rng(seed)
+    n_rows = int(n_rows)
+
+    angka = rng.integers(50, 2000, size=(n_rows, 2))
+    jenis = rng.choice(6, size=n_rows, p=[0.60, 0.02, 0.18, 0.14, 0.03, 0.03])
+
+    nilai = np.empty(n_rows, dtype=object)
+    nilai[jenis == 0] = np.nan
+    nilai[jenis == 1] = 0.0
+
+    m = jenis == 2
+    nilai[m] = angka[m, 0].astype(float)
+    m = jenis == 3
+    nilai[m] = angka[m, 0].astype(str)
+    m = jenis == 4
+    nilai[m] = [f"{a}-{b}" for a, b in angka[m]]
+    m = jenis == 5
+    nilai[m] = [f"{a}/{b}" for a, b in angka[m]]
+
+    return pd.Series(nilai, name="PRODUKSI", dtype=object)
+
+
+def buat_data_bedah(df, seed=0):
+    """
+    Sheet "bedah upi" sintetis untuk entitas ``df`` yang punya
+    ``tahun bedah upi``. Penulisan nama dibuat tidak rapi seperti sheet
+    asli: sebagian huruf kapital, sebagian berawalan "Poklahsar", sebagian
+    dengan satu huruf salah ketik.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Kolom ``Nama Poklahsar``, ``Nomor Kusuka``, ``tahun bedah upi``.
+    """
+    rng = np.random.default_rng(seed)
+
+    upi = (
+        df.loc[df["tahun bedah upi"].notna(), ["NAMA UPI", "tahun bedah upi"]]
+        .drop_duplicates(subset=["NAMA UPI"])
+    )
+    nama = upi["NAMA UPI"].astype(str).to_numpy()
+    gaya = rng.choice(3, size=len(nama), p=[0.6, 0.2, 0.2])
+
+    ditulis = []
+    for teks, g in zip(nama, gaya):
+        if g == 1:
+            teks = "Poklahsar " + teks
+        elif g == 2:
+            i = rng.integers(0, len(teks))
+            teks = teks[:i] + "x" + teks[i + 1:]
+        ditulis.append(teks.title())
+
+    return pd.DataFrame({
+        "Nama Poklahsar": ditulis,
+        "Nomor Kusuka": rng.integers(10**15, 9 * 10**15, len(nama)),
+        "tahun bedah upi": upi["tahun bedah upi"].astype("int64").to_numpy(),
+    })
@@ -0,0 +1,266 @@
+# bedah_upi.py
+#
+# Pengayaan data UPI dengan sheet "bedah upi": tiap baris bedah dicocokkan
+# ke NAMA UPI lewat indeks nama ternormalisasi (lookup dict), dengan
+# cadangan fuzzy lewat indeks n-gram terbalik, lalu kolom bedah
+# (termasuk "tahun bedah upi" untuk plot_bedah_upi_stack) ditempelkan ke
+# setiap baris UPI yang cocok.
+#
+#     cd src && python -m LIB.bedah_upi        # laporan pencocokan
+
+import os
+import re
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from LIB.data_loader import ROOT_DIR, DATA_PATH, SCHEMA, load_data_upi, load_tabel
+
+
+# ============================================================
+# KONFIGURASI
+# ============================================================
+BEDAH_PATH = os.path.join(ROOT_DIR, "bedah upi.xlsx")
+
+KOLOM_NAMA_BEDAH = "Nama Poklahsar"
+# kolom sheet bedah yang ditempelkan ke data UPI (sama dengan data publish)
+KOLOM_BEDAH = [
+    "Provinsi", "Kab./Kota", "Jml. Anggota", "Jenis Produk", "Nomor Kusuka",
+    "Harga/Produk (Rp)", "Jenis Bahan Baku", "Pemasaran", "tahun bedah upi",
+]
+
+# awalan jenis kelompok yang sering ditulis tidak konsisten
+# ("poklahsar leha" vs "leha"); hanya dibuang untuk pencocokan fuzzy
+AWALAN_NAMA = ("poklahsar", "pokdakan", "kub", "upi")
+
+N_GRAM = 3
+AMBANG_FUZZY = 0.75      # skor Dice minimal
+SELISIH_FUZZY = 0.05     # beda minimal kandidat terbaik vs kedua (selain itu ambigu)
+
+_SPASI = re.compile(r"\s+")
+_AWALAN = re.compile(r"^(?:" + "|".join(AWALAN_NAMA) + r")\b\s*")
+
+
+def normalisasi_nama(nama):
+    """strip + lower + spasi berulang jadi satu."""
+    return _SPASI.sub(" ", str(nama).strip().lower())
+
+
+def _kunci_fuzzy(nama_normal):
+    return _AWALAN.sub("", nama_normal) or nama_normal
+
+
+def _ngram(teks, n=N_GRAM):
+    teks = f" {teks} "
+    return {teks[i:i + n] for i in range(max(len(teks) - n + 1, 1))}
+
+
+class IndeksNama:
+    """
+    Indeks nama UPI untuk pencocokan cepat.
+
+    - Tepat: dict nama ternormalisasi -> posisi nama.
+    - Fuzzy: indeks terbalik n-gram -> daftar posisi nama (CSR). Skor
+      Dice semua kandidat dihitung dengan satu ``bincount`` atas posting
+      n-gram kueri, bukan membandingkan kueri dengan tiap nama.
+
+    Parameters
+    ----------
+    nama : array-like
+        Nama UPI (nilai asli, dipakai sebagai hasil pencocokan).
+    """
+
+    def __init__(self, nama):
+        self.nama = pd.Index(pd.unique(pd.Series(nama, dtype=object).dropna().astype(str)))
+        normal = [normalisasi_nama(n) for n in self.nama]
+
+        self.tepat = {}
+        for posisi, kunci in enumerate(normal):
+            self.tepat.setdefault(kunci, []).append(posisi)
+
+        # ---------- indeks terbalik n-gram ----------
+        fuzzy = [_kunci_fuzzy(n) for n in normal]
+        self._kode_fuzzy = pd.factorize(pd.Series(fuzzy, dtype=object))[0]
+        gram_nama = [_ngram(k) for k in fuzzy]
+        self.ukuran = np.array([len(g) for g in gram_nama], dtype=np.int64)
+
+        gram, kosakata = pd.factorize(
+            pd.Series([g for grams in gram_nama for g in grams], dtype=object)
+        )
+        pemilik = np.repeat(np.arange(len(gram_nama)), self.ukuran)
+        urut = np.argsort(gram, kind="stable")
+        self.kosakata = {g: i for i, g in enumerate(kosakata)}
+        self._posting = pemilik[urut]
+        self._indptr = np.searchsorted(gram[urut], np.arange(len(kosakata) + 1))
+
+    @classmethod
+    def dari_dataframe(cls, df, kolom="NAMA UPI"):
+        nilai = df[kolom]
+        if isinstance(nilai.dtype, pd.CategoricalDtype):
+            nilai = nilai.cat.categories
+        return cls(nilai)
+
+    def skor(self, nama):
+        """Skor Dice n-gram ``nama`` (kunci fuzzy) terhadap semua nama."""
+        grams = _ngram(_kunci_fuzzy(normalisasi_nama(nama)))
+        ids = [self.kosakata[g] for g in grams if g in self.kosakata]
+        if not ids:
+            return np.zeros(len(self.nama))
+        posting = np.concatenate([self._posting[self._indptr[i]:self._indptr[i + 1]] for i in ids])
+        bersama = np.bincount(posting, minlength=len(self.nama))
+        return 2 * bersama / (len(grams) + self.ukuran)
+
+    def cocokkan(self, nama, ambang=AMBANG_FUZZY, selisih=SELISIH_FUZZY):
+        """
+        Mencocokkan satu nama.
+
+        Returns
+        -------
+        hasil : list of str
+            Nama UPI yang cocok (bisa lebih dari satu bila beberapa nama
+            UPI berbeda hanya di awalan / penulisan), kosong jika tidak ada.
+        skor : float
+        metode : str
+            ``"tepat"``, ``"fuzzy"``, ``"ambigu"`` atau ``"tidak ditemukan"``.
+        """
+        kunci = normalisasi_nama(nama)
+        if kunci in self.tepat:
+            return [self.nama[p] for p in self.tepat[kunci]], 1.0, "tepat"
+
+        skor = self.skor(nama)
+        if not len(skor):
+            return [], 0.0, "tidak ditemukan"
+        terbaik = int(np.argmax(skor))
+        skor_terbaik = float(skor[terbaik])
+
+        # nama dengan kunci fuzzy sama dihitung satu kandidat
+        sama = self._kode_fuzzy == self._kode_fuzzy[terbaik]
+        skor_kedua = float(skor[~sama].max()) if (~sama).any() else 0.0
+
+        if skor_terbaik < ambang:
+            return [], skor_terbaik, "tidak ditemukan"
+        if skor_terbaik - skor_kedua < selisih:
+            return [], skor_terbaik, "ambigu"
+        return list(self.nama[sama]), skor_terbaik, "fuzzy"
+
+
+def parse_bedah(path=BEDAH_PATH, sheet_name=0):
+    """Sheet bedah UPI langsung dari workbook (tanpa snapshot)."""
+    return pd.read_excel(path, sheet_name=sheet_name)
+
+
+def baca_bedah(path=BEDAH_PATH, sheet_name=0):
+    """
+    Sheet bedah UPI apa adanya (satu baris per poklahsar).
+
+    Sheet pertama dibaca lewat snapshot Arrow (:func:`LIB.data_loader.load_tabel`);
+    hasilnya dipakai bersama, jangan diubah in-place.
+    """
+    if sheet_name != 0:
+        return parse_bedah(path, sheet_name)
+    return load_tabel(path, parse_bedah)
+
+
+def perkaya_bedah(df, bedah, indeks=None, kolom_nama="NAMA UPI",
+                  ambang=AMBANG_FUZZY, selisih=SELISIH_FUZZY):
+    """
+    Menempelkan kolom bedah UPI ke ``df`` berdasarkan NAMA UPI.
+
+    Tiap baris bedah dicocokkan sekali (:meth:`IndeksNama.cocokkan`),
+    lalu hasilnya disebar ke baris ``df`` lewat kode kategori NAMA UPI,
+    tanpa merge string per baris. Jika satu UPI cocok dengan beberapa
+    baris bedah, baris bedah pertama (kecocokan tepat didahulukan) yang
+    dipakai, seperti ``drop_duplicates(keep="first")`` di notebook lama.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Data UPI (kolom bedah lama, jika ada, ditimpa).
+    bedah : pandas.DataFrame
+        Hasil :func:`baca_bedah`.
+    indeks : IndeksNama, optional
+        Dibangun dari ``df`` jika tidak diberikan.
+
+    Returns
+    -------
+    hasil : pandas.DataFrame
+        Salinan ``df`` dengan :data:`KOLOM_BEDAH` (``tahun bedah upi`` Int16).
+    laporan : pandas.DataFrame
+        Per baris bedah: nama, NAMA UPI hasil, skor, metode.
+    """
+    if indeks is None:
+        indeks = IndeksNama.dari_dataframe(df, kolom_nama)
+
+    laporan = []
+    for posisi, nama in enumerate(bedah[KOLOM_NAMA_BEDAH]):
+        hasil, skor, metode = indeks.cocokkan(nama, ambang=ambang, selisih=selisih)
+        for nama_upi in hasil or [None]:
+            laporan.append((posisi, nama, nama_upi, skor, metode))
+    laporan = pd.DataFrame(
+        laporan, columns=["BARIS_BEDAH", KOLOM_NAMA_BEDAH, kolom_nama, "skor", "metode"]
+    )
+
+    # satu baris bedah per UPI: tepat dulu, lalu urutan sheet
+    dipakai = (
+        laporan
+        .dropna(subset=[kolom_nama])
+        .assign(_bukan_tepat=lambda t: t["metode"] != "tepat")
+        .sort_values(["_bukan_tepat", "BARIS_BEDAH"], kind="stable")
+        .drop_duplicates(subset=[kolom_nama], keep="first")
+    )
+    laporan["dipakai"] = laporan.index.isin(dipakai.index)
+
+    # baris bedah per kode NAMA UPI -> per baris df
+    kategori, kode = _kode_nama(df[kolom_nama])
+    baris_bedah = np.full(len(kategori) + 1, -1, dtype=np.int64)
+    posisi = kategori.get_indexer(dipakai[kolom_nama])
+    baris_bedah[posisi[posisi >= 0]] = dipakai["BARIS_BEDAH"].to_numpy()[posisi >= 0]
+    ambil = baris_bedah[kode]
+
+    # salinan dangkal: kolom bedah diganti, kolom lain tidak disalin
+    hasil = df.copy(deep=False)
+    kolom_ada = [k for k in KOLOM_BEDAH if k in bedah.columns]
+    sumber = bedah[kolom_ada].reset_index(drop=True)
+    if "tahun bedah upi" in kolom_ada:
+        # dtype dikonversi di tabel bedah yang kecil, bukan di hasil
+        sumber["tahun bedah upi"] = (
+            pd.to_numeric(sumber["tahun bedah upi"], errors="coerce")
+            .astype(SCHEMA["tahun bedah upi"])
+        )
+    for kolom in kolom_ada:
+        # label -1 tidak ada di sumber -> NaN / NA (kolom angka biasa jadi float)
+        hasil[kolom] = sumber[kolom].reindex(ambil).array
+
+    return hasil, laporan
+
+
+def _kode_nama(nilai):
+    """(kategori nama, kode per baris); kode -1 (NaN) menunjuk slot terakhir."""
+    if isinstance(nilai.dtype, pd.CategoricalDtype):
+        kategori = nilai.cat.categories.astype(str)
+        kode = nilai.cat.codes.to_numpy()
+    else:
+        kode, kategori = pd.factorize(nilai.astype(object).where(nilai.notna(), None))
+        kategori = pd.Index(kategori).astype(str)
+    return kategori, np.where(kode < 0, len(kategori), kode)
+
+
+# ============================================================
+# CLI
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Laporan pencocokan bedah UPI ke NAMA UPI")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--bedah", default=BEDAH_PATH)
+    parser.add_argument("--ambang", type=float, default=AMBANG_FUZZY)
+    args = parser.parse_args(argv)
+
+    df = load_data_upi(args.data, kolom=["NAMA UPI"])
+    _, laporan = perkaya_bedah(df, baca_bedah(args.bedah), ambang=args.ambang)
+    with pd.option_context("display.width", 200, "display.max_rows", None):
+        print(laporan.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 # charts.py
 
+import hashlib
+import functools
+
 import pandas as pd
 import streamlit as st
 import numpy as np
@@ -7,7 +10,25 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.colors import hex_to_rgb
 
+from LIB.cube import CubeSlice
+from LIB.downsample import MAX_TITIK_TREN, kurangi_tren
+from LIB.figure_ringan import ringkas_figure
+
+
+def dukung_ringan(builder):
+    """
+    Menambah argumen ``ringan`` ke chart builder: ``ringan=True``
+    mengembalikan dict figure ringan (:func:`LIB.figure_ringan.ringkas_figure`)
+    alih-alih ``Figure``.
+    """
+    @functools.wraps(builder)
+    def bungkus(*args, ringan=False, **kwargs):
+        fig = builder(*args, **kwargs)
+        return ringkas_figure(fig) if ringan else fig
+    return bungkus
+
 
+@dukung_ringan
 def plot_upi_per_kecamatan(df):
     """
     Membuat bar chart Jumlah UPI per Kecamatan (Plotly version)
@@ -24,7 +45,7 @@ def plot_upi_per_kecamatan(df):
 
     df_kec = (
         df
-        .groupby("KECAMATAN")
+        .groupby("KECAMATAN", observed=True)
         .size()
         .reset_index(name="jumlah_upi")
     )
@@ -49,6 +70,124 @@ def plot_upi_per_kecamatan(df):
 
     return fig
 
+def hitung_per_kategori(nilai, bobot=None):
+    """
+    Jumlah baris (atau jumlah ``bobot``) per kategori lewat satu
+    ``bincount`` atas kode kategori, tanpa ``value_counts``/groupby.
+
+    Parameters
+    ----------
+    nilai : pandas.Series
+        Kolom kategori (categorical atau biasa). Nilai kosong diabaikan.
+    bobot : pandas.Series, optional
+        Bobot per baris (contoh: ``PRODUKSI_BERSIH``); kosong dihitung 0.
+
+    Returns
+    -------
+    kategori : pandas.Index
+    jumlah : numpy.ndarray
+        Sejajar dengan ``kategori``; int64 tanpa bobot, float64 dengan bobot.
+    """
+    if isinstance(nilai.dtype, pd.CategoricalDtype):
+        kode = nilai.cat.codes.to_numpy()
+        kategori = nilai.cat.categories
+    else:
+        kode, kategori = pd.factorize(nilai)
+        kategori = pd.Index(kategori)
+
+    ada = kode >= 0
+    if bobot is None:
+        return kategori, np.bincount(kode[ada], minlength=len(kategori))
+
+    w = pd.to_numeric(bobot, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    w = np.nan_to_num(w[ada], nan=0.0)
+    return kategori, np.bincount(kode[ada], weights=w, minlength=len(kategori))
+
+
+def top_k_dengan_lainnya(kategori, jumlah, k=5, label_lain="Lain-lain"):
+    """
+    K kategori terbesar dari jumlah yang sudah diagregasi, sisanya
+    digabung menjadi satu entri ``label_lain``.
+
+    Seleksi memakai ``argpartition`` (O(n)), hanya K pemenang yang
+    diurutkan. Kategori dengan jumlah 0 diabaikan; seri diurutkan
+    menurut posisi kategori sehingga hasil deterministik.
+
+    Parameters
+    ----------
+    kategori : array-like
+        Label kategori.
+    jumlah : array-like
+        Jumlah per kategori (sejajar dengan ``kategori``).
+    k : int
+    label_lain : str
+
+    Returns
+    -------
+    label : list of str
+        K label teratas (menurun), lalu ``label_lain`` jika sisanya > 0.
+    nilai : numpy.ndarray
+        Sejajar dengan ``label``.
+    """
+    kategori = np.asarray(kategori, dtype=object)
+    jumlah = np.asarray(jumlah)
+
+    kandidat = np.flatnonzero(jumlah > 0)
+    nilai_kandidat = jumlah[kandidat]
+
+    if k <= 0:
+        pilih = kandidat[:0]
+    elif len(kandidat) <= k:
+        pilih = kandidat
+    else:
+        # nilai ke-k terbesar; yang lebih besar pasti masuk, seri diisi
+        # dari posisi kategori terkecil
+        batas = -np.partition(-nilai_kandidat, k - 1)[k - 1]
+        pasti = kandidat[nilai_kandidat > batas]
+        seri = kandidat[nilai_kandidat == batas][: k - len(pasti)]
+        pilih = np.concatenate([pasti, seri])
+
+    pilih = pilih[np.lexsort((pilih, -jumlah[pilih]))]
+
+    label = [str(x) for x in kategori[pilih]]
+    nilai = jumlah[pilih]
+
+    sisa = nilai_kandidat.sum() - nilai.sum()
+    if sisa > 0:
+        label.append(label_lain)
+        nilai = np.append(nilai, sisa)
+
+    return label, nilai
+
+
+def value_count_top_k_with_others(df, group_col, k=5, value_name="jumlah_proses", kolom_bobot=None):
+    """
+    Top-K kategori ``group_col`` (jumlah baris atau jumlah ``kolom_bobot``)
+    dengan sisanya digabung ke 'Lain-lain', dalam format yang diterima
+    :func:`donut_plot_kategori_agregat`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+    group_col : str
+    k : int, default=5
+    value_name : str
+        Nama kolom hasil agregasi.
+    kolom_bobot : str, optional
+        Kolom yang dijumlahkan (contoh: ``"PRODUKSI_BERSIH"``);
+        ``None`` = jumlah baris.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Kolom ``group_col`` (str) dan ``value_name``.
+    """
+    bobot = df[kolom_bobot] if kolom_bobot is not None else None
+    kategori, jumlah = hitung_per_kategori(df[group_col], bobot)
+    label, nilai = top_k_dengan_lainnya(kategori, jumlah, k=k)
+    return pd.DataFrame({group_col: label, value_name: nilai})
+
+
 def value_count_top5_with_others(df, group_col, value_name="jumlah_proses"):
     """
     Mengelompokkan data berdasarkan kolom tertentu,
@@ -74,38 +213,7 @@ def value_count_top5_with_others(df, group_col, value_name="jumlah_proses"):
         - 5 kategori terbesar
         - 1 baris tambahan "Lain-lain" (jika ada sisa kategori)
     """
-
-    # 1. Hitung jumlah per kategori
-    counted_df = df[group_col].value_counts().reset_index().rename(columns={"count": value_name})
-    # (df['jenis_proses'].value_counts().reset_index().rename(columns={"count": "xxxx"}))
-
-    # 2. Urutkan dari terbesar ke terkecil
-    sorted_df = counted_df.sort_values(
-        by=value_name,
-        ascending=False
-    ).copy()
-
-    # # 3. Ambil 5 kategori teratas
-    top_five = sorted_df.head(5).copy()
-
-    # # 4. Hitung total kategori di luar top 5
-    others_total = sorted_df.iloc[5:][value_name].sum()
-
-    # 5. Jika ada kategori lain, gabungkan sebagai "Lain-lain"
-    if others_total > 0:
-        others_row = pd.DataFrame({
-            group_col: ["Lain-lain"],
-            value_name: [others_total]
-        })
-
-        result_df = pd.concat(
-            [top_five, others_row],
-            ignore_index=True
-        )
-    else:
-        result_df = top_five
-
-    return result_df
+    return value_count_top_k_with_others(df, group_col, k=5, value_name=value_name)
 
 
 # def plot_upi_per_olahan(df):
@@ -159,6 +267,7 @@ def value_count_top5_with_others(df, group_col, value_name="jumlah_proses"):
 
 #     return fig
 
+@dukung_ringan
 def plot_upi_jenis_proses_jenis_ikan_catplot(df, figsize=(12, 8)):
     """
     Membuat catplot bar Jumlah UPI per Jenis Proses
@@ -178,7 +287,7 @@ def plot_upi_jenis_proses_jenis_ikan_catplot(df, figsize=(12, 8)):
     # Agregasi data
     df_grouped = (
         df
-        .groupby(["JENIS KEGIATAN", "JENIS IKAN"])
+        .groupby(["JENIS KEGIATAN", "JENIS IKAN"], observed=True)
         .size()
         .reset_index(name="jumlah_upi")
     )
@@ -245,6 +354,7 @@ def helper_segmented_filter(
     else:
         return df
     
+@dukung_ringan
 def donut_plot_kategori(
     df,
     column,
@@ -328,6 +438,7 @@ def donut_plot_kategori(
 
     return fig
 
+@dukung_ringan
 def donut_plot_kategori_agregat(
     df,
     # column_kategori,
@@ -374,9 +485,8 @@ def donut_plot_kategori_agregat(
         )
         return fig
 
-    # Gunakan label_tampil untuk legend
-    df_plot = df.copy()
-    df_plot["Kategori"] = label_tampil
+    # Gunakan label_tampil untuk legend (frame kecil berisi 2 kolom yang dipakai)
+    df_plot = pd.DataFrame({"Kategori": label_tampil, column_value: df[column_value].to_numpy()})
 
     fig = px.pie(
         df_plot,
@@ -409,6 +519,7 @@ def donut_plot_kategori_agregat(
     return fig
 
 
+@dukung_ringan
 def donut_plot_binary(
     df,
     kolom,
@@ -531,6 +642,133 @@ def parse_produksi(x):
 
     return float(x)
 
+# angka desimal tanpa tanda/spasi (bentuk yang ada di sheet produksi);
+# bentuk lain (spasi, tanda, eksponen, teks) diserahkan ke parser skalar
+_POLA_ANGKA = r"(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)"
+_POLA_TUNGGAL = rf"^{_POLA_ANGKA}$"
+_POLA_PASANGAN = rf"^(?P<a>{_POLA_ANGKA})(?P<sep>[-/])(?P<b>{_POLA_ANGKA})$"
+
+
+def _parse_teks(teks):
+    """
+    Parse cepat array string (object) untuk bentuk ``'350'``,
+    ``'200-300'`` dan ``'1600/400'``.
+
+    Memakai pyarrow.compute (regex + cast di C++) jika tersedia,
+    selain itu accessor ``.str`` pandas.
+
+    Returns
+    -------
+    hasil : numpy.ndarray
+        float64; NaN untuk string kosong dan yang tidak cocok pola.
+    sisa : numpy.ndarray
+        Mask bool string tidak kosong yang tidak cocok pola.
+    """
+    hasil = np.full(len(teks), np.nan)
+
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        pa = None
+
+    if pa is not None:
+        arr = pa.array(teks, type=pa.string())
+        tunggal = pc.match_substring_regex(arr, _POLA_TUNGGAL).to_numpy(zero_copy_only=False)
+        hasil[tunggal] = pc.cast(arr.filter(tunggal), pa.float64()).to_numpy()
+
+        pasangan = pc.extract_regex(arr, _POLA_PASANGAN)
+        cocok = pasangan.is_valid().to_numpy(zero_copy_only=False)
+        pasangan = pasangan.filter(cocok)
+        a = pc.cast(pc.struct_field(pasangan, "a"), pa.float64()).to_numpy()
+        b = pc.cast(pc.struct_field(pasangan, "b"), pa.float64()).to_numpy()
+    else:
+        seri = pd.Series(teks, dtype=object)
+        tunggal = seri.str.match(_POLA_TUNGGAL).to_numpy(dtype=bool)
+        hasil[tunggal] = seri[tunggal].to_numpy().astype("float64")
+
+        pasangan = seri.str.extract(_POLA_PASANGAN)
+        cocok = pasangan["a"].notna().to_numpy()
+        a = pasangan["a"][cocok].to_numpy().astype("float64")
+        b = pasangan["b"][cocok].to_numpy().astype("float64")
+
+    # '200-300' / '1600/400' -> rata-rata
+    hasil[cocok] = (a + b) / 2
+
+    sisa = ~tunggal & ~cocok & (teks != "")
+    return hasil, sisa
+
+
+def parse_produksi_kolom(series):
+    """
+    Versi kolom dari :func:`parse_produksi`: seluruh Series diubah
+    sekaligus dengan operasi string/regex tervektorisasi.
+
+    Hasilnya identik bit-per-bit dengan ``series.map(parse_produksi)``.
+    Sel yang membuat versi skalar raise (mis. ``'abc'``, ``'1-2-3'``)
+    menjadi NaN dan dicatat di tabel samping.
+
+    Parameters
+    ----------
+    series : pandas.Series
+        Nilai produksi mentah (string, angka, kosong).
+
+    Returns
+    -------
+    hasil : pandas.Series
+        float64, index sama dengan ``series``.
+    gagal : pandas.DataFrame
+        Sel yang tidak bisa di-parse: kolom ``nilai`` (isi asli) dan
+        ``alasan`` (pesan error), index = label baris di ``series``.
+    """
+    hasil = np.full(len(series), np.nan)
+    posisi_skalar = []
+
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        nilai = series.to_numpy(dtype="float64", na_value=np.nan)
+        hasil = np.where(nilai == 0, np.nan, nilai)
+    else:
+        objek = series.to_numpy(dtype=object)
+        kosong = pd.isna(objek)
+
+        # kolom campuran (angka + string) perlu mask tipe per sel
+        if pd.api.types.infer_dtype(objek, skipna=True) in ("string", "empty"):
+            adalah_str = ~kosong
+        else:
+            isi = np.flatnonzero(~kosong)
+            adalah_str = np.zeros(len(objek), dtype=bool)
+            adalah_str[isi] = np.frompyfunc(type, 1, 1)(objek[isi]) == str
+
+        # ---------- sel numerik (bukan string) ----------
+        posisi_angka = np.flatnonzero(~adalah_str & ~kosong)
+        try:
+            nilai = objek[posisi_angka].astype("float64")
+            hasil[posisi_angka] = np.where(nilai == 0, np.nan, nilai)
+        except (TypeError, ValueError):
+            posisi_skalar.append(posisi_angka)
+
+        # ---------- sel string ----------
+        posisi_str = np.flatnonzero(adalah_str)
+        hasil[posisi_str], sisa = _parse_teks(objek[posisi_str])
+        posisi_skalar.append(posisi_str[sisa])
+
+    gagal = []
+    for posisi in np.sort(np.concatenate(posisi_skalar or [[]]).astype(np.int64)):
+        nilai = series.iat[posisi]
+        try:
+            hasil[posisi] = parse_produksi(nilai)
+        except (TypeError, ValueError) as err:
+            gagal.append((series.index[posisi], nilai, str(err)))
+
+    tabel_gagal = pd.DataFrame(
+        [(n, e) for _, n, e in gagal],
+        index=pd.Index([i for i, _, _ in gagal], name=series.index.name),
+        columns=["nilai", "alasan"],
+        dtype=object
+    )
+
+    return pd.Series(hasil, index=series.index, name=series.name), tabel_gagal
+
 def add_dynamic_noise(series, noise_level=0.15, wave_strength=0.05, seed=None):
     """
     Menambahkan variasi dinamis + gelombang agar data terlihat alami.
@@ -571,6 +809,160 @@ def add_dynamic_noise(series, noise_level=0.15, wave_strength=0.05, seed=None):
 
     return series * (1 + combined_noise)
 
+# noise per entitas: bulan ke-0 deret acak tiap entitas, dan periode gelombang
+ASAL_NOISE = pd.Timestamp("2000-01-01")
+PERIODE_GELOMBANG = 12
+
+
+def _hash_kunci(kunci):
+    """Hash 64-bit yang stabil antar proses (``hash()`` bawaan diacak per proses)."""
+    return int.from_bytes(
+        hashlib.blake2b(str(kunci).encode("utf-8"), digest_size=8).digest(), "little"
+    )
+
+
+def add_entity_noise(series, kunci, tanggal, noise_level=0.15, wave_strength=0.05, seed=None):
+    """
+    Variasi dinamis + gelombang seperti :func:`add_dynamic_noise`, tetapi
+    ditentukan per entitas dan per bulan.
+
+    Tiap entitas memakai ``numpy.random.Generator`` sendiri (Philox dengan
+    kunci ``(hash kunci, seed)``); noise bulan ke-m adalah angka ke-m deret
+    acak entitas itu (dihitung dari :data:`ASAL_NOISE`). Gelombang juga per
+    entitas: ``sin(2*pi*m / PERIODE_GELOMBANG + fase)`` dengan fase acak
+    per entitas. Hasil tidak bergantung pada urutan baris, pembagian
+    potongan, maupun proses yang menghitungnya, dan tidak menyentuh RNG
+    global.
+
+    Parameters
+    ----------
+    series : pd.Series or array-like
+        Data numerik.
+    kunci : array-like
+        Kunci entitas per baris (mis. NAMA UPI); Categorical paling cepat.
+    tanggal : array-like
+        Tanggal per baris (bulan dipakai, hari diabaikan).
+    noise_level, wave_strength : float
+        Sama dengan :func:`add_dynamic_noise`.
+    seed : int or None
+        None = acak tiap panggilan.
+
+    Returns
+    -------
+    Sama tipe dengan ``series`` (Series mempertahankan index).
+    """
+    nilai = np.asarray(series, dtype="float64")
+    n = len(nilai)
+
+    tanggal = pd.DatetimeIndex(tanggal)
+    bulan = ((tanggal.year - ASAL_NOISE.year) * 12 + tanggal.month - ASAL_NOISE.month).to_numpy()
+    if n and bulan.min() < 0:
+        raise ValueError(f"Tanggal sebelum {ASAL_NOISE:%Y-%m} tidak didukung")
+
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    seed = int(seed) & 0xFFFF_FFFF_FFFF_FFFF
+
+    kode, unik = pd.factorize(kunci, use_na_sentinel=False)
+
+    # satu Generator per entitas = Generator(Philox(key=hash_kunci + (seed << 64))).
+    # Philox cukup diganti kuncinya, jauh lebih murah daripada membuat
+    # Generator baru untuk tiap entitas.
+    bit_generator = np.random.Philox(key=0)
+    rng = np.random.Generator(bit_generator)
+    state = bit_generator.state
+
+    # fase, lalu deret acak bulan 0..bulan terakhir entitas
+    panjang = np.zeros(len(unik), dtype=np.int64)
+    np.maximum.at(panjang, kode, bulan + 1)
+    fase = np.empty(len(unik))
+    deret = []
+    for e, k in enumerate(unik):
+        state["state"]["key"] = np.array([_hash_kunci(k), seed], dtype=np.uint64)
+        state["state"]["counter"] = np.zeros(4, dtype=np.uint64)
+        state.update(buffer_pos=4, has_uint32=0, uinteger=0)
+        bit_generator.state = state
+        fase[e] = rng.uniform(0, 2 * np.pi)
+        deret.append(rng.standard_normal(panjang[e]))
+
+    # ambil angka ke-bulan dari deret entitas tiap baris
+    awal = np.concatenate(([0], np.cumsum(panjang)[:-1]))
+    acak = np.concatenate(deret)[awal[kode] + bulan] if n else np.empty(0)
+
+    combined_noise = (
+        acak * noise_level
+        + np.sin(2 * np.pi * bulan / PERIODE_GELOMBANG + fase[kode]) * wave_strength
+    )
+
+    return series * (1 + combined_noise)
+
+def _agregasi_tren(df, x, kolom_nilai, kolom_grup=None, dropna=True):
+    """
+    Agregasi mean/min/max ``kolom_nilai`` per (grup, x) dalam satu groupby.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame or LIB.cube.CubeSlice
+        Data mentah, atau potongan cube (roll-up dari sel agregat).
+    x : str or array-like
+        Nama kolom sumbu x, atau array/Index sepanjang ``df``.
+    kolom_nilai : str
+    kolom_grup : str, optional
+    dropna : bool
+        Jika False, baris dengan grup kosong menjadi grup ``NaN`` tersendiri.
+
+    Returns
+    -------
+    dict
+        ``{nama_grup: (x_vals, y_mean, y_min, y_max)}`` berisi array NumPy
+        yang sudah terurut menurut x. Tanpa grup, kuncinya ``None``.
+        Dengan grup, dict kosong jika tidak ada baris yang tersisa.
+    """
+    if isinstance(df, CubeSlice):
+        if x != df.cube.kolom_waktu or kolom_nilai != df.cube.kolom_nilai:
+            raise ValueError(
+                f"Cube hanya berisi {df.cube.kolom_nilai} per {df.cube.kolom_waktu}"
+            )
+        kunci = ([kolom_grup] if kolom_grup else []) + [x]
+        agg = df.rollup(by=kolom_grup, dropna=dropna).set_index(kunci)
+    else:
+        x_key = df[x] if isinstance(x, str) else x
+        keys = [x_key] if not kolom_grup else [df[kolom_grup], x_key]
+
+        agg = (
+            df[kolom_nilai]
+            .groupby(keys, observed=True, sort=True, dropna=dropna)
+            .agg(["mean", "min", "max"])
+        )
+
+    if kolom_grup and agg.empty:
+        # mis. filter hanya menyisakan baris dengan grup kosong
+        return {}
+
+    y_mean = agg["mean"].to_numpy()
+    y_min = agg["min"].to_numpy()
+    y_max = agg["max"].to_numpy()
+
+    if not kolom_grup:
+        return {None: (agg.index.to_numpy(), y_mean, y_min, y_max)}
+
+    # baris hasil groupby sudah bersebelahan per grup -> potong di batas kode
+    kode = agg.index.codes[0]
+    label = agg.index.levels[0]
+    x_vals = agg.index.get_level_values(1).to_numpy()
+
+    batas = np.flatnonzero(np.diff(kode)) + 1
+    awal = np.concatenate(([0], batas))
+    akhir = np.concatenate((batas, [len(kode)]))
+
+    return {
+        (label[kode[a]] if kode[a] >= 0 else np.nan):
+            (x_vals[a:b], y_mean[a:b], y_min[a:b], y_max[a:b])
+        for a, b in zip(awal, akhir)
+    }
+
+
+@dukung_ringan
 def plot_tren_produksi_total(
     df,
     kolom_tanggal,
@@ -579,14 +971,32 @@ def plot_tren_produksi_total(
     judul="Tren Produksi",
     figsize=(10, 5),
     tampil_legend=False,
-    watermark_text="Data Dummy"
+    watermark_text="Data Dummy",
+    max_points=MAX_TITIK_TREN,
+    metode_downsample="lttb"
 ):
     """
     Line plot time-series menggunakan Plotly (tanpa ubah cara pemanggilan).
+
+    Deret lebih panjang dari ``max_points`` dikurangi di server
+    (:func:`LIB.downsample.kurangi_tren`, metode ``"lttb"`` atau
+    ``"minmax"``); ekstrem area min-max tetap dipertahankan.
+    ``max_points=None`` mengirim semua titik.
     """
 
-    # Jika dataframe kosong
-    if df.empty:
+    # =========================
+    # TENTUKAN KOLOM X
+    # =========================
+    if kolom_tanggal == "index":
+        x_key = df.index.rename("_x_axis")
+    else:
+        x_key = kolom_tanggal
+
+    # satu groupby untuk semua grup sekaligus
+    hasil = {} if df.empty else _agregasi_tren(df, x_key, kolom_nilai, kolom_grup)
+
+    # Jika dataframe kosong (atau semua grup kosong)
+    if not hasil:
         fig = go.Figure()
         fig.add_annotation(
             text="Tidak ada data",
@@ -597,17 +1007,6 @@ def plot_tren_produksi_total(
         fig.update_layout(title=judul)
         return fig
 
-    df_plot = df.copy()
-
-    # =========================
-    # TENTUKAN KOLOM X
-    # =========================
-    if kolom_tanggal == "index":
-        df_plot["_x_axis"] = df_plot.index
-        x_col = "_x_axis"
-    else:
-        x_col = kolom_tanggal
-
     fig = go.Figure()
 
     # =========================
@@ -615,23 +1014,14 @@ def plot_tren_produksi_total(
     # =========================
     if not kolom_grup:
 
-        agg = (
-            df_plot
-            .groupby(x_col)[kolom_nilai]
-            .agg(["mean", "min", "max"])
-            .reset_index()
-            .sort_values(x_col)
+        (x_vals, y_mean, _, _), (x_area, y_area) = kurangi_tren(
+            *hasil[None], max_points=max_points, metode=metode_downsample
         )
 
-        x_vals = agg[x_col]
-        y_min = agg["min"]
-        y_max = agg["max"]
-        y_mean = agg["mean"]
-
         # AREA RANGE (polygon stabil)
         fig.add_trace(go.Scatter(
-            x=list(x_vals) + list(x_vals[::-1]),
-            y=list(y_max) + list(y_min[::-1]),
+            x=x_area,
+            y=y_area,
             fill="toself",
             fillcolor="rgba(0,100,200,0.2)",
             line=dict(color="rgba(255,255,255,0)"),
@@ -652,29 +1042,26 @@ def plot_tren_produksi_total(
     # =========================
     else:
 
-        groups = df_plot[kolom_grup].unique()
+        # urutan grup mengikuti kemunculan pertama di data
+        # (cube: urutan hasil roll-up)
+        if isinstance(df, CubeSlice):
+            urutan_grup = list(hasil)
+        else:
+            urutan_grup = df[kolom_grup].dropna().unique()
 
-        for g in groups:
+        for g in urutan_grup:
 
-            df_g = df_plot[df_plot[kolom_grup] == g]
+            if g not in hasil:
+                continue
 
-            agg = (
-                df_g
-                .groupby(x_col)[kolom_nilai]
-                .agg(["mean", "min", "max"])
-                .reset_index()
-                .sort_values(x_col)
+            (x_vals, y_mean, _, _), (x_area, y_area) = kurangi_tren(
+                *hasil[g], max_points=max_points, metode=metode_downsample
             )
 
-            x_vals = agg[x_col]
-            y_min = agg["min"]
-            y_max = agg["max"]
-            y_mean = agg["mean"]
-
             # AREA RANGE
             fig.add_trace(go.Scatter(
-                x=list(x_vals) + list(x_vals[::-1]),
-                y=list(y_max) + list(y_min[::-1]),
+                x=x_area,
+                y=y_area,
                 fill="toself",
                 fillcolor="rgba(0,100,200,0.15)",
                 line=dict(color="rgba(255,255,255,0)"),
@@ -910,6 +1297,7 @@ def hex_to_rgb(hex_color):
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
 
+@dukung_ringan
 def plot_line_chart(
     data,
     x_axis,            # string nama kolom, misal 'TANGGAL'
@@ -919,11 +1307,17 @@ def plot_line_chart(
     judul: str = None,
     figsize=(10, 5),
     tampil_legend=False,
-    watermark_text="Data Dummy"
+    watermark_text="Data Dummy",
+    max_points=MAX_TITIK_TREN,     # anggaran titik per trace, None = semua titik
+    metode_downsample="lttb"       # "lttb" / "minmax" (lihat LIB.downsample)
 ):
     area_opacity = 0.25
 
-    if data.empty:
+    # satu groupby (grup, x) untuk semua trace; hasil sudah terurut per x.
+    # grup kosong tetap ditampilkan sebagai trace "nan"
+    hasil = {} if data.empty else _agregasi_tren(data, x_axis, y_axis, kolom_grup, dropna=False)
+
+    if not hasil:
         fig = go.Figure()
         fig.add_annotation(
             text="Tidak ada data",
@@ -934,38 +1328,23 @@ def plot_line_chart(
         fig.update_layout(title=judul)
         return fig
 
-    df_plot = data.copy()
-
-    # pastikan kolom x_axis datetime jika datetime
-    if pd.api.types.is_datetime64_any_dtype(df_plot[x_axis]):
-        df_plot = df_plot.sort_values([kolom_grup, x_axis] if kolom_grup else [x_axis]).reset_index(drop=True)
-
     fig = go.Figure()
     colors = px.colors.qualitative.Plotly
 
     # ===== TANPA GRUP =====
     if not kolom_grup:
-        agg = (
-            df_plot
-            .groupby(x_axis)[y_axis]
-            .agg(["mean", "min", "max"])
-            .reset_index()
-            .sort_values(x_axis)
+        (x_vals, y_mean, y_min, y_max), (x_area, y_area) = kurangi_tren(
+            *hasil[None], max_points=max_points, metode=metode_downsample
         )
 
-        x_vals = agg[x_axis]
-        y_min = agg["min"]
-        y_max = agg["max"]
-        y_mean = agg["mean"]
-
         color_line = colors[0]
         r, g, b = hex_to_rgb(color_line)
         color_fill = f"rgba({r},{g},{b},{area_opacity})"
 
         # AREA
         fig.add_trace(go.Scatter(
-            x=list(x_vals) + list(x_vals[::-1]),
-            y=list(y_max) + list(y_min[::-1]),
+            x=x_area,
+            y=y_area,
             fill="toself",
             fillcolor=color_fill,
             line=dict(color="rgba(255,255,255,0)"),
@@ -980,43 +1359,29 @@ def plot_line_chart(
             mode="lines+markers",
             name="Rata-rata",
             line=dict(color=color_line, width=3),
-            customdata=list(zip(y_min, y_max)),
+            customdata=np.column_stack((y_min, y_max)),
             hovertemplate=
                 "<b>Tanggal:</b> %{x}<br>" +
                 "<b>Mean:</b> %{y}<br>" +
-                "<b>Min:</b> %{customdata[0]}<br>" +
-                "<b>Max:</b> %{customdata[1]}<extra></extra>"
+                "<b>Min:</b> %{customdata[0]:.1f}<br>" +
+                "<b>Max:</b> %{customdata[1]:.1f}<extra></extra>"
         ))
 
     # ===== DENGAN GRUP =====
     else:
-        df_plot[kolom_grup] = df_plot[kolom_grup].astype(str)
-        groups = df_plot[kolom_grup].dropna().unique()
-
-        for i, g in enumerate(groups):
-            df_g = df_plot[df_plot[kolom_grup] == g]
-
-            agg = (
-                df_g
-                .groupby(x_axis)[y_axis]
-                .agg(["mean", "min", "max"])
-                .reset_index()
-                .sort_values(x_axis)
+        for i, (g, deret) in enumerate(hasil.items()):
+            (x_vals, y_mean, y_min, y_max), (x_area, y_area) = kurangi_tren(
+                *deret, max_points=max_points, metode=metode_downsample
             )
 
-            x_vals = agg[x_axis]
-            y_min = agg["min"]
-            y_max = agg["max"]
-            y_mean = agg["mean"]
-
             color_line = colors[i % len(colors)]
             r, g_color, b = hex_to_rgb(color_line)
             color_fill = f"rgba({r},{g_color},{b},{area_opacity})"
 
             # AREA
             fig.add_trace(go.Scatter(
-                x=list(x_vals) + list(x_vals[::-1]),
-                y=list(y_max) + list(y_min[::-1]),
+                x=x_area,
+                y=y_area,
                 fill="toself",
                 fillcolor=color_fill,
                 line=dict(color="rgba(255,255,255,0)"),
@@ -1029,15 +1394,15 @@ def plot_line_chart(
                 x=x_vals,
                 y=y_mean,
                 mode="lines+markers",
-                name=g,
+                name=str(g),
                 line=dict(color=color_line, width=3),
-                customdata=list(zip(y_min, y_max)),
+                customdata=np.column_stack((y_min, y_max)),
                 hovertemplate=
                     "<b>Group:</b> %{fullData.name}<br>" +
                     "<b>Tanggal:</b> %{x}<br>" +
                     "<b>Mean:</b> %{y}<br>" +
-                    "<b>Min:</b> %{customdata[0]}<br>" +
-                    "<b>Max:</b> %{customdata[1]}<extra></extra>"
+                    "<b>Min:</b> %{customdata[0]:.1f}<br>" +
+                    "<b>Max:</b> %{customdata[1]:.1f}<extra></extra>"
             ))
 
     # ===== LAYOUT =====
@@ -1070,19 +1435,23 @@ def plot_line_chart(
     return fig
 
 
+@dukung_ringan
 def plot_bedah_upi_stack(df, stack_col):
 
-    df_plot = df.copy()
-
-    # pastikan numeric
-    df_plot['tahun bedah upi'] = pd.to_numeric(df_plot['tahun bedah upi'], errors='coerce')
+    # hanya kolom yang dipakai (tanpa menyalin seluruh frame);
+    # pastikan tahun numeric
+    df_plot = pd.DataFrame({
+        'tahun bedah upi': pd.to_numeric(df['tahun bedah upi'], errors='coerce'),
+        'NAMA UPI': df['NAMA UPI'],
+        stack_col: df[stack_col],
+    })
 
     df_plot = df_plot.dropna(subset=['tahun bedah upi','NAMA UPI'])
 
     # jumlah UPI unik per kategori
     df_grouped = (
         df_plot
-        .groupby(['tahun bedah upi', stack_col])['NAMA UPI']
+        .groupby(['tahun bedah upi', stack_col], observed=True)['NAMA UPI']
         .nunique()
         .reset_index(name='jumlah_upi')
     )
@@ -1090,7 +1459,7 @@ def plot_bedah_upi_stack(df, stack_col):
     # total UPI unik per tahun
     df_total = (
         df_plot
-        .groupby('tahun bedah upi')['NAMA UPI']
+        .groupby('tahun bedah upi', observed=True)['NAMA UPI']
         .nunique()
         .reset_index(name='total_upi')
     )
@@ -1126,25 +1495,32 @@ def plot_bedah_upi_stack(df, stack_col):
     return fig
 
 
+@dukung_ringan
 def plot_produksi_stack_tahun(df, stack_col):
 
-    df_plot = df.copy()
-
-    # pastikan tanggal datetime
-    df_plot['TANGGAL'] = pd.to_datetime(df_plot['TANGGAL'], errors='coerce')
-
-    # ambil tahun
-    df_plot['TAHUN'] = df_plot['TANGGAL'].dt.year
+    if isinstance(df, CubeSlice):
+        # roll-up cube: total produksi per (stack_col, tanggal)
+        df_plot = df.rollup(by=stack_col)
+        df_plot = df_plot[df_plot['count'] > 0]
+        df_plot['TAHUN'] = df_plot['TANGGAL'].dt.year
+        df_plot['PRODUKSI_BERSIH'] = df_plot['sum']
 
-    # produksi numeric
-    df_plot['PRODUKSI_BERSIH'] = pd.to_numeric(df_plot['PRODUKSI_BERSIH'], errors='coerce')
+    else:
+        # hanya kolom yang dipakai (tanpa menyalin seluruh frame):
+        # tahun dari tanggal, produksi numeric
+        # produksi disimpan float32; jumlahkan di float64 agar total tetap presisi
+        df_plot = pd.DataFrame({
+            'TAHUN': pd.to_datetime(df['TANGGAL'], errors='coerce').dt.year,
+            stack_col: df[stack_col],
+            'PRODUKSI_BERSIH': pd.to_numeric(df['PRODUKSI_BERSIH'], errors='coerce').astype('float64'),
+        })
 
     df_plot = df_plot.dropna(subset=['TAHUN','PRODUKSI_BERSIH'])
 
     # agregasi produksi
     df_grouped = (
         df_plot
-        .groupby(['TAHUN', stack_col])['PRODUKSI_BERSIH']
+        .groupby(['TAHUN', stack_col], observed=True)['PRODUKSI_BERSIH']
         .sum()
         .reset_index()
         .sort_values('TAHUN')
@@ -0,0 +1,201 @@
+# cube.py
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# KONFIGURASI DEFAULT
+# ============================================================
+KOLOM_WAKTU = "TANGGAL"
+KOLOM_NILAI = "PRODUKSI_BERSIH"
+
+KOLOM_DIMENSI = [
+    "KECAMATAN",
+    "DESA",
+    "JENIS KEGIATAN",
+    "JENIS IKAN",
+    "PENERIMAAN BANTUAN",
+]
+
+# dimensi biner "kolom terisi / kosong" (filter kontak & pemisah bedah UPI)
+KOLOM_FLAG = [
+    "NO TELP HASH",
+    "tahun bedah upi",
+]
+
+UKURAN = ["count", "sum", "sumsq", "min", "max"]
+
+
+def _nama_flag(kolom):
+    return f"ADA {kolom}"
+
+
+def mask_sel(cells, kategori=None, notna=None):
+    """
+    Mask sel (baris ``cells``) yang lolos filter, format filter sama
+    seperti :meth:`LIB.filter_index.FilterIndex.select`. Flag dicari di
+    kolom ``ADA <kolom>``.
+    """
+    mask = np.ones(len(cells), dtype=bool)
+
+    for kolom, pilihan in (kategori or {}).items():
+        if pilihan is None:
+            continue
+        nilai = cells[kolom]
+        if isinstance(nilai.dtype, pd.CategoricalDtype):
+            # tabel lookup per kategori, lalu gather lewat kode (tanpa hash per sel)
+            posisi = nilai.cat.categories.get_indexer(pd.Index(pilihan))
+            lookup = np.zeros(len(nilai.cat.categories) + 1, dtype=bool)
+            lookup[posisi[posisi >= 0]] = True
+            mask &= lookup[nilai.cat.codes.to_numpy()]
+        else:
+            mask &= nilai.isin(pilihan).to_numpy()
+
+    for kolom, harus_ada in (notna or {}).items():
+        if harus_ada is None:
+            continue
+        mask &= cells[_nama_flag(kolom)].to_numpy() == harus_ada
+
+    return mask
+
+
+class ProductionCube:
+    """
+    Cube agregat produksi: count, sum, sum of squares, min, max dari
+    ``KOLOM_NILAI`` per sel (dimensi x flag x tanggal).
+
+    Dibangun sekali per versi dataset; semua chart tren kemudian
+    di-roll-up dari sel cube, sehingga biaya query sebanding dengan
+    jumlah sel, bukan jumlah baris mentah.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset mentah.
+    kolom_dimensi : list of str
+        Dimensi kategori cube.
+    kolom_flag : list of str
+        Kolom yang dijadikan dimensi biner ``ADA <kolom>``.
+    kolom_waktu, kolom_nilai : str
+    """
+
+    def __init__(
+        self,
+        df,
+        kolom_dimensi=KOLOM_DIMENSI,
+        kolom_flag=KOLOM_FLAG,
+        kolom_waktu=KOLOM_WAKTU,
+        kolom_nilai=KOLOM_NILAI
+    ):
+        self.kolom_dimensi = [k for k in kolom_dimensi if k in df.columns]
+        self.kolom_flag = [k for k in kolom_flag if k in df.columns]
+        self.kolom_waktu = kolom_waktu
+        self.kolom_nilai = kolom_nilai
+        self.n_rows = len(df)
+
+        kunci = {k: df[k] for k in self.kolom_dimensi}
+        for k in self.kolom_flag:
+            kunci[_nama_flag(k)] = df[k].notna()
+        kunci[kolom_waktu] = df[kolom_waktu]
+
+        # akumulasi di float64 agar sum/sumsq tetap presisi
+        nilai = df[kolom_nilai].astype("float64")
+        tabel = pd.DataFrame({**kunci, "_v": nilai, "_v2": nilai * nilai})
+
+        self.cells = (
+            tabel
+            .groupby(list(kunci), observed=True, dropna=False, sort=False)
+            .agg(
+                count=("_v", "count"),
+                sum=("_v", "sum"),
+                sumsq=("_v2", "sum"),
+                min=("_v", "min"),
+                max=("_v", "max"),
+            )
+            .reset_index()
+        )
+
+    def __len__(self):
+        return len(self.cells)
+
+    def slice(self, kategori=None, notna=None):
+        """
+        Potongan cube sesuai filter, dengan format filter yang sama
+        seperti :meth:`LIB.filter_index.FilterIndex.select`.
+
+        Parameters
+        ----------
+        kategori : dict, optional
+            ``{kolom: daftar nilai}``; ``None`` = tanpa filter.
+        notna : dict, optional
+            ``{kolom: True/False/None}`` untuk kolom di ``kolom_flag``.
+
+        Returns
+        -------
+        CubeSlice
+        """
+        return CubeSlice(self, self.cells.loc[mask_sel(self.cells, kategori, notna)])
+
+
+class CubeSlice:
+    """
+    Hasil filter :class:`ProductionCube`. Diterima oleh chart tren di
+    ``LIB.charts`` sebagai pengganti DataFrame mentah.
+    """
+
+    def __init__(self, cube, cells):
+        self.cube = cube
+        self.cells = cells
+
+    @property
+    def empty(self):
+        return self.cells.empty
+
+    def __len__(self):
+        return len(self.cells)
+
+    def rollup(self, by=None, dropna=True):
+        """
+        Roll-up sel ke level ``by`` + tanggal.
+
+        Parameters
+        ----------
+        by : str or list of str, optional
+            Dimensi pengelompokan tambahan (selain tanggal).
+        dropna : bool
+            Buang grup dengan nilai dimensi kosong.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Kolom ``by`` + tanggal + count, sum, sumsq, min, max, mean, std.
+            ``mean``/``std`` dihitung dari sum & sumsq (std populasi).
+        """
+        if by is None:
+            by = []
+        elif isinstance(by, str):
+            by = [by]
+
+        kunci = list(by) + [self.cube.kolom_waktu]
+
+        hasil = (
+            self.cells
+            .groupby(kunci, observed=True, dropna=dropna, sort=True)
+            .agg(
+                count=("count", "sum"),
+                sum=("sum", "sum"),
+                sumsq=("sumsq", "sum"),
+                min=("min", "min"),
+                max=("max", "max"),
+            )
+        )
+
+        count = hasil["count"].to_numpy(dtype="float64")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = hasil["sum"].to_numpy() / count
+            var = hasil["sumsq"].to_numpy() / count - mean * mean
+
+        hasil["mean"] = mean
+        hasil["std"] = np.sqrt(np.clip(var, 0, None))
+        return hasil.reset_index()
@@ -0,0 +1,253 @@
+# data_bersama.py
+#
+# Dataset UPI bersama antar proses server Streamlit di satu host.
+#
+# Satu proses penerbit (``python -m LIB.data_bersama --watch 30``) menulis
+# kolom bertipe dataset sebagai file .npy per versi, lalu mengganti file
+# penunjuk secara atomik. Proses server dengan DASHBOARD_DATA_BERSAMA=1
+# memetakan file tersebut (memory-map, tanpa salinan): halaman memori
+# dipakai bersama lewat page cache OS, bukan satu salinan per proses.
+#
+#   .data_cache/
+#     <stem>.bersama.json              penunjuk versi aktif (os.replace)
+#     bersama/<stem>-<sha16>/          satu direktori per versi
+#       manifest.json                  urutan, dtype & kategori kolom
+#       k000.npy, k001.npy, ...        kode kategori / nilai / mask
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from LIB.data_loader import DATA_PATH, CACHE_DIR, data_version, _entry, _frame
+
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# KONFIGURASI
+# ============================================================
+# versi lama yang disimpan selain versi aktif (proses yang belum pindah
+# versi tetap membaca file yang sudah dipetakannya)
+SIMPAN_VERSI = 2
+
+FORMAT_VERSION = 1
+
+
+def _stem(path):
+    return os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+
+
+def path_penunjuk(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """Lokasi file penunjuk versi aktif untuk dataset ``path``."""
+    return os.path.join(cache_dir, f"{_stem(path)}.bersama.json")
+
+
+def baca_penunjuk(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """
+    Isi penunjuk versi aktif, atau ``None`` jika belum ada yang
+    diterbitkan (atau formatnya tidak dikenal).
+    """
+    try:
+        with open(path_penunjuk(path, cache_dir), "r", encoding="utf-8") as f:
+            penunjuk = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if penunjuk.get("format_version") != FORMAT_VERSION:
+        return None
+    return penunjuk
+
+
+# ============================================================
+# TULIS (PENERBIT)
+# ============================================================
+def _tulis_kolom(series, file_dasar):
+    """
+    Menulis satu kolom sebagai .npy; mengembalikan entri manifest-nya.
+
+    - kategori       : kode (int8/16/32) + daftar kategori
+    - nullable int   : nilai + mask
+    - dtype NumPy    : nilai apa adanya (float32, datetime64, ...)
+    - object / teks  : dikodekan seperti kategori (dibaca sebagai category)
+    """
+    info = {"nama": series.name}
+    nilai = series.array
+
+    if isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == object:
+        cat = series.array if isinstance(series.dtype, pd.CategoricalDtype) else pd.Categorical(series)
+        np.save(file_dasar + ".npy", np.asarray(cat.codes))
+        info.update(
+            jenis="kategori",
+            kategori=cat.categories.tolist(),
+            ordered=bool(cat.ordered),
+        )
+    elif isinstance(nilai, pd.arrays.IntegerArray) or isinstance(nilai, pd.arrays.FloatingArray):
+        np.save(file_dasar + ".npy", nilai._data)
+        np.save(file_dasar + ".mask.npy", nilai._mask)
+        info.update(jenis="masked", dtype=str(series.dtype))
+    else:
+        np.save(file_dasar + ".npy", series.to_numpy())
+        info.update(jenis="numpy", dtype=str(series.dtype))
+
+    return info
+
+
+def _hapus_versi_lama(path, cache_dir, aktif, simpan):
+    """Menghapus direktori versi selain ``aktif`` dan ``simpan`` versi terbaru."""
+    induk = os.path.join(cache_dir, "bersama")
+    awalan = f"{_stem(path)}-"
+    versi = sorted(
+        (os.path.join(induk, d) for d in os.listdir(induk)
+         if d.startswith(awalan) and not d.endswith(".tmp")),
+        key=os.path.getmtime, reverse=True
+    )
+    for direktori in [d for d in versi if d != aktif][simpan:]:
+        # file yang masih dipetakan proses lain tetap bisa dibaca (POSIX)
+        shutil.rmtree(direktori, ignore_errors=True)
+
+
+def terbitkan(path=DATA_PATH, cache_dir=CACHE_DIR, simpan=SIMPAN_VERSI):
+    """
+    Menerbitkan versi dataset saat ini sebagai kolom .npy bersama.
+
+    Tidak menulis apa pun jika penunjuk sudah menunjuk versi (SHA-256
+    file sumber) yang sama.
+
+    Parameters
+    ----------
+    path : str
+        Workbook sumber (dibaca dari snapshot Arrow / Excel, bukan versi terbit).
+    cache_dir : str
+        Direktori cache; versi ditulis ke ``cache_dir/bersama``.
+    simpan : int
+        Jumlah versi lama yang dipertahankan.
+
+    Returns
+    -------
+    dict
+        Isi penunjuk versi aktif.
+    """
+    path = os.path.abspath(path)
+    # selalu dari file sumber, meski proses ini berjalan dengan mode bersama
+    df = _frame(_entry(path, cache_dir, bersama=False))
+    versi = data_version(path)
+
+    penunjuk = baca_penunjuk(path, cache_dir)
+    if penunjuk is not None and penunjuk["versi"] == versi \
+            and os.path.isdir(os.path.join(cache_dir, penunjuk["direktori"])):
+        return penunjuk
+
+    relatif = os.path.join("bersama", f"{_stem(path)}-{versi[:16]}")
+    direktori = os.path.join(cache_dir, relatif)
+    tmp_dir = direktori + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    kolom = [_tulis_kolom(df[k], os.path.join(tmp_dir, f"k{i:03d}")) for i, k in enumerate(df.columns)]
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "source": os.path.basename(path),
+        "versi": versi,
+        "n_rows": len(df),
+        "kolom": kolom,
+    }
+    with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, default=str)
+
+    shutil.rmtree(direktori, ignore_errors=True)
+    os.replace(tmp_dir, direktori)
+
+    penunjuk = {
+        "format_version": FORMAT_VERSION,
+        "versi": versi,
+        "direktori": relatif,
+        "diterbitkan": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    tmp_penunjuk = path_penunjuk(path, cache_dir) + ".tmp"
+    with open(tmp_penunjuk, "w", encoding="utf-8") as f:
+        json.dump(penunjuk, f)
+    os.replace(tmp_penunjuk, path_penunjuk(path, cache_dir))
+
+    _hapus_versi_lama(path, cache_dir, direktori, simpan)
+    logger.info("Dataset %s versi %s diterbitkan (%d baris)", manifest["source"], versi[:16], len(df))
+    return penunjuk
+
+
+# ============================================================
+# BACA (PROSES SERVER)
+# ============================================================
+def _petakan_kolom(info, file_dasar):
+    """Series dari file .npy yang dipetakan (read-only, tanpa salinan)."""
+    data = np.load(file_dasar + ".npy", mmap_mode="r")
+
+    if info["jenis"] == "kategori":
+        dtype = pd.CategoricalDtype(pd.Index(info["kategori"]), ordered=info["ordered"])
+        nilai = pd.Categorical.from_codes(data, dtype=dtype, validate=False)
+    elif info["jenis"] == "masked":
+        mask = np.load(file_dasar + ".mask.npy", mmap_mode="r")
+        kelas = pd.arrays.IntegerArray if data.dtype.kind in "iu" else pd.arrays.FloatingArray
+        nilai = kelas(data, mask)
+    else:
+        nilai = data
+
+    return pd.Series(nilai, name=info["nama"], copy=False)
+
+
+def petakan(penunjuk, cache_dir=CACHE_DIR):
+    """
+    Memetakan semua kolom versi ``penunjuk``.
+
+    Pemetaan hanya memesan ruang alamat; halaman dibaca dari page cache
+    (yang dipakai bersama semua proses) saat kolom benar-benar diakses.
+    Kolom teks (object) dikembalikan sebagai category.
+
+    Returns
+    -------
+    dict
+        ``{nama_kolom: pandas.Series}`` sesuai urutan kolom dataset.
+    """
+    direktori = os.path.join(cache_dir, penunjuk["direktori"])
+    with open(os.path.join(direktori, "manifest.json"), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    return {
+        info["nama"]: _petakan_kolom(info, os.path.join(direktori, f"k{i:03d}"))
+        for i, info in enumerate(manifest["kolom"])
+    }
+
+
+# ============================================================
+# CLI PENERBIT
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Terbitkan dataset UPI sebagai kolom memory-map bersama")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--simpan", type=int, default=SIMPAN_VERSI, help="jumlah versi lama yang disimpan")
+    parser.add_argument("--watch", type=float, default=None, metavar="DETIK",
+                        help="cek perubahan file sumber setiap DETIK dan terbitkan ulang")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    while True:
+        try:
+            terbitkan(args.data, args.cache_dir, simpan=args.simpan)
+        except Exception:
+            if args.watch is None:
+                raise
+            logger.exception("Gagal menerbitkan dataset, dicoba lagi")
+        if args.watch is None:
+            return 0
+        time.sleep(args.watch)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,734 @@
+# data_loader.py
+
+import os
+import sys
+import json
+import time
+import hashlib
+import logging
+import argparse
+import threading
+
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# PATH CONFIGURATION
+# ============================================================
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+DATA_PATH = os.path.join(ROOT_DIR, "data_upi_final_publish.xlsx")
+CACHE_DIR = os.path.join(ROOT_DIR, ".data_cache")
+
+# mode bersama: kolom dataset dipetakan dari versi yang diterbitkan
+# LIB.data_bersama (satu salinan untuk semua proses server di host);
+# tanpa versi terbit, proses memuat datanya sendiri seperti biasa
+MODE_BERSAMA = os.environ.get("DASHBOARD_DATA_BERSAMA", "0") not in ("", "0")
+
+
+# ============================================================
+# SCHEMA KOLOM
+# ============================================================
+# Kolom kategori disimpan sebagai pandas.Categorical dengan urutan
+# kategori terurut (stabil antar reload), sehingga isin/groupby/nunique
+# bekerja di atas kode integer, bukan hashing string per baris.
+KOLOM_KATEGORI = [
+    "KECAMATAN",
+    "DESA",
+    "JENIS KEGIATAN",
+    "JENIS IKAN",
+    "PENERIMAAN BANTUAN",
+    "NAMA UPI",
+]
+
+SCHEMA = {
+    **{kolom: "category" for kolom in KOLOM_KATEGORI},
+    "PRODUKSI_BERSIH": "float32",
+    "tahun bedah upi": "Int16",
+}
+
+# naikkan jika SCHEMA / format snapshot berubah agar snapshot lama tidak dipakai lagi
+# (2: snapshot Arrow IPC menggantikan Parquet)
+SCHEMA_VERSION = 2
+
+
+# ============================================================
+# CACHE PROSES (dipakai bersama oleh semua sesi Streamlit)
+# ============================================================
+_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+# path yang versi barunya dipasang oleh refresher latar (LIB.refresh)
+_DIPANTAU = set()
+
+
+def apply_schema(df, schema=SCHEMA):
+    """
+    Mengonversi kolom DataFrame sesuai ``schema`` (in-place).
+
+    - ``"category"`` : kategori diurutkan alfabetis (urutan stabil)
+    - dtype lain     : dikonversi via ``pd.to_numeric`` lalu ``astype``
+
+    Kolom yang tidak ada di DataFrame dilewati.
+
+    Returns
+    -------
+    pandas.DataFrame
+        DataFrame yang sama (untuk chaining).
+    """
+    for kolom, dtype in schema.items():
+        if kolom not in df.columns:
+            continue
+
+        if dtype == "category":
+            nilai = df[kolom].astype("string")
+            kategori = sorted(nilai.dropna().unique())
+            df[kolom] = pd.Categorical(nilai, categories=kategori)
+        else:
+            df[kolom] = pd.to_numeric(df[kolom], errors="coerce").astype(dtype)
+
+    return df
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """
+    Menghitung hash SHA-256 isi file secara bertahap.
+
+    Parameters
+    ----------
+    path : str
+        Lokasi file.
+    chunk_size : int
+        Ukuran blok baca (byte).
+
+    Returns
+    -------
+    str
+        Hex digest SHA-256.
+    """
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _stat_key(path):
+    """Kunci murah dari metadata file: (mtime_ns, size)."""
+    st_ = os.stat(path)
+    return st_.st_mtime_ns, st_.st_size
+
+
+def _snapshot_paths(path, cache_dir):
+    stem = os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+    arrow_path = os.path.join(cache_dir, f"{stem}.arrow")
+    meta_path = os.path.join(cache_dir, f"{stem}.meta.json")
+    return arrow_path, meta_path
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(meta_path, meta):
+    tmp_path = meta_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def parse_excel(path, sheet_name=0):
+    """
+    Membaca workbook publish dan menerapkan :data:`SCHEMA`.
+
+    Ini adalah satu-satunya tempat workbook di-parse; hasilnya
+    disimpan sebagai snapshot Arrow oleh :func:`load_data_upi`.
+    """
+    df = pd.read_excel(path, sheet_name=sheet_name)
+    df["TANGGAL"] = pd.to_datetime(df["TANGGAL"])
+    return apply_schema(df)
+
+
+def _write_snapshot(df, arrow_path):
+    """
+    Menulis ``df`` sebagai file Arrow IPC (Feather v2) tanpa kompresi,
+    sehingga kolom bisa dibaca langsung dari memory-map tanpa decode.
+    """
+    import pyarrow.feather as feather
+
+    tmp_path = arrow_path + ".tmp"
+    try:
+        feather.write_feather(df, tmp_path, compression="uncompressed")
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, arrow_path)
+
+
+def _galat_snapshot():
+    """
+    Exception yang membuat snapshot dilewati: direktori cache tidak bisa
+    ditulis, pyarrow tidak ada, atau kolom tidak bisa dikonversi ke Arrow
+    (mis. kolom object berisi campuran angka dan teks).
+    """
+    galat = (OSError, ImportError, ValueError, TypeError)
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return galat
+    return galat + (pa.ArrowException,)
+
+
+def _buka_snapshot(arrow_path):
+    """
+    Tabel Arrow di atas memory-map snapshot. Hanya halaman file milik
+    kolom yang dikonversi yang dibaca dari disk; tabel tetap menunjuk
+    versi file saat dibuka, meski snapshot kemudian diganti proses lain.
+    """
+    import pyarrow as pa
+
+    return pa.ipc.open_file(pa.memory_map(arrow_path)).read_all()
+
+
+def _load_from_disk(path, cache_dir, parser=parse_excel):
+    """
+    Membuka snapshot Arrow jika masih sesuai dengan file sumber,
+    atau mem-parse ulang Excel jika berubah.
+
+    Snapshot dianggap valid bila mtime+ukuran sama dengan metadata,
+    atau (jika mtime berubah tanpa isi berubah) hash SHA-256 sama.
+    Snapshot yang tidak bisa dibuka (terpotong / rusak) dibangun ulang.
+
+    Returns
+    -------
+    df : pandas.DataFrame or None
+        DataFrame lengkap, hanya jika snapshot tidak bisa ditulis
+        (tanpa snapshot kolom tidak bisa dibaca belakangan).
+    snapshot : pyarrow.Table or None
+        Tabel memory-map untuk membaca kolom sesuai kebutuhan.
+    sha256 : str
+    """
+    arrow_path, meta_path = _snapshot_paths(path, cache_dir)
+    mtime_ns, size = _stat_key(path)
+    meta = _read_meta(meta_path)
+
+    if meta is not None and meta.get("schema_version") != SCHEMA_VERSION:
+        meta = None
+
+    sha256 = None
+    if meta is not None and os.path.exists(arrow_path):
+        if meta.get("mtime_ns") == mtime_ns and meta.get("size") == size:
+            sha256 = meta["sha256"]
+            valid = True
+        else:
+            sha256 = hash_file(path)
+            valid = meta.get("sha256") == sha256
+            if valid:
+                # file hanya di-touch / disalin ulang, isi tetap sama
+                meta.update(mtime_ns=mtime_ns, size=size)
+                _write_meta(meta_path, meta)
+
+        if valid:
+            try:
+                return None, _buka_snapshot(arrow_path), sha256
+            except _galat_snapshot() as err:
+                # snapshot terpotong / rusak: parse ulang dan tulis ulang
+                logger.warning("Snapshot %s tidak bisa dibuka (%s), workbook di-parse ulang",
+                               os.path.basename(path), err)
+
+    if sha256 is None:
+        sha256 = hash_file(path)
+
+    df = parser(path)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        _write_snapshot(df, arrow_path)
+        _write_meta(meta_path, {
+            "source": os.path.basename(path),
+            "mtime_ns": mtime_ns,
+            "size": size,
+            "sha256": sha256,
+            "snapshot_sha256": hash_file(arrow_path),
+            "n_rows": len(df),
+            "schema_version": SCHEMA_VERSION,
+        })
+        # hasil parse dilepas; kolom dibaca ulang dari snapshot sesuai kebutuhan
+        return None, _buka_snapshot(arrow_path), sha256
+    except _galat_snapshot() as err:
+        # tetap lanjut dengan seluruh kolom di memori
+        logger.warning("Snapshot %s tidak bisa ditulis (%s), data dipakai dari memori",
+                       os.path.basename(path), err)
+        return df, None, sha256
+
+
+def _kunci_versi(path, cache_dir, bersama):
+    """
+    (kunci versi, path penunjuk bersama atau ``None``): stat file sumber,
+    atau stat penunjuk :mod:`LIB.data_bersama` jika mode bersama dan ada
+    versi terbit.
+    """
+    penunjuk_path = None
+    if bersama:
+        from LIB.data_bersama import path_penunjuk
+        penunjuk_path = path_penunjuk(path, cache_dir)
+        if not os.path.exists(penunjuk_path):
+            penunjuk_path = None
+
+    stat_key = ("bersama", *_stat_key(penunjuk_path)) if penunjuk_path else _stat_key(path)
+    return stat_key, penunjuk_path
+
+
+def _muat_entry(path, cache_dir, stat_key, penunjuk_path, parser):
+    """Membangun entri cache baru (belum dipasang di :data:`_CACHE`)."""
+    penunjuk = None
+    if penunjuk_path:
+        from LIB.data_bersama import baca_penunjuk, petakan
+        penunjuk = baca_penunjuk(path, cache_dir)
+
+    if penunjuk is not None:
+        snapshot, sha256 = None, penunjuk["versi"]
+        kolom = petakan(penunjuk, cache_dir)
+        urutan = list(kolom)
+    else:
+        df, snapshot, sha256 = _load_from_disk(path, cache_dir, parser)
+        if snapshot is not None:
+            urutan = list(snapshot.column_names)
+            kolom = {}
+        else:
+            urutan = list(df.columns)
+            kolom = {k: df[k] for k in urutan}
+
+    return {
+        "stat_key": stat_key,
+        "sha256": sha256,
+        "snapshot": snapshot,
+        "urutan": urutan,       # semua kolom dataset
+        "kolom": kolom,         # kolom yang sudah ada di memori
+        "frame": {},            # DataFrame per himpunan kolom
+        "derived": {},          # struktur turunan (get_derived)
+        "lock": threading.RLock(),
+    }
+
+
+def _entry(path, cache_dir, bersama=None, parser=parse_excel):
+    """
+    Entri cache proses untuk versi dataset ``path`` saat ini (dimuat jika perlu).
+
+    ``bersama`` (default :data:`MODE_BERSAMA`): pakai versi terbit
+    :mod:`LIB.data_bersama` jika ada; kunci versi = stat file penunjuk.
+    ``parser`` membaca workbook saat snapshot tidak ada / kedaluwarsa.
+
+    Path yang dipantau refresher latar (:func:`pantau_latar`) tidak
+    dimuat ulang di sini: versi baru dipasang oleh refresher.
+    """
+    path = os.path.abspath(path)
+    bersama = MODE_BERSAMA if bersama is None else bersama
+
+    entry = _CACHE.get(path)
+    if entry is not None and path in _DIPANTAU:
+        return entry
+
+    stat_key, penunjuk_path = _kunci_versi(path, cache_dir, bersama)
+    if entry is not None and entry["stat_key"] == stat_key:
+        return entry
+
+    with _CACHE_LOCK:
+        # cek ulang: mungkin thread lain sudah memuat saat menunggu lock
+        entry = _CACHE.get(path)
+        if entry is not None and entry["stat_key"] == stat_key:
+            return entry
+
+        entry = _muat_entry(path, cache_dir, stat_key, penunjuk_path, parser)
+        _CACHE[path] = entry
+        return entry
+
+
+def _frame(entry, kolom=None):
+    """
+    DataFrame berisi ``kolom`` (``None`` = semua), dirakit dari kolom di
+    memori; kolom yang belum pernah diminta dibaca dari snapshot sekali.
+    """
+    kolom = tuple(entry["urutan"] if kolom is None else dict.fromkeys(kolom))
+    frame = entry["frame"].get(kolom)
+    if frame is not None:
+        return frame
+
+    with entry["lock"]:
+        frame = entry["frame"].get(kolom)
+        if frame is not None:
+            return frame
+
+        tidak_ada = [k for k in kolom if k not in entry["urutan"]]
+        if tidak_ada:
+            raise KeyError(f"Kolom tidak ada di dataset: {tidak_ada}")
+
+        kurang = [k for k in kolom if k not in entry["kolom"]]
+        if kurang:
+            # split_blocks: kolom tidak digabung ke blok 2D, sehingga kolom
+            # tanpa null tetap menunjuk buffer memory-map (tanpa salinan)
+            baru = entry["snapshot"].select(kurang).to_pandas(split_blocks=True)
+            for k in kurang:
+                entry["kolom"][k] = baru[k]
+
+        frame = pd.DataFrame({k: entry["kolom"][k] for k in kolom}, copy=False)
+        entry["frame"][kolom] = frame
+        return frame
+
+
+# ============================================================
+# VERSI DATA
+# ============================================================
+class VersiData:
+    """
+    Satu versi dataset yang konsisten.
+
+    Kolom, struktur turunan dan sidik versi diambil dari entri cache yang
+    sama, sehingga rerun yang memegang objek ini tidak tercampur versi
+    baru yang dipasang refresher di tengah jalan. Entri lama dilepas
+    setelah tidak ada lagi rerun yang memegangnya.
+    """
+
+    def __init__(self, entry, path):
+        self._entry = entry
+        self.path = path
+
+    @property
+    def sha256(self):
+        """Hash SHA-256 file sumber versi ini."""
+        return self._entry["sha256"]
+
+    def frame(self, kolom=None):
+        """DataFrame bersama berisi ``kolom`` (lihat :func:`load_data_upi`)."""
+        return _frame(self._entry, kolom)
+
+    def derived(self, nama, builder, kolom=None):
+        """Struktur turunan versi ini (lihat :func:`get_derived`)."""
+        derived = self._entry["derived"]
+        if nama not in derived:
+            df = _frame(self._entry, kolom)
+            with self._entry["lock"]:
+                if nama not in derived:
+                    derived[nama] = builder(df)
+        return derived[nama]
+
+
+def versi_data(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """Versi dataset ``path`` yang sedang aktif (dimuat jika perlu)."""
+    return VersiData(_entry(path, cache_dir), os.path.abspath(path))
+
+
+def load_data_upi(path=DATA_PATH, cache_dir=CACHE_DIR, kolom=None):
+    """
+    Memuat dataset UPI dengan cache bertingkat.
+
+    1. Cache memori proses: dipakai bersama oleh semua rerun dan sesi.
+    2. Snapshot Arrow IPC (memory-map) di ``cache_dir``: dipakai saat
+       proses baru start; kolom dibaca per kebutuhan, bukan seluruh file.
+    3. Parse Excel: hanya jika file sumber benar-benar berubah.
+
+    Parameters
+    ----------
+    path : str
+        Lokasi workbook ``data_upi_final_publish.xlsx``.
+    cache_dir : str
+        Direktori snapshot Arrow.
+    kolom : list of str, optional
+        Kolom yang dibutuhkan pemanggil; ``None`` = semua kolom. Kolom
+        dibaca dari snapshot saat pertama kali diminta lalu dipakai
+        bersama oleh semua pemanggil.
+
+    Returns
+    -------
+    pandas.DataFrame
+        DataFrame bersama (read-only). Jangan diubah in-place;
+        gunakan ``.copy()`` jika perlu memodifikasi.
+    """
+    return versi_data(path, cache_dir).frame(kolom)
+
+
+def load_tabel(path, parser, cache_dir=CACHE_DIR, kolom=None):
+    """
+    Workbook lain (mis. sheet bedah UPI) dengan cache memori dan snapshot
+    Arrow yang sama seperti :func:`load_data_upi`.
+
+    Parameters
+    ----------
+    parser : callable
+        ``parser(path)`` -> DataFrame, dipanggil hanya saat snapshot
+        tidak ada atau file sumber berubah.
+    """
+    return _frame(_entry(path, cache_dir, bersama=False, parser=parser), kolom)
+
+
+def get_derived(nama, builder, path=DATA_PATH, cache_dir=CACHE_DIR, kolom=None):
+    """
+    Struktur turunan dataset (indeks filter, agregat, dsb.) yang dibangun
+    sekali per versi dataset dan dipakai bersama oleh semua sesi.
+
+    Cache turunan ikut dibuang otomatis saat file sumber berubah.
+    Untuk beberapa struktur yang harus dari versi yang sama, ambil
+    :func:`versi_data` sekali lalu pakai :meth:`VersiData.derived`.
+
+    Parameters
+    ----------
+    nama : str
+        Kunci struktur turunan, misal ``"filter_index"``.
+    builder : callable
+        Fungsi ``builder(df)`` yang membangun struktur dari DataFrame.
+    kolom : list of str, optional
+        Kolom yang dibaca ``builder``; ``None`` = semua kolom.
+
+    Returns
+    -------
+    object
+        Hasil ``builder(df)`` untuk versi dataset saat ini.
+    """
+    return versi_data(path, cache_dir).derived(nama, builder, kolom)
+
+
+def data_version(path=DATA_PATH):
+    """
+    Hash SHA-256 dari versi dataset yang sedang ada di cache memori
+    (``None`` jika belum dimuat). Berguna sebagai bagian kunci cache turunan.
+    """
+    entry = _CACHE.get(os.path.abspath(path))
+    return entry["sha256"] if entry is not None else None
+
+
+def clear_cache():
+    """Mengosongkan cache memori (snapshot di disk tidak dihapus)."""
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+# ============================================================
+# PEMBARUAN LATAR (dipakai LIB.refresh)
+# ============================================================
+def pantau_latar(path=DATA_PATH, aktif=True):
+    """
+    Menandai ``path`` sebagai dipantau refresher latar: rerun tidak lagi
+    memuat ulang sendiri saat file berubah, tetapi memakai versi aktif
+    sampai versi baru dipasang lewat :func:`pasang_versi`.
+    """
+    path = os.path.abspath(path)
+    if aktif:
+        _DIPANTAU.add(path)
+    else:
+        _DIPANTAU.discard(path)
+
+
+def versi_berubah(path=DATA_PATH, cache_dir=CACHE_DIR, bersama=None):
+    """
+    True jika ``path`` sudah punya versi aktif dan file sumbernya (atau
+    penunjuk versi bersama) berubah sejak versi itu dimuat. Hanya stat,
+    tanpa hash / parse.
+    """
+    path = os.path.abspath(path)
+    bersama = MODE_BERSAMA if bersama is None else bersama
+
+    aktif = _CACHE.get(path)
+    return aktif is not None and aktif["stat_key"] != _kunci_versi(path, cache_dir, bersama)[0]
+
+
+def bangun_versi(path=DATA_PATH, cache_dir=CACHE_DIR, parser=parse_excel, bersama=None):
+    """
+    Membangun versi baru ``path`` jika file sumber (atau penunjuk versi
+    bersama) berubah dari versi aktif. Versi aktif tidak disentuh.
+
+    Returns
+    -------
+    VersiData or None
+        Versi baru yang belum dipasang; ``None`` jika belum ada versi
+        aktif (muat awal adalah tugas warm-up / rerun pertama) atau versi
+        aktif masih terbaru.
+    """
+    path = os.path.abspath(path)
+    bersama = MODE_BERSAMA if bersama is None else bersama
+
+    aktif = _CACHE.get(path)
+    if aktif is None:
+        return None
+
+    stat_key, penunjuk_path = _kunci_versi(path, cache_dir, bersama)
+    if aktif["stat_key"] == stat_key:
+        return None
+
+    entry = _muat_entry(path, cache_dir, stat_key, penunjuk_path, parser)
+    if entry["sha256"] == aktif["sha256"]:
+        # isi sama (file hanya di-touch): struktur turunan versi aktif tetap berlaku
+        aktif["stat_key"] = stat_key
+        return None
+    return VersiData(entry, path)
+
+
+def pasang_versi(versi):
+    """Menukar versi aktif ``versi.path`` dengan ``versi`` (atomik)."""
+    with _CACHE_LOCK:
+        _CACHE[versi.path] = versi._entry
+
+
+# ============================================================
+# BUILD / VERIFIKASI SNAPSHOT
+# ============================================================
+def bangun_snapshot(path=DATA_PATH, parser=parse_excel, cache_dir=CACHE_DIR, paksa=False):
+    """
+    Memastikan snapshot Arrow ``path`` ada dan sesuai file sumber.
+
+    Parameters
+    ----------
+    paksa : bool
+        True: parse ulang workbook meski snapshot masih valid.
+
+    Returns
+    -------
+    dict or None
+        Metadata snapshot (lihat :func:`verifikasi_snapshot`); ``None``
+        jika snapshot untuk isi workbook saat ini tidak bisa ditulis
+        (metadata lama, jika ada, tidak dikembalikan).
+    """
+    _, meta_path = _snapshot_paths(path, cache_dir)
+    if paksa and os.path.exists(meta_path):
+        os.remove(meta_path)
+    _, snapshot, sha256 = _load_from_disk(path, cache_dir, parser)
+    if snapshot is None:
+        return None
+
+    meta = _read_meta(meta_path)
+    if meta is None or meta.get("sha256") != sha256:
+        return None
+    return meta
+
+
+def _bangun_snapshot_worker(path, parser, cache_dir, paksa):
+    # dijalankan di proses worker: kegagalan satu file tidak membatalkan file lain
+    try:
+        return bangun_snapshot(path, parser, cache_dir, paksa=paksa)
+    except Exception:
+        logger.exception("Gagal membangun snapshot %s", os.path.basename(path))
+        return None
+
+
+def bangun_snapshot_paralel(daftar, cache_dir=CACHE_DIR, paksa=False, workers=None, mp_context=None):
+    """
+    :func:`bangun_snapshot` untuk beberapa workbook sekaligus, satu
+    proses per file (process pool :mod:`LIB.etl`). Workbook saling
+    independen, jadi waktu build mengikuti file terlama, bukan jumlahnya;
+    jalan serial jika hanya satu file / ``workers=1`` / platform tidak
+    bisa membuat proses.
+
+    Parameters
+    ----------
+    daftar : list of (str, callable)
+        ``(path, parser)``; parser harus fungsi level modul (di-pickle ke worker).
+    workers : int, optional
+        Lihat :func:`LIB.etl.jumlah_worker`.
+    mp_context : multiprocessing context, optional
+        Lihat :func:`LIB.etl.buat_pool`.
+
+    Returns
+    -------
+    list of (dict or None)
+        Metadata snapshot per file (urutan ``daftar``); ``None`` jika gagal.
+    """
+    # impor di sini: LIB.etl sendiri mengimpor modul ini
+    from LIB.etl import jumlah_worker, buat_pool, peta_berurutan
+
+    argumen = [(path, parser, cache_dir, paksa) for path, parser in daftar]
+    workers = min(jumlah_worker(workers), len(argumen))
+    pool = buat_pool(workers, mp_context=mp_context)
+    try:
+        return list(peta_berurutan(_bangun_snapshot_worker, argumen, pool, workers))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
+def verifikasi_snapshot(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """
+    Memeriksa snapshot Arrow ``path``:
+
+    - metadata ada dan versi schema sama,
+    - SHA-256 workbook sumber sama dengan yang tercatat (snapshot
+      memang hasil parse workbook ini),
+    - SHA-256 file snapshot sama dengan saat ditulis (tidak rusak),
+    - file bisa dibuka dan jumlah barisnya sesuai.
+
+    Returns
+    -------
+    list of str
+        Daftar masalah; kosong berarti snapshot valid.
+    """
+    arrow_path, meta_path = _snapshot_paths(path, cache_dir)
+    meta = _read_meta(meta_path)
+    if meta is None:
+        return [f"metadata tidak ada: {meta_path}"]
+    if meta.get("schema_version") != SCHEMA_VERSION:
+        return [f"schema_version {meta.get('schema_version')} != {SCHEMA_VERSION}"]
+    if not os.path.exists(arrow_path):
+        return [f"snapshot tidak ada: {arrow_path}"]
+
+    masalah = []
+    if hash_file(path) != meta.get("sha256"):
+        masalah.append("workbook sumber berubah sejak snapshot dibuat")
+    if hash_file(arrow_path) != meta.get("snapshot_sha256"):
+        masalah.append("checksum file snapshot tidak cocok")
+    else:
+        try:
+            n_rows = _buka_snapshot(arrow_path).num_rows
+        except Exception as err:
+            masalah.append(f"snapshot tidak bisa dibuka: {err!r}")
+        else:
+            if n_rows != meta.get("n_rows"):
+                masalah.append(f"jumlah baris {n_rows} != {meta.get('n_rows')}")
+    return masalah
+
+
+def main(argv=None):
+    from LIB.bedah_upi import BEDAH_PATH, parse_bedah
+
+    parser = argparse.ArgumentParser(description="Build / verifikasi snapshot Arrow workbook dashboard")
+    parser.add_argument("aksi", choices=["build", "verify"])
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--bedah", default=BEDAH_PATH, help="kosongkan ('') untuk melewati sheet bedah")
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--paksa", action="store_true", help="build: parse ulang meski snapshot valid")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="build: jumlah proses (default DASHBOARD_ETL_WORKERS / semua core; 1 = serial)")
+    args = parser.parse_args(argv)
+
+    daftar = [(args.data, parse_excel)]
+    if args.bedah:
+        daftar.append((args.bedah, parse_bedah))
+
+    gagal = False
+    if args.aksi == "build":
+        mulai = time.perf_counter()
+        semua_meta = bangun_snapshot_paralel(daftar, args.cache_dir, paksa=args.paksa, workers=args.workers)
+        for (path, _), meta in zip(daftar, semua_meta):
+            nama = os.path.basename(path)
+            if meta is None:
+                gagal = True
+                print(f"{nama}: snapshot gagal dibangun di {args.cache_dir}")
+                continue
+            print(f"{nama}: {meta['n_rows']} baris, sumber {meta['sha256'][:16]}, "
+                  f"snapshot {meta['snapshot_sha256'][:16]}")
+        print(f"selesai dalam {time.perf_counter() - mulai:.2f} detik")
+    else:
+        for path, _ in daftar:
+            masalah = verifikasi_snapshot(path, args.cache_dir)
+            gagal = gagal or bool(masalah)
+            print(f"{os.path.basename(path)}: " + ("OK" if not masalah else "; ".join(masalah)))
+
+    return 1 if gagal else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
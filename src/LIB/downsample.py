@@ -0,0 +1,184 @@
+# downsample.py
+#
+# Pengurangan titik deret waktu di sisi server sebelum dikirim ke browser
+# (chart tren di LIB.charts). Deret yang lebih pendek dari anggaran titik
+# tidak diubah.
+
+import numpy as np
+
+
+# ============================================================
+# KONFIGURASI DEFAULT
+# ============================================================
+MAX_TITIK_TREN = 2000          # anggaran titik per trace (garis / polygon area)
+METODE_DOWNSAMPLE = ("lttb", "minmax")
+
+
+def _x_numerik(x):
+    """Sumbu x sebagai float untuk menghitung luas segitiga LTTB."""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64) or np.issubdtype(x.dtype, np.timedelta64):
+        v = x.astype("int64").astype("float64")
+        return v - v[0] if len(v) else v
+    if np.issubdtype(x.dtype, np.number):
+        return x.astype("float64")
+    # kategori / teks: cukup posisi
+    return np.arange(len(x), dtype="float64")
+
+
+def _batas_bucket(n, n_bucket):
+    """Awal tiap bucket (n_bucket bucket bersebelahan menutupi 0..n-1)."""
+    return np.linspace(0, n, n_bucket + 1).astype(np.int64)[:-1]
+
+
+def _arg_bucket(v, awal, terbesar=True):
+    """Posisi nilai terbesar (atau terkecil) pertama di tiap bucket; NaN diabaikan."""
+    n = len(v)
+    isi = np.where(np.isnan(v), -np.inf if terbesar else np.inf, v)
+    ekstrem = (np.maximum if terbesar else np.minimum).reduceat(isi, awal)
+    bucket = np.repeat(np.arange(len(awal)), np.diff(np.append(awal, n)))
+    cocok = np.flatnonzero(isi == ekstrem[bucket])
+    _, pertama = np.unique(bucket[cocok], return_index=True)
+    return cocok[pertama]
+
+
+# ============================================================
+# SELEKSI TITIK
+# ============================================================
+def lttb_indeks(x, y, n_titik):
+    """
+    Largest-Triangle-Three-Buckets: indeks ``n_titik`` titik yang paling
+    mempertahankan bentuk garis (titik pertama & terakhir selalu ikut).
+
+    Parameters
+    ----------
+    x, y : array-like
+        Terurut menurut x.
+    n_titik : int
+
+    Returns
+    -------
+    numpy.ndarray
+        Indeks terurut.
+    """
+    n = len(y)
+    if n <= n_titik or n <= 2:
+        return np.arange(n)
+    if n_titik < 3:
+        return np.array([0, n - 1])
+
+    x = _x_numerik(x)
+    y = np.asarray(y, dtype="float64")
+
+    # titik tengah 1..n-2 dibagi ke n_titik - 2 bucket
+    tepi = 1 + np.linspace(0, n - 2, n_titik - 1).astype(np.int64)
+    awal, akhir = tepi[:-1], tepi[1:]
+    rata_x = np.add.reduceat(x[1:n - 1], awal - 1) / (akhir - awal)
+    rata_y = np.add.reduceat(np.nan_to_num(y[1:n - 1]), awal - 1) / (akhir - awal)
+    # titik acuan tiap bucket = rata-rata bucket berikutnya (terakhir: titik akhir)
+    acuan_x = np.append(rata_x[1:], x[n - 1])
+    acuan_y = np.append(rata_y[1:], y[n - 1])
+
+    # luas segitiga (a, titik bucket, acuan) = |A*y + B*x + C| dengan A, B, C
+    # skalar per bucket; NaN dianggap luas nol
+    y_isi = np.nan_to_num(y)
+    x_l, y_l = x.tolist(), y_isi.tolist()
+    awal_l, akhir_l = awal.tolist(), akhir.tolist()
+    acuan_x, acuan_y = acuan_x.tolist(), np.nan_to_num(acuan_y).tolist()
+
+    terpilih = [0]
+    a = 0
+    for b in range(len(awal_l)):
+        s, t = awal_l[b], akhir_l[b]
+        xa, ya = x_l[a], y_l[a]
+        koef_y = xa - acuan_x[b]
+        koef_x = acuan_y[b] - ya
+        c = -koef_y * ya - koef_x * xa
+        luas = np.abs(koef_y * y_isi[s:t] + koef_x * x[s:t] + c)
+        a = s + int(luas.argmax())
+        terpilih.append(a)
+    terpilih.append(n - 1)
+    return np.asarray(terpilih, dtype=np.int64)
+
+
+def minmax_indeks(y, n_titik):
+    """
+    Indeks minimum dan maksimum ``y`` per bucket (+ titik pertama &
+    terakhir), maksimal ``n_titik`` titik. Puncak dan lembah selalu ikut.
+    """
+    n = len(y)
+    if n <= n_titik or n <= 2:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype="float64")
+    awal = _batas_bucket(n, max((n_titik - 2) // 2, 1))
+    return np.unique(np.concatenate((
+        [0, n - 1], _arg_bucket(y, awal, True), _arg_bucket(y, awal, False)
+    )))
+
+
+def amplop_indeks(y_min, y_max, n_bucket):
+    """
+    Indeks batas atas (``y_max`` terbesar) dan batas bawah (``y_min``
+    terkecil) per bucket, plus kedua ujung, untuk polygon area min-max.
+    """
+    n = len(y_max)
+    ujung = [0, n - 1]
+    awal = _batas_bucket(n, n_bucket)
+    atas = np.unique(np.concatenate((ujung, _arg_bucket(np.asarray(y_max, "float64"), awal, True))))
+    bawah = np.unique(np.concatenate((ujung, _arg_bucket(np.asarray(y_min, "float64"), awal, False))))
+    return atas, bawah
+
+
+# ============================================================
+# DERET TREN (GARIS + AREA)
+# ============================================================
+def kurangi_tren(x_vals, y_mean, y_min, y_max, max_points=MAX_TITIK_TREN, metode="lttb"):
+    """
+    Garis mean dan polygon area min-max dengan paling banyak
+    ``max_points`` titik per trace.
+
+    Parameters
+    ----------
+    x_vals, y_mean, y_min, y_max : numpy.ndarray
+        Hasil agregasi satu grup, terurut menurut x.
+    max_points : int or None
+        ``None`` = tanpa pengurangan.
+    metode : {"lttb", "minmax"}
+        Seleksi titik garis mean. Area selalu mempertahankan ekstrem
+        ``y_max`` / ``y_min`` per bucket.
+
+    Returns
+    -------
+    garis : tuple
+        ``(x, y_mean, y_min, y_max)`` pada titik terpilih.
+    area : tuple
+        ``(x_area, y_area)``: batas atas maju lalu batas bawah mundur.
+    """
+    if metode not in METODE_DOWNSAMPLE:
+        raise ValueError(f"metode harus salah satu dari {METODE_DOWNSAMPLE}, bukan {metode!r}")
+
+    n = len(x_vals)
+    if max_points is None:
+        max_points = 2 * n
+
+    if n <= max_points:
+        garis = (x_vals, y_mean, y_min, y_max)
+    else:
+        if metode == "lttb":
+            pilih = lttb_indeks(x_vals, y_mean, max_points)
+        else:
+            pilih = minmax_indeks(y_mean, max_points)
+        garis = (x_vals[pilih], y_mean[pilih], y_min[pilih], y_max[pilih])
+
+    # polygon berisi dua sisi -> dikurangi jika 2n melebihi anggaran;
+    # tiap sisi 1 titik per bucket + 2 ujung
+    if 2 * n <= max_points:
+        atas = bawah = np.arange(n)
+    else:
+        atas, bawah = amplop_indeks(y_min, y_max, max((max_points - 4) // 2, 1))
+    area = (
+        np.concatenate((x_vals[atas], x_vals[bawah][::-1])),
+        np.concatenate((y_max[atas], y_min[bawah][::-1])),
+    )
+    return garis, area
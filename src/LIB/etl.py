@@ -0,0 +1,911 @@
+# etl.py
+#
+# ETL sumber produksi bentuk lebar (satu kolom per bulan, mis. output.csv)
+# menjadi tabel panjang per bulan seperti data publish.
+#
+#     cd src && python -m LIB.etl                       # output.csv -> etl_output/
+#     cd src && python -m LIB.etl --sumber "../DATA PRODUKSI UPI.xlsx" --header-row 2
+#     cd src && python -m LIB.etl --penuh               # bangun ulang semua bulan
+#
+# Sumber dibaca per potongan baris (generator), jadi ukuran sumber tidak
+# dibatasi memori. Satu baris sumber = satu deret bulanan lengkap, sehingga
+# potongan baris tidak pernah memotong deret. Output berupa Parquet
+# terpartisi per bulan (bulan=YYYY-MM/part-*.parquet) plus _manifest.json;
+# rerun hanya menulis bulan yang belum ada di manifest.
+
+import io
+import os
+import csv
+import json
+import time
+import shutil
+import logging
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from LIB.charts import parse_produksi_kolom, add_entity_noise
+from LIB.data_loader import ROOT_DIR, apply_schema, hash_file
+from LIB.bedah_upi import baca_bedah, perkaya_bedah
+
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# KONFIGURASI
+# ============================================================
+SUMBER_PATH = os.path.join(ROOT_DIR, "output.csv")
+ETL_DIR = os.path.join(ROOT_DIR, "etl_output")
+
+CHUNK_ROWS = 50_000
+MANIFEST = "_manifest.json"
+GAGAL_PARSE = "_gagal_parse.csv"
+KOLOM_GAGAL = ["BARIS_SUMBER", "TANGGAL", "nilai", "alasan"]
+
+# naikkan jika logika transformasi berubah: partisi lama tidak dipakai lagi
+ETL_VERSION = 3
+
+# kolom sumber -> nama kolom di data publish
+RENAME_PUBLISH = {
+    "jenis_proses": "JENIS KEGIATAN",
+    "jenis_ikan": "JENIS IKAN",
+    "NO TELP ENKRIP": "NO TELP HASH",
+}
+KOLOM_DIBUANG = ["NO"]
+# kolom teks yang dinormalisasi (strip + lower) seperti notebook lama
+KOLOM_NORMALISASI = ["NAMA UPI", "DESA", "KECAMATAN", "PENERIMAAN BANTUAN",
+                     "JENIS KEGIATAN PENGOLAHAN", "JENIS KEGIATAN", "JENIS IKAN"]
+
+# pengisian sel kosong: per entitas (lihat isi_matriks) atau "global"
+# (cara notebook lama, nilai antar UPI tercampur)
+KOLOM_ENTITAS = ["NAMA UPI"]
+STRATEGI_ISI = ("time", "linear", "ffill", "none", "global")
+
+NOISE_LEVEL = 0.18
+WAVE_STRENGTH = 0.07
+
+# jumlah proses worker: 0 = semua core, 1 = serial (tanpa process pool);
+# bisa diganti lewat env DASHBOARD_ETL_WORKERS (dibaca saat dipakai)
+ETL_WORKERS = 0
+# potongan yang boleh menunggu per worker (membatasi memori antrean)
+ANTREAN_PER_WORKER = 2
+
+
+# ============================================================
+# BACA SUMBER (GENERATOR)
+# ============================================================
+def _tanggal_kolom(nama):
+    """Tanggal dari nama kolom bulanan, atau None jika bukan kolom bulan."""
+    if isinstance(nama, (pd.Timestamp, np.datetime64)) or hasattr(nama, "year"):
+        return pd.Timestamp(nama)
+    try:
+        return pd.Timestamp(str(nama).strip())
+    except ValueError:
+        return None
+
+
+def _pulihkan_baris_terkutip(chunk):
+    """
+    Baris CSV yang seluruh isinya terbungkus kutip terbaca sebagai satu
+    sel di kolom pertama (kolom lain kosong); pecah ulang sel itu.
+    """
+    pertama = chunk.columns[0]
+    rusak = chunk[pertama].str.contains(",", na=False) & chunk.iloc[:, 1:].isna().all(axis=1)
+    for label in chunk.index[rusak]:
+        sel = next(csv.reader(io.StringIO(chunk.at[label, pertama])))
+        if len(sel) == len(chunk.columns):
+            chunk.loc[label] = [v if v != "" else None for v in sel]
+    return chunk
+
+
+def _baca_csv(path, chunk_rows):
+    # semua sel dibaca sebagai teks: hasil parse tidak bergantung pada
+    # dtype yang ditebak pandas per potongan
+    for chunk in pd.read_csv(path, dtype=str, chunksize=chunk_rows):
+        yield _pulihkan_baris_terkutip(chunk)
+
+
+def _baca_xlsx(path, chunk_rows, header_row=0, sheet_name=None):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet_name] if sheet_name else wb.worksheets[0]
+        baris = ws.iter_rows(values_only=True)
+
+        for _ in range(header_row):
+            next(baris, None)
+        header = [
+            h if isinstance(h, (pd.Timestamp, np.datetime64)) or hasattr(h, "year") else str(h)
+            for h in next(baris)
+        ]
+
+        potongan = []
+        for nilai in baris:
+            if all(v is None for v in nilai):
+                continue
+            potongan.append([None if v is None else str(v) for v in nilai])
+            if len(potongan) == chunk_rows:
+                yield pd.DataFrame(potongan, columns=header, dtype=object)
+                potongan = []
+        if potongan:
+            yield pd.DataFrame(potongan, columns=header, dtype=object)
+    finally:
+        wb.close()
+
+
+def baca_sumber(path=SUMBER_PATH, chunk_rows=CHUNK_ROWS, header_row=0, sheet_name=None):
+    """
+    Membaca sumber lebar per potongan baris.
+
+    Parameters
+    ----------
+    path : str
+        ``.csv`` atau ``.xlsx``.
+    chunk_rows : int
+        Jumlah baris per potongan.
+    header_row : int
+        (xlsx) Nomor baris header, 0 = baris pertama.
+    sheet_name : str, optional
+        (xlsx) Nama sheet; default sheet pertama.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Potongan sumber, semua sel berupa teks / None.
+    """
+    if path.lower().endswith((".xlsx", ".xlsm")):
+        yield from _baca_xlsx(path, chunk_rows, header_row=header_row, sheet_name=sheet_name)
+    else:
+        yield from _baca_csv(path, chunk_rows)
+
+
+# ============================================================
+# PARALEL (PROCESS POOL)
+# ============================================================
+def _workers_env():
+    """Nilai env DASHBOARD_ETL_WORKERS, atau :data:`ETL_WORKERS` jika kosong / tidak valid."""
+    nilai = os.environ.get("DASHBOARD_ETL_WORKERS", "").strip()
+    if not nilai:
+        return ETL_WORKERS
+    try:
+        return int(nilai)
+    except ValueError:
+        logger.warning("DASHBOARD_ETL_WORKERS=%r bukan bilangan bulat, pakai default %d",
+                       nilai, ETL_WORKERS)
+        return ETL_WORKERS
+
+
+def jumlah_worker(workers=None):
+    """
+    ``workers`` (default env DASHBOARD_ETL_WORKERS / :data:`ETL_WORKERS`);
+    0 atau negatif = semua core.
+    """
+    workers = _workers_env() if workers is None else int(workers)
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def buat_pool(workers, initializer=None, initargs=(), mp_context=None):
+    """
+    ``ProcessPoolExecutor`` dengan ``workers`` proses, atau None (jalan
+    serial) jika ``workers <= 1`` atau platform tidak bisa membuat proses
+    (mis. tanpa ``/dev/shm`` / semaphore).
+
+    ``mp_context`` diteruskan ke pool, mis. ``multiprocessing.get_context("spawn")``
+    jika dipanggil dari proses yang menjalankan banyak thread (server).
+    """
+    if workers <= 1:
+        return None
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context,
+                               initializer=initializer, initargs=initargs)
+    try:
+        # proses worker baru dibuat saat tugas pertama: uji di sini supaya
+        # kegagalan platform jatuh ke jalur serial, bukan di tengah ETL
+        pool.submit(os.getpid).result()
+    except (OSError, NotImplementedError, RuntimeError) as err:
+        pool.shutdown(wait=False, cancel_futures=True)
+        logger.warning("Process pool tidak tersedia (%s), jalan serial", err)
+        return None
+    return pool
+
+
+def peta_berurutan(fungsi, daftar_argumen, pool=None, workers=1):
+    """
+    ``map`` streaming di atas ``pool``: hasil keluar berurutan sesuai
+    masukan, dan paling banyak ``workers * ANTREAN_PER_WORKER`` tugas
+    menunggu sekaligus, sehingga generator sumber tidak dibaca habis ke
+    memori. ``pool=None`` = serial di proses ini.
+    """
+    if pool is None:
+        for argumen in daftar_argumen:
+            yield fungsi(*argumen)
+        return
+
+    antrean = deque()
+    for argumen in daftar_argumen:
+        antrean.append(pool.submit(fungsi, *argumen))
+        if len(antrean) >= workers * ANTREAN_PER_WORKER:
+            yield antrean.popleft().result()
+    while antrean:
+        yield antrean.popleft().result()
+
+
+# ============================================================
+# TRANSFORMASI PER POTONGAN
+# ============================================================
+def pisah_kolom(columns):
+    """
+    Memisahkan kolom identitas dan kolom bulan.
+
+    Returns
+    -------
+    identitas : list of str
+    bulan : dict
+        ``{nama kolom sumber: pandas.Timestamp}``, terurut tanggal.
+    """
+    bulan = {}
+    identitas = []
+    for kolom in columns:
+        tanggal = _tanggal_kolom(kolom)
+        if tanggal is None:
+            if kolom not in KOLOM_DIBUANG:
+                identitas.append(kolom)
+        else:
+            bulan[kolom] = tanggal
+    bulan = dict(sorted(bulan.items(), key=lambda kv: kv[1]))
+    return identitas, bulan
+
+
+def normalisasi_identitas(chunk):
+    """Rename ke nama kolom publish lalu strip + lower kolom teks (in-place)."""
+    chunk.rename(columns=RENAME_PUBLISH, inplace=True)
+    for kolom in KOLOM_NORMALISASI:
+        if kolom in chunk.columns:
+            chunk[kolom] = chunk[kolom].str.strip().str.lower()
+    if "PENERIMAAN BANTUAN" in chunk.columns:
+        chunk["PENERIMAAN BANTUAN"] = chunk["PENERIMAAN BANTUAN"].replace("", np.nan).fillna("belum")
+    return chunk
+
+
+def isi_produksi(produksi, tanggal):
+    """
+    Mengisi produksi kosong seperti notebook lama: interpolasi waktu,
+    interpolasi linear, lalu ffill/bfill, dalam urutan tabel panjang
+    (strategi ``"global"``; nilai antar UPI ikut tercampur).
+
+    Parameters
+    ----------
+    produksi : numpy.ndarray
+        float64, urutan hasil melt (per bulan, lalu per baris sumber).
+    tanggal : numpy.ndarray
+        datetime64 tiap nilai.
+    """
+    seri = pd.Series(produksi, index=pd.DatetimeIndex(tanggal))
+    return (
+        seri
+        .interpolate(method="time")
+        .interpolate(method="linear")
+        .ffill()
+        .bfill()
+        .to_numpy()
+    )
+
+
+def isi_matriks(nilai, x=None, strategi="time", isi_tepi=True):
+    """
+    Mengisi sel kosong per baris matriks entitas x bulan, sekaligus
+    untuk semua baris (tanpa loop per entitas).
+
+    Parameters
+    ----------
+    nilai : numpy.ndarray
+        2D float64, NaN = kosong. Satu baris = deret satu entitas,
+        kolom terurut waktu.
+    x : numpy.ndarray, optional
+        Posisi waktu tiap kolom (mis. nanodetik epoch), dipakai
+        strategi ``"time"``; default jarak kolom seragam.
+    strategi : {"time", "linear", "ffill", "none"}
+        - ``"time"``   : interpolasi linear terhadap tanggal
+        - ``"linear"`` : interpolasi linear terhadap urutan kolom
+        - ``"ffill"``  : bawa nilai terakhir ke depan
+        - ``"none"``   : tidak diisi
+    isi_tepi : bool
+        Isi sel sebelum observasi pertama / sesudah observasi terakhir
+        dengan nilai observasi terdekat (setara ``.ffill().bfill()``).
+
+    Returns
+    -------
+    numpy.ndarray
+        Matriks terisi; baris tanpa observasi sama sekali tetap NaN.
+    """
+    nilai = np.asarray(nilai, dtype="float64")
+    if strategi == "none":
+        return nilai.copy()
+    if strategi not in ("time", "linear", "ffill"):
+        raise ValueError(f"Strategi isi tidak dikenal: {strategi!r}")
+
+    n_baris, n_kolom = nilai.shape
+    ada = ~np.isnan(nilai)
+    kolom = np.arange(n_kolom)
+    baris = np.arange(n_baris)[:, None]
+
+    # posisi observasi terakhir <= j dan observasi pertama >= j
+    kiri = np.maximum.accumulate(np.where(ada, kolom, -1), axis=1)
+    kanan = np.minimum.accumulate(np.where(ada, kolom, n_kolom)[:, ::-1], axis=1)[:, ::-1]
+    ada_kiri = kiri >= 0
+    ada_kanan = kanan < n_kolom
+    kiri = np.where(ada_kiri, kiri, 0)
+    kanan = np.where(ada_kanan, kanan, 0)
+    y_kiri = nilai[baris, kiri]
+    y_kanan = nilai[baris, kanan]
+
+    if strategi == "ffill":
+        hasil = np.where(ada_kiri, y_kiri, np.nan)
+    else:
+        pos = kolom.astype("float64") if (strategi == "linear" or x is None) else np.asarray(x, dtype="float64")
+        x_kiri = pos[kiri]
+        x_kanan = pos[kanan]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            # rumus np.interp (dipakai pandas.interpolate): slope * (x - x0) + y0
+            slope = (y_kanan - y_kiri) / (x_kanan - x_kiri)
+            tengah = slope * (pos - x_kiri) + y_kiri
+        hasil = np.where(ada_kiri & ada_kanan, tengah, np.nan)
+
+    if isi_tepi:
+        hasil = np.where(~ada_kiri, y_kanan, hasil)
+        hasil = np.where(~ada_kanan & ada_kiri, y_kiri, hasil)
+        hasil[~ada.any(axis=1)] = np.nan
+
+    # sel yang diamati selalu nilai aslinya
+    return np.where(ada, nilai, hasil)
+
+
+def _lebar_ke_panjang(chunk):
+    """
+    Langkah bersama: lewati baris tanpa NAMA UPI, normalisasi identitas,
+    melt kolom bulan, parse produksi (0 -> NaN).
+
+    Returns
+    -------
+    long : pandas.DataFrame
+        Index = label baris sumber.
+    gagal : pandas.DataFrame
+    dilewati : int
+    """
+    identitas, bulan = pisah_kolom(chunk.columns)
+
+    # baris tanpa NAMA UPI (mis. baris CSV yang kutipnya rusak) dilewati
+    dilewati = 0
+    if "NAMA UPI" in chunk.columns:
+        ada_nama = chunk["NAMA UPI"].notna()
+        dilewati = int((~ada_nama).sum())
+        chunk = chunk[ada_nama]
+
+    lebar = normalisasi_identitas(chunk[identitas + list(bulan)].copy())
+    identitas = [RENAME_PUBLISH.get(k, k) for k in identitas]
+    # identitas berulang sekali per bulan setelah melt: simpan sebagai kode
+    lebar[identitas] = lebar[identitas].astype("category")
+
+    long = lebar.melt(
+        id_vars=identitas,
+        value_vars=list(bulan),
+        var_name="TANGGAL",
+        value_name="PRODUKSI",
+        ignore_index=False,
+    )
+    long["TANGGAL"] = long["TANGGAL"].map(bulan).astype("datetime64[ns]")
+
+    produksi, gagal = parse_produksi_kolom(long["PRODUKSI"].reset_index(drop=True))
+    if len(gagal):
+        gagal.insert(0, "BARIS_SUMBER", long.index[gagal.index])
+        gagal.insert(1, "TANGGAL", long["TANGGAL"].to_numpy()[gagal.index])
+    else:
+        gagal = gagal.assign(BARIS_SUMBER=pd.Series(dtype="int64"), TANGGAL=pd.Series(dtype="datetime64[ns]"))
+
+    # teks '0' diperlakukan sama dengan sel angka 0 (tidak ada data)
+    nilai = produksi.to_numpy()
+    nilai[nilai == 0] = np.nan
+    long["PRODUKSI"] = nilai
+
+    return long, gagal.reset_index(drop=True), dilewati
+
+
+def _kunci_entitas(long, kolom_entitas):
+    """
+    Kunci entitas tabel panjang tanpa membuat string per baris.
+
+    Returns
+    -------
+    kunci : numpy.ndarray
+        String kunci unik (kolom digabung dengan pemisah ``\\x1f``).
+    kode : numpy.ndarray
+        Posisi kunci tiap baris di ``kunci``.
+    """
+    # kode kategori tiap kolom digabung jadi satu int64 (radix campuran)
+    gabung = np.zeros(len(long), dtype=np.int64)
+    for kolom in kolom_entitas:
+        kat = long[kolom].astype("category").cat
+        gabung = gabung * (len(kat.categories) + 1) + (kat.codes.to_numpy().astype(np.int64) + 1)
+    kode, unik = pd.factorize(gabung)
+
+    # baris pertama tiap kunci unik -> string kunci
+    pertama = np.empty(len(unik), dtype=np.int64)
+    pertama[kode[::-1]] = np.arange(len(kode))[::-1]
+    contoh = long.iloc[pertama]
+    kunci = contoh[kolom_entitas[0]].astype(str)
+    for kolom in kolom_entitas[1:]:
+        kunci = kunci + "\x1f" + contoh[kolom].astype(str)
+    return kunci.to_numpy(), kode
+
+
+def _akumulasi_potongan(chunk, kolom_entitas):
+    """
+    Jumlah dan banyak observasi per (entitas, bulan) satu potongan
+    (dijalankan di worker; hasilnya kecil dibanding potongan).
+    """
+    tanggal = pd.DatetimeIndex(list(pisah_kolom(chunk.columns)[1].values()))
+    long, _, _ = _lebar_ke_panjang(chunk)
+    kunci_unik, kode = _kunci_entitas(long, kolom_entitas)
+
+    nilai = long["PRODUKSI"].to_numpy()
+    ada = ~np.isnan(nilai)
+    j = tanggal.get_indexer(long["TANGGAL"].to_numpy()[ada])
+    sel = kode[ada] * len(tanggal) + j
+    ukuran = (len(kunci_unik), len(tanggal))
+    jumlah = np.bincount(sel, weights=nilai[ada], minlength=ukuran[0] * ukuran[1]).reshape(ukuran)
+    cacah = np.bincount(sel, minlength=ukuran[0] * ukuran[1]).reshape(ukuran)
+    return kunci_unik, tanggal, jumlah, cacah
+
+
+class SeriEntitas:
+    """
+    Deret produksi bulanan per entitas (default ``NAMA UPI``) dari seluruh
+    sumber, dikumpulkan dalam satu lintasan streaming.
+
+    Beberapa baris sumber dengan entitas sama digabung (rata-rata
+    observasi per bulan), sehingga entitas yang barisnya tersebar di
+    beberapa potongan tetap punya satu deret. Ukuran matriks hanya
+    entitas x bulan, kecil dibanding tabel panjang.
+
+    Parameters
+    ----------
+    kunci : pandas.Index
+        Kunci entitas (baris matriks).
+    tanggal : pandas.DatetimeIndex
+        Bulan (kolom matriks), terurut.
+    jumlah, cacah : numpy.ndarray
+        Jumlah dan banyak observasi per (entitas, bulan).
+    kolom_entitas : list of str
+    """
+
+    def __init__(self, kunci, tanggal, jumlah, cacah, kolom_entitas=KOLOM_ENTITAS):
+        self.kunci = kunci
+        self.tanggal = tanggal
+        self.kolom_entitas = list(kolom_entitas)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.observasi = np.where(cacah > 0, jumlah / cacah, np.nan)
+        self.terisi = None
+
+    @classmethod
+    def dari_sumber(cls, sumber=SUMBER_PATH, kolom_entitas=KOLOM_ENTITAS,
+                    chunk_rows=CHUNK_ROWS, header_row=0, sheet_name=None,
+                    workers=1, pool=None):
+        """
+        Lintasan pertama ETL: potongan diringkas per entitas (paralel bila
+        ``pool`` diberikan), lalu digabung di proses ini.
+        """
+        def daftar_argumen():
+            for chunk in baca_sumber(sumber, chunk_rows, header_row, sheet_name):
+                # cukup kolom entitas + bulan (+ NAMA UPI untuk aturan lewati baris)
+                perlu = [
+                    k for k in chunk.columns
+                    if k == "NAMA UPI" or RENAME_PUBLISH.get(k, k) in kolom_entitas
+                    or _tanggal_kolom(k) is not None
+                ]
+                yield chunk[perlu], kolom_entitas
+
+        kunci = pd.Index([], dtype=object)
+        tanggal = None
+        jumlah = cacah = None
+
+        for kunci_unik, tanggal_potongan, jumlah_potongan, cacah_potongan in peta_berurutan(
+            _akumulasi_potongan, daftar_argumen(), pool, workers
+        ):
+            if tanggal is None:
+                tanggal = tanggal_potongan
+                jumlah = np.zeros((0, len(tanggal)))
+                cacah = np.zeros((0, len(tanggal)))
+
+            baru = pd.Index(kunci_unik).difference(kunci, sort=False)
+            if len(baru):
+                kunci = kunci.append(baru)
+                if len(kunci) > len(jumlah):
+                    # kapasitas dilipatgandakan: salin ulang O(log n) kali saja
+                    kapasitas = max(len(kunci), 2 * len(jumlah))
+                    tambah = np.zeros((kapasitas - len(jumlah), len(tanggal)))
+                    jumlah = np.vstack([jumlah, tambah])
+                    cacah = np.vstack([cacah, tambah])
+
+            # kunci_unik unik per potongan -> indeks baris tidak berulang
+            sel = np.ix_(kunci.get_indexer(kunci_unik), tanggal.get_indexer(tanggal_potongan))
+            jumlah[sel] += jumlah_potongan
+            cacah[sel] += cacah_potongan
+
+        if tanggal is None:
+            tanggal = pd.DatetimeIndex([])
+            jumlah = cacah = np.zeros((0, 0))
+        n = len(kunci)
+        return cls(kunci, tanggal, jumlah[:n], cacah[:n], kolom_entitas=kolom_entitas)
+
+    @property
+    def entitas_kosong(self):
+        """Jumlah entitas tanpa satu pun observasi."""
+        return int((~(~np.isnan(self.observasi)).any(axis=1)).sum())
+
+    def isi(self, strategi="time", isi_tepi=True):
+        """Mengisi matriks observasi (lihat :func:`isi_matriks`)."""
+        # posisi waktu dalam nanodetik, sama dengan pandas interpolate(method="time")
+        x = self.tanggal.asi8.astype("float64")
+        self.terisi = isi_matriks(self.observasi, x, strategi=strategi, isi_tepi=isi_tepi)
+        return self.terisi
+
+    def nilai(self, long):
+        """Nilai terisi untuk tiap baris tabel panjang ``long``."""
+        kunci_unik, kode = _kunci_entitas(long, self.kolom_entitas)
+        i = self.kunci.get_indexer(kunci_unik)[kode]
+        j = self.tanggal.get_indexer(long["TANGGAL"].to_numpy())
+        return self.terisi[i, j]
+
+
+def transform_chunk(chunk, seed=None, seri=None, strategi="time",
+                    kolom_entitas=KOLOM_ENTITAS,
+                    noise_level=NOISE_LEVEL, wave_strength=WAVE_STRENGTH):
+    """
+    Satu potongan lebar -> tabel panjang siap tulis.
+
+    Langkah: buang ``NO``, normalisasi identitas, melt kolom bulan,
+    :func:`LIB.charts.parse_produksi_kolom`, isi sel kosong, lalu
+    :func:`LIB.charts.add_entity_noise` dan pembulatan 1 desimal.
+
+    Noise ditentukan oleh (seed, entitas, bulan), jadi hasil satu potongan
+    tidak bergantung pada potongan lain: run penuh, inkremental, maupun
+    paralel menghasilkan nilai yang sama.
+
+    Parameters
+    ----------
+    seed : int, optional
+        None = noise acak tiap run.
+    seri : SeriEntitas, optional
+        Deret per entitas yang sudah diisi (:meth:`SeriEntitas.isi`);
+        wajib kecuali ``strategi="global"``.
+    strategi : str
+        ``"global"`` = cara notebook lama (:func:`isi_produksi`) di dalam
+        potongan; selain itu nilai diambil dari ``seri``.
+    kolom_entitas : list of str
+        Kunci entitas untuk noise (``seri.kolom_entitas`` bila ada).
+
+    Returns
+    -------
+    long : pandas.DataFrame
+        Kolom identitas + ``TANGGAL``, ``PRODUKSI``, ``PRODUKSI_BERSIH``.
+    gagal : pandas.DataFrame
+        Sel produksi yang tidak bisa di-parse (baris sumber, bulan, nilai, alasan).
+    statistik : dict
+        ``baris`` (baris sumber), ``dilewati`` (baris tanpa NAMA UPI), ``diimputasi`` dan
+        ``tetap_kosong`` (sel produksi).
+    """
+    long, gagal, dilewati = _lebar_ke_panjang(chunk)
+    nilai = long["PRODUKSI"].to_numpy()
+
+    if strategi == "global":
+        terisi = isi_produksi(nilai, long["TANGGAL"].to_numpy())
+    else:
+        terisi = np.where(np.isnan(nilai), seri.nilai(long), nilai)
+
+    kosong = np.isnan(nilai)
+    statistik = {
+        "baris": len(chunk),
+        "dilewati": dilewati,
+        "diimputasi": int((kosong & ~np.isnan(terisi)).sum()),
+        "tetap_kosong": int(np.isnan(terisi).sum()),
+    }
+
+    if seri is not None:
+        kolom_entitas = seri.kolom_entitas
+    kunci_unik, kode = _kunci_entitas(long, kolom_entitas)
+    long["PRODUKSI_BERSIH"] = add_entity_noise(
+        pd.Series(terisi),
+        pd.Categorical.from_codes(kode, kunci_unik),
+        long["TANGGAL"].to_numpy(),
+        noise_level=noise_level,
+        wave_strength=wave_strength,
+        seed=seed
+    ).round(1).to_numpy()
+
+    return long.reset_index(drop=True), gagal, statistik
+
+
+# ============================================================
+# OUTPUT TERPARTISI
+# ============================================================
+def _kunci_bulan(tanggal):
+    return pd.Timestamp(tanggal).strftime("%Y-%m")
+
+
+def baca_manifest(output_dir=ETL_DIR):
+    try:
+        with open(os.path.join(output_dir, MANIFEST), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _tulis_manifest(output_dir, manifest):
+    path = os.path.join(output_dir, MANIFEST)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+_SERI_WORKER = None
+
+
+def _init_worker_tulis(seri):
+    global _SERI_WORKER
+    _SERI_WORKER = seri
+
+
+def _tulis_potongan(nomor, chunk, staging, sudah_ada, opsi, seri=None):
+    """
+    Transformasi satu potongan lalu tulis partisinya ke ``staging``
+    (dijalankan di worker). Nama file part unik per potongan, jadi
+    worker tidak pernah menulis file yang sama.
+
+    Returns
+    -------
+    statistik : dict
+    gagal : pandas.DataFrame
+    baris_per_bulan : dict
+    """
+    if seri is None:
+        seri = _SERI_WORKER
+    long, gagal, statistik = transform_chunk(chunk, seri=seri, **opsi)
+
+    baris_per_bulan = {}
+    for tanggal, bagian in long.groupby("TANGGAL", sort=True):
+        bulan = _kunci_bulan(tanggal)
+        if bulan in sudah_ada:
+            continue
+        folder = os.path.join(staging, f"bulan={bulan}")
+        os.makedirs(folder, exist_ok=True)
+        bagian.to_parquet(os.path.join(folder, f"part-{nomor:05d}.parquet"), index=False)
+        baris_per_bulan[bulan] = len(bagian)
+
+    return statistik, gagal, baris_per_bulan
+
+
+def jalankan_etl(sumber=SUMBER_PATH, output_dir=ETL_DIR, chunk_rows=CHUNK_ROWS,
+                 penuh=False, seed=None, strategi="time", kolom_entitas=KOLOM_ENTITAS,
+                 noise_level=NOISE_LEVEL, wave_strength=WAVE_STRENGTH,
+                 header_row=0, sheet_name=None, workers=None):
+    """
+    Menjalankan ETL sumber lebar -> Parquet terpartisi per bulan.
+
+    Mode inkremental (default): bulan yang sudah tercatat di manifest
+    tidak ditulis ulang (nilai yang sudah dipublikasi tidak bergeser);
+    hanya kolom bulan baru yang ditulis. Deret lengkap tetap dihitung,
+    sehingga bulan baru diinterpolasi dengan konteks bulan sebelumnya.
+
+    Strategi per entitas membaca sumber dua kali: lintasan pertama
+    mengumpulkan deret tiap entitas (:class:`SeriEntitas`), lintasan
+    kedua menulis tabel panjang dengan sel kosong terisi.
+
+    Partisi ditulis ke direktori staging lalu dipindah, dan manifest
+    diganti atomik di akhir, jadi run yang gagal tidak meninggalkan
+    partisi setengah jadi.
+
+    Kedua lintasan memproses potongan di ``ProcessPoolExecutor``; hasil
+    digabung berurutan sehingga output sama persis dengan jalur serial.
+
+    Parameters
+    ----------
+    penuh : bool
+        Bangun ulang semua bulan (wajib jika isi bulan lama di sumber
+        diubah). Otomatis aktif bila versi ETL / parameter berbeda
+        dengan manifest.
+    strategi : str
+        Salah satu :data:`STRATEGI_ISI`.
+    kolom_entitas : list of str
+        Kolom (nama publish) yang membentuk satu deret entitas.
+    workers : int, optional
+        Jumlah proses (lihat :func:`jumlah_worker`); 1 = serial.
+
+    Returns
+    -------
+    dict
+        Ringkasan run: baris, sel gagal parse / diimputasi / tetap kosong,
+        entitas tanpa observasi, bulan ditulis/dilewati, durasi.
+    """
+    if strategi not in STRATEGI_ISI:
+        raise ValueError(f"Strategi isi tidak dikenal: {strategi!r}")
+
+    mulai = time.perf_counter()
+    parameter = {
+        "etl_version": ETL_VERSION,
+        "seed": seed,
+        "strategi": strategi,
+        "kolom_entitas": list(kolom_entitas),
+        "noise_level": noise_level,
+        "wave_strength": wave_strength,
+    }
+
+    manifest = None if penuh else baca_manifest(output_dir)
+    if manifest is not None and manifest.get("parameter") != parameter:
+        logger.info("Parameter ETL berubah, bangun ulang semua bulan")
+        manifest = None
+    sudah_ada = set(manifest["bulan"]) if manifest else set()
+
+    staging = os.path.join(output_dir, f".staging-{os.getpid()}")
+
+    ringkasan = {"baris_sumber": 0, "baris_dilewati": 0, "gagal_parse": 0,
+                 "sel_diimputasi": 0, "sel_tetap_kosong": 0, "entitas_kosong": None}
+    baris_per_bulan = {}
+    daftar_gagal = []
+
+    # seed=None: satu seed acak untuk seluruh run, supaya entitas yang sama
+    # di potongan berbeda tetap memakai deret noise yang sama
+    seed_noise = np.random.SeedSequence().entropy if seed is None else seed
+
+    workers = jumlah_worker(workers)
+    seri = None
+    pool = None
+    try:
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+
+        if strategi != "global":
+            pool = buat_pool(workers)
+            if pool is None:
+                workers = 1
+            seri = SeriEntitas.dari_sumber(sumber, kolom_entitas, chunk_rows, header_row,
+                                           sheet_name, workers=workers, pool=pool)
+            seri.isi(strategi)
+            ringkasan["entitas_kosong"] = seri.entitas_kosong
+            if pool is not None:
+                pool.shutdown()
+
+        # seri dikirim sekali per worker lewat initializer, bukan per potongan
+        pool = buat_pool(workers, _init_worker_tulis, (seri,))
+        opsi = {
+            "seed": seed_noise, "strategi": strategi, "kolom_entitas": kolom_entitas,
+            "noise_level": noise_level, "wave_strength": wave_strength,
+        }
+        daftar_argumen = (
+            (nomor, chunk, staging, sudah_ada, opsi, None if pool is not None else seri)
+            for nomor, chunk in enumerate(baca_sumber(sumber, chunk_rows, header_row, sheet_name))
+        )
+        for statistik, gagal, baris in peta_berurutan(_tulis_potongan, daftar_argumen, pool, workers):
+            ringkasan["baris_sumber"] += statistik["baris"]
+            ringkasan["baris_dilewati"] += statistik["dilewati"]
+            ringkasan["sel_diimputasi"] += statistik["diimputasi"]
+            ringkasan["sel_tetap_kosong"] += statistik["tetap_kosong"]
+            ringkasan["gagal_parse"] += len(gagal)
+            if len(gagal):
+                daftar_gagal.append(gagal)
+            for bulan, n in baris.items():
+                baris_per_bulan[bulan] = baris_per_bulan.get(bulan, 0) + n
+
+        # pindahkan partisi baru ke tempatnya
+        for bulan in sorted(baris_per_bulan):
+            tujuan = os.path.join(output_dir, f"bulan={bulan}")
+            shutil.rmtree(tujuan, ignore_errors=True)
+            os.replace(os.path.join(staging, f"bulan={bulan}"), tujuan)
+
+        if penuh or manifest is None:
+            # bulan lama yang sudah tidak ada di sumber ikut dibuang
+            for nama in os.listdir(output_dir):
+                if nama.startswith("bulan=") and nama[len("bulan="):] not in baris_per_bulan:
+                    shutil.rmtree(os.path.join(output_dir, nama), ignore_errors=True)
+
+        # ditulis ulang setiap run (header saja jika tidak ada yang gagal),
+        # supaya tabel run sebelumnya tidak terbaca sebagai kegagalan baru
+        tabel_gagal = (
+            pd.concat(daftar_gagal, ignore_index=True)[KOLOM_GAGAL]
+            if daftar_gagal else pd.DataFrame(columns=KOLOM_GAGAL)
+        )
+        tabel_gagal.to_csv(os.path.join(output_dir, GAGAL_PARSE), index=False)
+
+        bulan_manifest = dict(manifest["bulan"]) if manifest else {}
+        bulan_manifest.update({b: {"baris": n} for b, n in baris_per_bulan.items()})
+        _tulis_manifest(output_dir, {
+            "sumber": os.path.basename(sumber),
+            "sha256": hash_file(sumber),
+            "parameter": parameter,
+            "bulan": dict(sorted(bulan_manifest.items())),
+        })
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        shutil.rmtree(staging, ignore_errors=True)
+
+    ringkasan.update(
+        bulan_ditulis=sorted(baris_per_bulan),
+        bulan_dilewati=sorted(sudah_ada),
+        durasi=time.perf_counter() - mulai,
+    )
+    return ringkasan
+
+
+def baca_hasil(output_dir=ETL_DIR, bulan=None, columns=None, bedah=None):
+    """
+    Membaca output ETL sebagai satu DataFrame ber-:data:`SCHEMA`.
+
+    Parameters
+    ----------
+    bulan : list of str, optional
+        Hanya partisi ``"YYYY-MM"`` ini; default semua di manifest.
+    columns : list of str, optional
+        Proyeksi kolom saat baca Parquet.
+    bedah : str or pandas.DataFrame, optional
+        Workbook / sheet bedah UPI; jika diberikan, kolom bedah
+        (termasuk ``tahun bedah upi``) ditempel lewat
+        :func:`LIB.bedah_upi.perkaya_bedah`.
+    """
+    manifest = baca_manifest(output_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"Output ETL tidak ditemukan di {output_dir}")
+
+    daftar = []
+    for kunci in (bulan or manifest["bulan"]):
+        folder = os.path.join(output_dir, f"bulan={kunci}")
+        for nama in sorted(os.listdir(folder)):
+            daftar.append(pd.read_parquet(os.path.join(folder, nama), columns=columns))
+
+    df = apply_schema(pd.concat(daftar, ignore_index=True))
+
+    if bedah is not None:
+        if isinstance(bedah, str):
+            bedah = baca_bedah(bedah)
+        df, _ = perkaya_bedah(df, bedah)
+    return df
+
+
+# ============================================================
+# CLI
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ETL produksi lebar -> Parquet per bulan")
+    parser.add_argument("--sumber", default=SUMBER_PATH)
+    parser.add_argument("--output", default=ETL_DIR)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--header-row", type=int, default=0, help="(xlsx) baris header, 0 = pertama")
+    parser.add_argument("--sheet", default=None, help="(xlsx) nama sheet")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--strategi", choices=STRATEGI_ISI, default="time",
+                        help="pengisian sel kosong per entitas, atau 'global' (cara lama)")
+    parser.add_argument("--entitas", nargs="+", default=KOLOM_ENTITAS,
+                        help="kolom pembentuk deret entitas")
+    parser.add_argument("--penuh", action="store_true", help="bangun ulang semua bulan")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="jumlah proses (default DASHBOARD_ETL_WORKERS / semua core; 1 = serial)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    ringkasan = jalankan_etl(
+        sumber=args.sumber, output_dir=args.output, chunk_rows=args.chunk_rows,
+        penuh=args.penuh, seed=args.seed, strategi=args.strategi,
+        kolom_entitas=args.entitas, header_row=args.header_row,
+        sheet_name=args.sheet, workers=args.workers,
+    )
+    print(json.dumps(ringkasan, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
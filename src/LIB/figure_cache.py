@@ -0,0 +1,187 @@
+# figure_cache.py
+
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+import plotly.io as pio
+
+from LIB.cube import CubeSlice
+from LIB.figure_ringan import ke_figure
+from LIB.tampilan import TampilanBaris
+
+
+# ============================================================
+# KONFIGURASI
+# ============================================================
+MAX_ITEMS = 512                     # jumlah figure maksimum di cache
+MAX_BYTES = 128 * 1024 * 1024       # total ukuran JSON maksimum (byte)
+
+
+def fingerprint(*parts):
+    """
+    Sidik jari murah (blake2b 16 byte) dari parameter yang bisa di-JSON-kan,
+    misalnya versi data + pilihan filter sidebar.
+
+    List diperlakukan sesuai urutannya; urutkan dulu jika urutan
+    pilihan tidak berpengaruh pada hasil.
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class FigureCache:
+    """
+    Cache LRU figure Plotly dalam bentuk JSON terserialisasi.
+
+    Dipakai bersama oleh semua sesi dalam satu proses. Figure disimpan
+    sebagai string JSON (immutable), sehingga setiap pengambilan menghasilkan
+    objek Figure baru (tanpa validasi ulang) yang aman dimodifikasi oleh
+    pemanggil.
+
+    Parameters
+    ----------
+    max_items : int
+        Batas jumlah entri.
+    max_bytes : int
+        Batas total ukuran JSON; entri terlama dibuang jika terlampaui.
+    """
+
+    def __init__(self, max_items=MAX_ITEMS, max_bytes=MAX_BYTES):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._data = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def get(self, key):
+        """JSON figure untuk ``key`` atau ``None``; menandai entri baru dipakai."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, fig_json):
+        """Menyimpan JSON figure lalu membuang entri LRU sampai di bawah batas."""
+        size = len(fig_json)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+
+            self._data[key] = fig_json
+            self._bytes += size
+
+            while self._data and (
+                len(self._data) > self.max_items or self._bytes > self.max_bytes
+            ):
+                _, dibuang = self._data.popitem(last=False)
+                self._bytes -= len(dibuang)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self):
+        return {
+            "items": len(self._data),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# cache global proses (dipakai bersama oleh semua sesi Streamlit)
+FIGURE_CACHE = FigureCache()
+
+# argumen bertipe data tidak di-hash; isinya diwakili kunci_data
+TIPE_DATA = (pd.DataFrame, pd.Series, CubeSlice, TampilanBaris)
+
+
+def _kunci_argumen(args, kwargs):
+    """Argumen builder selain data (data diwakili ``kunci_data``)."""
+    posisi = [a for a in args if not isinstance(a, TIPE_DATA)]
+    nama = {k: v for k, v in kwargs.items() if not isinstance(v, TIPE_DATA)}
+    return posisi, nama
+
+
+def _wujudkan(args, kwargs):
+    """View baris (:class:`LIB.tampilan.TampilanBaris`) -> DataFrame proyeksinya."""
+    args = [a.ke_dataframe() if isinstance(a, TampilanBaris) else a for a in args]
+    kwargs = {k: v.ke_dataframe() if isinstance(v, TampilanBaris) else v for k, v in kwargs.items()}
+    return args, kwargs
+
+
+def cached_figure(nama, kunci_data, builder, *args, cache=None, ringan=False, **kwargs):
+    """
+    Memanggil chart builder dengan memoization lintas sesi.
+
+    Parameters
+    ----------
+    nama : str
+        Nama chart (bagian kunci cache, membedakan builder).
+    kunci_data : str
+        Sidik jari data masukan, biasanya ``fingerprint(versi_data, filter)``.
+        Data (DataFrame / CubeSlice) tidak di-hash; pemanggil bertanggung
+        jawab memastikan ``kunci_data`` berubah setiap kali isi data berubah.
+    builder : callable
+        Fungsi chart di ``LIB.charts`` yang mengembalikan Figure.
+    *args, **kwargs
+        Diteruskan ke ``builder``; argumen selain data ikut menjadi kunci.
+        :class:`LIB.tampilan.TampilanBaris` baru diubah menjadi DataFrame
+        (kolom proyeksi saja) saat cache miss.
+    cache : FigureCache, optional
+        Default :data:`FIGURE_CACHE`.
+    ringan : bool
+        True: builder dipanggil dengan ``ringan=True`` (lihat
+        ``LIB.charts.dukung_ringan``), yang disimpan adalah dict ringan,
+        dan hasil dibungkus :func:`LIB.figure_ringan.ke_figure` tanpa
+        validasi. Figure hasilnya hanya untuk ditampilkan.
+
+    Pada cache hit, JSON tersimpan (hasil ``pio.to_json`` yang sudah
+    tervalidasi saat miss) dibungkus :func:`LIB.figure_ringan.ke_figure`
+    tanpa validasi ulang, baik ``ringan`` maupun tidak.
+
+    Returns
+    -------
+    plotly.graph_objects.Figure
+    """
+    cache = FIGURE_CACHE if cache is None else cache
+    posisi, bernama = _kunci_argumen(args, kwargs)
+    if ringan:
+        key = fingerprint(nama, kunci_data, posisi, bernama, "ringan")
+    else:
+        key = fingerprint(nama, kunci_data, posisi, bernama)
+
+    fig_json = cache.get(key)
+    if fig_json is not None:
+        return ke_figure(json.loads(fig_json))
+
+    args, kwargs = _wujudkan(args, kwargs)
+    if ringan:
+        spec = builder(*args, ringan=True, **kwargs)
+        cache.put(key, json.dumps(spec, separators=(",", ":"), ensure_ascii=False))
+        return ke_figure(spec)
+
+    fig = builder(*args, **kwargs)
+    cache.put(key, pio.to_json(fig, validate=False))
+    return fig
@@ -0,0 +1,111 @@
+# figure_ringan.py
+#
+# Figure Plotly "ringan": dict JSON biasa yang siap dikirim ke
+# st.plotly_chart tanpa validasi ulang.
+#
+# - template dipangkas ke jenis trace yang benar-benar dipakai (template
+#   bawaan membawa default ~25 jenis trace) dan dipakai bersama antar figure
+# - array angka sudah typed array base64 ({"dtype", "bdata"}) dari plotly 6
+# - tanggal tengah malam disingkat "2024-01-01T00:00:00" -> "2024-01-01"
+#
+# st.plotly_chart memvalidasi dict (Figure(**dict)) tetapi tidak Figure;
+# karena itu dict dibungkus ke_figure() (go.Figure tanpa validasi).
+
+import re
+import json
+import hashlib
+import threading
+
+import plotly.io as pio
+import plotly.graph_objects as go
+from plotly.tools import return_figure_from_figure_or_data
+
+
+# ============================================================
+# TEMPLATE BERSAMA
+# ============================================================
+_TEMPLATE = {}
+_TEMPLATE_LOCK = threading.Lock()
+
+
+def template_ringan(template, jenis_trace):
+    """
+    Template dengan ``template.data`` hanya untuk ``jenis_trace``.
+
+    Hasil di-cache per (isi template, jenis trace), sehingga figure
+    dengan template yang sama memakai objek dict yang sama. Jangan
+    diubah oleh pemanggil.
+    """
+    if not template:
+        return template
+
+    kunci = (
+        hashlib.blake2b(
+            json.dumps(template, sort_keys=True, separators=(",", ":")).encode("utf-8"),
+            digest_size=16
+        ).hexdigest(),
+        tuple(sorted(jenis_trace)),
+    )
+    with _TEMPLATE_LOCK:
+        hasil = _TEMPLATE.get(kunci)
+        if hasil is None:
+            hasil = dict(template)
+            if "data" in template:
+                hasil["data"] = {k: v for k, v in template["data"].items() if k in jenis_trace}
+            _TEMPLATE[kunci] = hasil
+    return hasil
+
+
+# ============================================================
+# KONVERSI FIGURE
+# ============================================================
+_TANGGAL_TENGAH_MALAM = re.compile(r"^\d{4}-\d{2}-\d{2}T00:00:00$")
+
+
+def _singkat_tanggal(nilai):
+    """List ISO tengah malam -> "YYYY-MM-DD"; selain itu dikembalikan apa adanya."""
+    if (
+        isinstance(nilai, list) and nilai
+        and isinstance(nilai[0], str)
+        and all(isinstance(v, str) and _TANGGAL_TENGAH_MALAM.match(v) for v in nilai)
+    ):
+        return [v[:10] for v in nilai]
+    return nilai
+
+
+def ringkas_figure(fig):
+    """
+    Dict figure ringan dari ``plotly.graph_objects.Figure``.
+
+    Returns
+    -------
+    dict
+        ``{"data": [...], "layout": {...}}`` berisi tipe JSON biasa.
+    """
+    spec = json.loads(pio.to_json(fig, validate=False))
+
+    for trace in spec.get("data", []):
+        for kolom in ("x", "y", "customdata"):
+            if kolom in trace:
+                trace[kolom] = _singkat_tanggal(trace[kolom])
+
+    layout = spec.setdefault("layout", {})
+    if "template" in layout:
+        jenis = {trace.get("type", "scatter") for trace in spec.get("data", [])}
+        layout["template"] = template_ringan(layout["template"], jenis)
+
+    return spec
+
+
+def ke_figure(spec):
+    """Figure dari dict ringan tanpa validasi (murah untuk ``st.plotly_chart``)."""
+    return go.Figure(spec, _validate=False)
+
+
+def json_streamlit(fig_or_spec):
+    """
+    JSON figure persis seperti yang dikirim ``st.plotly_chart`` ke
+    browser (untuk mengukur ukuran payload).
+    """
+    figure = return_figure_from_figure_or_data(fig_or_spec, validate_figure=True)
+    return pio.to_json(figure, validate=False)
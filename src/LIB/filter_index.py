@@ -0,0 +1,179 @@
+# filter_index.py
+
+import numpy as np
+import pandas as pd
+
+
+# ============================================================
+# KONFIGURASI DEFAULT
+# ============================================================
+# kolom kategori yang dipakai filter sidebar PDSPKP
+KOLOM_FILTER = [
+    "JENIS KEGIATAN",
+    "JENIS IKAN",
+    "KECAMATAN",
+    "DESA",
+    "PENERIMAAN BANTUAN",
+]
+
+# kolom yang difilter berdasarkan ada/tidaknya nilai (notna)
+KOLOM_FLAG = [
+    "NO TELP HASH",      # filter kontak
+    "tahun bedah upi",   # pemisah UPI (bedah) vs POKLAHSAR
+]
+
+# di atas batas ini bitmap per kategori terlalu boros memori;
+# kolom dilayani lewat lookup table kode kategori
+MAX_KATEGORI_BITMAP = 64
+
+
+class FilterIndex:
+    """
+    Indeks bitmap untuk filter kombinasi kategori.
+
+    Untuk setiap kolom kategori disimpan bitset terkemas (``np.packbits``)
+    per kategori; filter kolom = OR dari bitset kategori terpilih,
+    kombinasi antar kolom = AND. Hasil akhir berupa posisi baris
+    (``np.ndarray`` int), tanpa membuat salinan DataFrame di tiap tahap.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset (kolom kategori sebaiknya sudah bertipe ``category``).
+    kolom_kategori : list of str
+        Kolom yang boleh difilter berdasarkan nilai.
+    kolom_flag : list of str
+        Kolom yang boleh difilter berdasarkan ada/tidaknya nilai.
+    max_kategori_bitmap : int
+        Batas kardinalitas kolom yang dibuatkan bitmap.
+    """
+
+    def __init__(
+        self,
+        df,
+        kolom_kategori=KOLOM_FILTER,
+        kolom_flag=KOLOM_FLAG,
+        max_kategori_bitmap=MAX_KATEGORI_BITMAP
+    ):
+        self.n_rows = len(df)
+        self._semua = np.packbits(np.ones(self.n_rows, dtype=bool))
+
+        self._kategori = {}   # kolom -> pandas.Index kategori
+        self._codes = {}      # kolom -> kode kategori per baris (-1 = NaN)
+        self._bitmap = {}     # kolom -> array (n_kategori, n_bytes) uint8
+        self._notna = {}      # kolom -> bitset baris yang tidak NaN
+
+        for kolom in kolom_kategori:
+            if kolom not in df.columns:
+                continue
+
+            cat = pd.Categorical(df[kolom])
+            codes = cat.codes
+            self._kategori[kolom] = cat.categories
+            self._codes[kolom] = codes
+            self._notna[kolom] = np.packbits(codes >= 0)
+
+            if len(cat.categories) <= max_kategori_bitmap:
+                self._bitmap[kolom] = self._build_bitmaps(codes, len(cat.categories))
+
+        for kolom in kolom_flag:
+            if kolom in df.columns:
+                self._notna[kolom] = np.packbits(df[kolom].notna().to_numpy())
+
+    # =========================
+    # BUILD
+    # =========================
+    def _build_bitmaps(self, codes, n_kategori):
+        """
+        Satu bitset terkemas per kategori, dibangun dalam satu pass
+        langsung ke byte (tanpa matriks bool kategori x baris).
+        """
+        bitmap = np.zeros((n_kategori, len(self._semua)), dtype=np.uint8)
+        posisi = np.flatnonzero(codes >= 0)
+        bit = (np.uint8(0x80) >> (posisi & 7).astype(np.uint8))
+        np.bitwise_or.at(bitmap, (codes[posisi], posisi >> 3), bit)
+        return bitmap
+
+    # =========================
+    # QUERY
+    # =========================
+    def kategori(self, kolom):
+        """Daftar kategori (terurut) yang dikenal indeks untuk ``kolom``."""
+        return list(self._kategori[kolom])
+
+    def _bits_kolom(self, kolom, pilihan):
+        """Bitset baris yang nilai ``kolom``-nya ada di ``pilihan``."""
+        kategori = self._kategori[kolom]
+        kode = kategori.get_indexer(list(pilihan))
+        kode = np.unique(kode[kode >= 0])
+
+        # semua kategori dipilih -> cukup baris non-NaN
+        if len(kode) == len(kategori):
+            return self._notna[kolom]
+
+        if kolom in self._bitmap:
+            if len(kode) == 0:
+                return np.zeros_like(self._semua)
+            return np.bitwise_or.reduce(self._bitmap[kolom][kode], axis=0)
+
+        lookup = np.zeros(len(kategori) + 1, dtype=bool)
+        lookup[kode] = True
+        # kode -1 (NaN) jatuh ke slot terakhir yang selalu False
+        return np.packbits(lookup[self._codes[kolom]])
+
+    def bits(self, kategori=None, notna=None):
+        """
+        Bitset terkemas untuk kombinasi filter.
+
+        Parameters
+        ----------
+        kategori : dict, optional
+            ``{kolom: daftar nilai}``. Nilai ``None`` berarti tanpa filter.
+        notna : dict, optional
+            ``{kolom: True/False}``; True = harus berisi, False = harus kosong,
+            ``None`` = tanpa filter.
+
+        Returns
+        -------
+        numpy.ndarray
+            Bitset terkemas (uint8).
+        """
+        hasil = self._semua
+
+        for kolom, pilihan in (kategori or {}).items():
+            if pilihan is None:
+                continue
+            hasil = hasil & self._bits_kolom(kolom, pilihan)
+
+        for kolom, harus_ada in (notna or {}).items():
+            if harus_ada is None:
+                continue
+            flag = self._notna[kolom]
+            hasil = hasil & (flag if harus_ada else ~flag)
+
+        return hasil
+
+    def mask(self, kategori=None, notna=None):
+        """Seperti :meth:`bits` tetapi mengembalikan mask boolean per baris."""
+        bits = self.bits(kategori=kategori, notna=notna)
+        return np.unpackbits(bits, count=self.n_rows).view(bool)
+
+    def select(self, kategori=None, notna=None):
+        """
+        Posisi baris yang lolos filter (untuk ``df.take`` / ``df.iloc``).
+
+        Returns
+        -------
+        numpy.ndarray
+            Array posisi baris (int64), terurut naik.
+        """
+        return np.flatnonzero(self.mask(kategori=kategori, notna=notna))
+
+    def nilai_tersedia(self, kolom, rows):
+        """
+        Kategori ``kolom`` yang muncul pada baris ``rows`` (terurut),
+        misalnya untuk opsi multiselect Desa setelah filter Kecamatan.
+        """
+        codes = self._codes[kolom][rows]
+        ada = np.bincount(codes[codes >= 0], minlength=len(self._kategori[kolom])) > 0
+        return list(self._kategori[kolom][ada])
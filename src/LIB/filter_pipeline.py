@@ -0,0 +1,165 @@
+# filter_pipeline.py
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from LIB.filter_index import FilterIndex
+
+
+# ============================================================
+# KONFIGURASI DEFAULT
+# ============================================================
+# urutan tahap = urutan widget di sidebar PDSPKP
+# (kolom, jenis): "kategori" -> daftar nilai, "notna" -> True/False
+TAHAP_SIDEBAR = [
+    ("JENIS KEGIATAN", "kategori"),
+    ("JENIS IKAN", "kategori"),
+    ("KECAMATAN", "kategori"),
+    ("DESA", "kategori"),
+    ("NO TELP HASH", "notna"),
+    ("PENERIMAAN BANTUAN", "kategori"),
+]
+
+MAX_BYTES_CACHE = 64 * 1024 * 1024   # total bitset yang disimpan
+MAX_ENTRI_CACHE = 4096               # batas jumlah prefiks (dataset kecil)
+
+
+def _normalisasi(jenis, pilihan):
+    """Bentuk pilihan yang hashable dan tidak peka urutan."""
+    if pilihan is None:
+        return None
+    if jenis == "notna":
+        return bool(pilihan)
+    return tuple(sorted({str(p) for p in pilihan}))
+
+
+class FilterPipeline:
+    """
+    Rantai filter sidebar dengan cache hasil per tahap.
+
+    Hasil tahap ke-i (bitset terkemas) disimpan dengan kunci pilihan
+    tahap 0..i. Saat satu widget berubah, hanya tahap mulai widget itu
+    ke hilir yang dihitung ulang; prefiks yang sama (mis. hasil
+    JENIS KEGIATAN + JENIS IKAN saat hanya DESA berubah) dipakai ulang.
+    Cache dipakai bersama oleh semua sesi dan dibatasi ukurannya (LRU).
+
+    Parameters
+    ----------
+    filter_index : LIB.filter_index.FilterIndex
+    tahap : list of (str, str)
+        Urutan tahap ``(kolom, "kategori" | "notna")``.
+    max_bytes : int
+        Batas total ukuran bitset di cache.
+    """
+
+    def __init__(self, filter_index, tahap=TAHAP_SIDEBAR, max_bytes=MAX_BYTES_CACHE):
+        self.index = filter_index
+        self.tahap = list(tahap)
+        self._posisi = {kolom: i for i, (kolom, _) in enumerate(self.tahap)}
+
+        nbytes = max(len(filter_index.bits()), 1)
+        self.max_entri = min(MAX_ENTRI_CACHE, max(len(self.tahap) * 2, max_bytes // nbytes))
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.dihitung = 0       # jumlah tahap yang dihitung
+        self.dipakai_ulang = 0  # jumlah tahap yang diambil dari cache
+
+    @classmethod
+    def dari_dataframe(cls, df, **kwargs):
+        """Membangun FilterIndex dari ``df`` lalu pipeline di atasnya."""
+        return cls(FilterIndex(df), **kwargs)
+
+    # =========================
+    # CACHE
+    # =========================
+    def _ambil(self, key):
+        with self._lock:
+            bits = self._cache.get(key)
+            if bits is not None:
+                self._cache.move_to_end(key)
+            return bits
+
+    def _simpan(self, key, bits):
+        with self._lock:
+            self._cache[key] = bits
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entri:
+                self._cache.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    # =========================
+    # QUERY
+    # =========================
+    def _kunci(self, pilihan, sampai):
+        return tuple(
+            _normalisasi(jenis, pilihan.get(kolom))
+            for kolom, jenis in self.tahap[:sampai + 1]
+        )
+
+    def bits(self, pilihan, sampai=None):
+        """
+        Bitset terkemas setelah tahap ``sampai`` (default: tahap terakhir).
+
+        Parameters
+        ----------
+        pilihan : dict
+            ``{kolom: daftar nilai / True / False / None}``; kolom yang tidak
+            ada atau bernilai ``None`` tidak difilter.
+        sampai : str, optional
+            Nama kolom tahap terakhir yang diterapkan.
+
+        Returns
+        -------
+        numpy.ndarray
+            Bitset terkemas (uint8), read-only bersama; jangan diubah.
+        """
+        akhir = len(self.tahap) - 1 if sampai is None else self._posisi[sampai]
+        kunci = self._kunci(pilihan, akhir)
+
+        # cari prefiks terpanjang yang sudah ada di cache
+        mulai = 0
+        hasil = None
+        for i in range(akhir, -1, -1):
+            hasil = self._ambil(kunci[:i + 1])
+            if hasil is not None:
+                mulai = i + 1
+                break
+
+        self.dipakai_ulang += mulai
+        if hasil is None:
+            hasil = self.index.bits().copy()
+
+        for i in range(mulai, akhir + 1):
+            kolom, jenis = self.tahap[i]
+            nilai = pilihan.get(kolom)
+            if nilai is not None:
+                if jenis == "notna":
+                    hasil = hasil & self.index.bits(notna={kolom: nilai})
+                else:
+                    hasil = hasil & self.index.bits(kategori={kolom: nilai})
+            hasil.flags.writeable = False
+            self._simpan(kunci[:i + 1], hasil)
+            self.dihitung += 1
+
+        return hasil
+
+    def select(self, pilihan, sampai=None, notna=None):
+        """
+        Posisi baris setelah tahap ``sampai``, opsional di-AND dengan
+        syarat ``notna`` tambahan (tidak di-cache, mis. pemisah tab).
+
+        Returns
+        -------
+        numpy.ndarray
+            Posisi baris (int64), terurut naik.
+        """
+        bits = self.bits(pilihan, sampai=sampai)
+        if notna:
+            bits = bits & self.index.bits(notna=notna)
+        return np.flatnonzero(np.unpackbits(bits, count=self.index.n_rows))
@@ -0,0 +1,222 @@
+# metrics.py
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from LIB.cube import KOLOM_DIMENSI, KOLOM_FLAG, _nama_flag, mask_sel
+from LIB.figure_cache import fingerprint
+
+
+# ============================================================
+# KONFIGURASI DEFAULT
+# ============================================================
+# kolom yang dihitung jumlah nilai unik-nya di baris st.metric PDSPKP
+KOLOM_METRIK = [
+    "NAMA UPI",
+    "JENIS KEGIATAN",
+    "KECAMATAN",
+    "DESA",
+]
+
+# struktur per kolom metrik dipilih menurut ukurannya:
+# - "bitmap": bitmap kategori per sel, jika muat di MAX_BYTES_STRUKTUR
+# - "hll"   : sketch HyperLogLog per sel (perkiraan) untuk kolom dengan
+#             kategori > MAX_KATEGORI_EKSAK, jika register muat
+# - "daftar": pasangan (sel, kategori) unik, eksak, memori sebanding pasangan
+MAX_KATEGORI_EKSAK = 4096
+HLL_PRESISI = 10                        # 2^10 register, galat standar ~3%
+MAX_BYTES_STRUKTUR = 64 * 1024 * 1024   # per kolom
+
+MAX_ENTRI_CACHE = 1024                  # hasil per sidik jari filter
+
+
+# ============================================================
+# HYPERLOGLOG
+# ============================================================
+def _splitmix64(x):
+    """Hash 64-bit untuk kode kategori (vectorized, overflow disengaja)."""
+    z = x.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _register_hll(kode, presisi=HLL_PRESISI):
+    """(indeks register, rank) HyperLogLog untuk tiap kode."""
+    h = _splitmix64(kode)
+    sisa_bit = 64 - presisi
+    indeks = (h >> np.uint64(sisa_bit)).astype(np.int64)
+    w = h & np.uint64((1 << sisa_bit) - 1)
+    # bit_length(w) lewat eksponen frexp: w < 2^54 masih tepat di float64
+    _, panjang = np.frexp(w.astype(np.float64))
+    rank = (sisa_bit - panjang + 1).astype(np.uint8)
+    return indeks, rank
+
+
+def estimasi_hll(register):
+    """Perkiraan kardinalitas dari satu baris register HyperLogLog."""
+    m = len(register)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimasi = alpha * m * m / np.sum(np.exp2(-register.astype(np.float64)))
+    kosong = int(np.count_nonzero(register == 0))
+    if estimasi <= 2.5 * m and kosong:
+        # koreksi rentang kecil (linear counting)
+        estimasi = m * np.log(m / kosong)
+    return int(round(estimasi))
+
+
+# ============================================================
+# SERVICE METRIK
+# ============================================================
+class HeadlineMetrics:
+    """
+    Jumlah nilai unik (``nunique``) kolom metrik untuk kombinasi filter
+    sidebar, tanpa memindai baris.
+
+    Baris dikelompokkan ke sel (dimensi filter x flag, seperti
+    :class:`LIB.cube.ProductionCube` tanpa tanggal). Untuk tiap kolom
+    metrik disimpan kategori yang muncul di tiap sel:
+
+    - ``"bitmap"``: bitmap kategori terkemas per sel; hasil = popcount
+      dari OR bitmap sel terpilih.
+    - ``"hll"``: register HyperLogLog per sel (kolom berkardinalitas
+      besar); hasil = estimasi dari max register sel terpilih.
+    - ``"daftar"``: pasangan (sel, kategori) unik bila dua struktur di
+      atas terlalu besar; hasil eksak dari pasangan sel terpilih.
+
+    Biaya query sebanding dengan jumlah sel x kategori (atau jumlah
+    pasangan), bukan jumlah baris, dan hasil disimpan per sidik jari
+    filter (LRU).
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+    kolom_metrik : list of str
+    kolom_dimensi, kolom_flag : list of str
+        Dimensi sel; filter hanya boleh memakai kolom ini.
+    max_kategori_eksak : int
+        Kolom dengan kategori lebih banyak memakai sketch.
+    max_bytes_struktur : int
+        Batas ukuran bitmap / register per kolom.
+    """
+
+    def __init__(
+        self,
+        df,
+        kolom_metrik=KOLOM_METRIK,
+        kolom_dimensi=KOLOM_DIMENSI,
+        kolom_flag=KOLOM_FLAG,
+        max_kategori_eksak=MAX_KATEGORI_EKSAK,
+        max_bytes_struktur=MAX_BYTES_STRUKTUR,
+        max_entri=MAX_ENTRI_CACHE
+    ):
+        self.kolom_metrik = [k for k in kolom_metrik if k in df.columns]
+        self.kolom_dimensi = [k for k in kolom_dimensi if k in df.columns]
+        self.kolom_flag = [k for k in kolom_flag if k in df.columns]
+
+        kunci = {k: df[k] for k in self.kolom_dimensi}
+        for k in self.kolom_flag:
+            kunci[_nama_flag(k)] = df[k].notna()
+        tabel = pd.DataFrame(kunci)
+
+        grup = tabel.groupby(list(kunci), observed=True, dropna=False, sort=False)
+        sel = grup.ngroup().to_numpy()
+        self.cells = grup.size().reset_index(name="n_baris")
+        n_sel = len(self.cells)
+
+        self.metode = {}
+        self._data = {}
+        for kolom in self.kolom_metrik:
+            cat = pd.Categorical(df[kolom])
+            kode = cat.codes.astype(np.int64)
+            n_kategori = len(cat.categories)
+
+            # pasangan (sel, kode) unik: satu kali per kategori per sel
+            ada = kode >= 0
+            pasangan = np.unique(sel[ada] * np.int64(n_kategori) + kode[ada])
+            p_sel, p_kode = np.divmod(pasangan, np.int64(max(n_kategori, 1)))
+
+            m = 1 << HLL_PRESISI
+            n_byte_bitmap = (n_kategori + 7) // 8
+            if n_kategori <= max_kategori_eksak and n_sel * n_byte_bitmap <= max_bytes_struktur:
+                bitmap = np.zeros((n_sel, n_byte_bitmap), dtype=np.uint8)
+                bit = np.uint8(0x80) >> (p_kode & 7).astype(np.uint8)
+                np.bitwise_or.at(bitmap, (p_sel, p_kode >> 3), bit)
+                self.metode[kolom] = "bitmap"
+                self._data[kolom] = bitmap
+            elif n_kategori > max_kategori_eksak and n_sel * m <= max_bytes_struktur:
+                register = np.zeros((n_sel, m), dtype=np.uint8)
+                indeks, rank = _register_hll(p_kode)
+                np.maximum.at(register, (p_sel, indeks), rank)
+                self.metode[kolom] = "hll"
+                self._data[kolom] = register
+            else:
+                self.metode[kolom] = "daftar"
+                self._data[kolom] = (p_sel, p_kode, n_kategori)
+
+        self.max_entri = max_entri
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.dihitung = 0
+        self.dipakai_ulang = 0
+
+    def __len__(self):
+        return len(self.cells)
+
+    def _hitung(self, mask):
+        hasil = {}
+        for kolom in self.kolom_metrik:
+            metode = self.metode[kolom]
+            if not mask.any():
+                hasil[kolom] = 0
+            elif metode == "bitmap":
+                gabung = np.bitwise_or.reduce(self._data[kolom][mask], axis=0)
+                hasil[kolom] = int(np.unpackbits(gabung).sum())
+            elif metode == "hll":
+                hasil[kolom] = estimasi_hll(np.maximum.reduce(self._data[kolom][mask], axis=0))
+            else:
+                p_sel, p_kode, n_kategori = self._data[kolom]
+                terpilih = p_kode[mask[p_sel]]
+                hasil[kolom] = int(np.count_nonzero(np.bincount(terpilih, minlength=n_kategori)))
+        return hasil
+
+    def hitung(self, kategori=None, notna=None):
+        """
+        Jumlah nilai unik tiap kolom metrik untuk filter (format sama dengan
+        :meth:`LIB.filter_index.FilterIndex.select`).
+
+        Returns
+        -------
+        dict
+            ``{kolom: int}``; salinan, aman diubah pemanggil.
+        """
+        kunci = fingerprint(
+            {k: sorted(map(str, v)) if v is not None else None for k, v in (kategori or {}).items()},
+            {k: v for k, v in (notna or {}).items() if v is not None},
+        )
+
+        with self._lock:
+            hasil = self._cache.get(kunci)
+            if hasil is not None:
+                self._cache.move_to_end(kunci)
+                self.dipakai_ulang += 1
+                return dict(hasil)
+
+        hasil = self._hitung(mask_sel(self.cells, kategori, notna))
+
+        with self._lock:
+            self._cache[kunci] = hasil
+            self._cache.move_to_end(kunci)
+            while len(self._cache) > self.max_entri:
+                self._cache.popitem(last=False)
+            self.dihitung += 1
+
+        return dict(hasil)
+
+    def clear(self):
+        """Mengosongkan cache hasil (struktur sel tetap)."""
+        with self._lock:
+            self._cache.clear()
@@ -0,0 +1,340 @@
+# pdspkp.py
+#
+# Data terfilter dan figure halaman PDSPKP, dipisah dari script page
+# supaya bisa dibangun juga di luar rerun Streamlit (warm-up, lihat warmup.py).
+# Page dan prefetch memakai fungsi yang sama sehingga kunci cache figure
+# selalu identik.
+
+from LIB.charts import (
+    plot_upi_per_kecamatan, plot_upi_jenis_proses_jenis_ikan_catplot,
+    donut_plot_kategori, donut_plot_binary, value_count_top5_with_others,
+    donut_plot_kategori_agregat, plot_tren_produksi_total, plot_bedah_upi_stack,
+    plot_line_chart, plot_produksi_stack_tahun
+)
+from LIB.cube import (
+    ProductionCube, KOLOM_DIMENSI, KOLOM_FLAG as KOLOM_FLAG_CUBE, KOLOM_WAKTU, KOLOM_NILAI
+)
+from LIB.data_loader import DATA_PATH, versi_data
+from LIB.figure_cache import cached_figure, fingerprint
+from LIB.filter_index import KOLOM_FILTER, KOLOM_FLAG
+from LIB.filter_pipeline import FilterPipeline
+from LIB.metrics import HeadlineMetrics, KOLOM_METRIK
+from LIB.tampilan import TampilanBaris
+
+
+# figure dikirim dalam bentuk ringan (LIB.figure_ringan): template
+# dipangkas dan tanpa validasi ulang saat diambil dari cache
+FIGURE_RINGAN = True
+
+
+# ============================================================
+# OPSI WIDGET
+# ============================================================
+# pilihan "Kelompokkan Berdasarkan" -> kolom grup chart tren
+PETA_GRUP_TREN = {
+    "Status Bantuan": 'PENERIMAAN BANTUAN',
+    "Jenis Olahan": 'JENIS KEGIATAN',
+    "Jenis Ikan Yang Diolah": 'JENIS IKAN',
+    'Tidak Ada': None,
+    'Kecamatan': 'KECAMATAN',
+    'Desa': 'DESA'
+}
+OPSI_GRUP_TREN = ("Status Bantuan", "Jenis Olahan", "Jenis Ikan Yang Diolah", 'Kecamatan', 'Desa', 'Tidak Ada')
+
+OPSI_STACK = ["DESA", "KECAMATAN", "JENIS KEGIATAN", "JENIS IKAN"]
+
+
+# ============================================================
+# KOLOM PER KONSUMEN
+# ============================================================
+# hanya kolom ini yang dibaca dari snapshot (LIB.data_loader); kolom lain
+# (nama pemilik, provinsi, harga, dst.) tidak pernah dimuat halaman ini
+KOLOM_FILTER_PIPELINE = KOLOM_FILTER + KOLOM_FLAG
+KOLOM_CUBE = KOLOM_DIMENSI + KOLOM_FLAG_CUBE + [KOLOM_WAKTU, KOLOM_NILAI]
+KOLOM_METRIK_HEADLINE = list(dict.fromkeys(KOLOM_METRIK + KOLOM_DIMENSI + KOLOM_FLAG_CUBE))
+
+# kolom baris yang dibaca figure tiap tab (chart tren memakai cube)
+KOLOM_TAB_POKLAHSAR = ["KECAMATAN", "JENIS KEGIATAN", "JENIS IKAN", "NO TELP HASH", "PENERIMAAN BANTUAN"]
+KOLOM_TAB_UPI = ["tahun bedah upi", "NAMA UPI", *OPSI_STACK]
+KOLOM_HALAMAN = list(dict.fromkeys(KOLOM_TAB_POKLAHSAR + KOLOM_TAB_UPI))
+
+
+# ============================================================
+# DATA
+# ============================================================
+def filter_default(filter_pipeline):
+    """
+    Pilihan filter saat semua widget sidebar masih "Semua ..."
+    (sama persis dengan hasil ``handle_multiselect_all`` di page).
+    """
+    filter_index = filter_pipeline.index
+    kategori = {
+        "JENIS KEGIATAN": filter_index.kategori("JENIS KEGIATAN"),
+        "JENIS IKAN": filter_index.kategori("JENIS IKAN"),
+        "KECAMATAN": filter_index.kategori("KECAMATAN"),
+    }
+    rows_wilayah = filter_pipeline.select(kategori, sampai="KECAMATAN")
+    kategori["DESA"] = filter_index.nilai_tersedia("DESA", rows_wilayah)
+    kategori["PENERIMAAN BANTUAN"] = None
+    return kategori
+
+
+def ambil_filter_pipeline(versi):
+    """:class:`LIB.filter_pipeline.FilterPipeline` bersama untuk ``versi``."""
+    return versi.derived("filter_pipeline", FilterPipeline.dari_dataframe, kolom=KOLOM_FILTER_PIPELINE)
+
+
+def metrik_headline(kategori=None, notna=None, path=DATA_PATH, versi=None):
+    """
+    Isi baris ``st.metric`` (jumlah UPI, jenis olahan, kecamatan, desa)
+    dari :class:`LIB.metrics.HeadlineMetrics` yang dibangun sekali per
+    versi dataset.
+
+    Parameters
+    ----------
+    versi : LIB.data_loader.VersiData, optional
+        Versi dataset rerun ini; default versi aktif ``path``.
+
+    Returns
+    -------
+    dict
+        ``{kolom: jumlah nilai unik}`` untuk kolom ``KOLOM_METRIK``.
+    """
+    versi = versi_data(path) if versi is None else versi
+    metrik = versi.derived("headline_metrics", HeadlineMetrics, kolom=KOLOM_METRIK_HEADLINE)
+    return metrik.hitung(kategori, notna)
+
+
+def siapkan_data(filter_kategori=None, filter_kontak=None, path=DATA_PATH, versi=None):
+    """
+    Menyiapkan data terfilter untuk kedua tab.
+
+    Parameters
+    ----------
+    filter_kategori : dict, optional
+        ``{kolom: daftar nilai}`` dari sidebar; ``None`` = filter default.
+    filter_kontak : bool or None
+        True = punya kontak, False = tidak punya, None = semua.
+    versi : LIB.data_loader.VersiData, optional
+        Versi dataset rerun ini (default versi aktif ``path``). Semua isi
+        hasil berasal dari versi ini, meski versi baru dipasang di tengah rerun.
+
+    Returns
+    -------
+    dict
+        ``df`` (kolom :data:`KOLOM_HALAMAN` saja), ``upi``, ``poklahsar`` (:class:`LIB.tampilan.TampilanBaris`,
+        posisi baris tanpa salinan data), ``cube``, ``cube_upi``,
+        ``cube_poklahsar``, ``metrik_upi``, ``kunci_semua``, ``kunci_filter``.
+    """
+    versi = versi_data(path) if versi is None else versi
+    df = versi.frame(KOLOM_HALAMAN)
+    filter_pipeline = ambil_filter_pipeline(versi)
+    cube = versi.derived("cube_produksi", ProductionCube, kolom=KOLOM_CUBE)
+
+    if filter_kategori is None:
+        filter_kategori = filter_default(filter_pipeline)
+
+    notna_upi = {"NO TELP HASH": filter_kontak, "tahun bedah upi": True}
+    notna_poklahsar = {"NO TELP HASH": filter_kontak, "tahun bedah upi": False}
+
+    # tahap sidebar lewat pipeline (prefiks yang sama dipakai ulang),
+    # pemisah UPI / POKLAHSAR di-AND terakhir
+    pilihan = {**filter_kategori, "NO TELP HASH": filter_kontak}
+    split_upi = {"tahun bedah upi": True}
+    split_poklahsar = {"tahun bedah upi": False}
+
+    return {
+        "df": df,
+        # view baca-saja: figure mengambil kolom yang dibutuhkan saat cache miss
+        "upi": TampilanBaris(df, filter_pipeline.select(pilihan, notna=split_upi)),
+        "poklahsar": TampilanBaris(df, filter_pipeline.select(pilihan, notna=split_poklahsar)),
+        # potongan cube produksi untuk chart tren (roll-up dari sel agregat)
+        "cube": cube,
+        "cube_upi": cube.slice(kategori=filter_kategori, notna=notna_upi),
+        "cube_poklahsar": cube.slice(kategori=filter_kategori, notna=notna_poklahsar),
+        # baris st.metric tab UPI (nunique dari struktur per sel, bukan baris)
+        "metrik_upi": metrik_headline(filter_kategori, notna_upi, versi=versi),
+        # kunci cache figure: versi data (+ pilihan filter untuk data terfilter)
+        "kunci_semua": fingerprint(versi.sha256),
+        "kunci_filter": fingerprint(
+            versi.sha256,
+            {k: sorted(v) if v is not None else None for k, v in filter_kategori.items()},
+            filter_kontak
+        ),
+    }
+
+
+# ============================================================
+# FIGURE TAB POKLAHSAR
+# ============================================================
+def fig_tren_total(data):
+    return cached_figure(
+        "tren_total", data["kunci_semua"], plot_tren_produksi_total,
+        df=data["cube"].slice(),
+        kolom_tanggal="TANGGAL",
+        kolom_nilai="PRODUKSI_BERSIH",
+        judul="Trend Jumlah Produksi POKLAHSAR",
+        watermark_text="DATA DUMMY",
+        ringan=FIGURE_RINGAN,
+    )
+
+
+def fig_upi_per_kecamatan(data):
+    return cached_figure("upi_per_kecamatan", data["kunci_semua"], plot_upi_per_kecamatan, data["df"], ringan=FIGURE_RINGAN)
+
+
+def _donut_top5(df, group_col, judul, ringan=False):
+    """Top-5 + 'Lain-lain' lalu donut; builder cache, jadi hanya dihitung saat miss."""
+    df_top5 = value_count_top5_with_others(df, group_col=group_col, value_name="jumlah_upi")
+    return donut_plot_kategori_agregat(
+        df=df_top5,
+        column_value="jumlah_upi",
+        label_tampil=df_top5[group_col].tolist(),
+        judul=judul,
+        ringan=ringan,
+    )
+
+
+def fig_donut_jenis_kegiatan(data):
+    return cached_figure(
+        "donut_jenis_kegiatan", data["kunci_semua"], _donut_top5,
+        data["df"],
+        group_col="JENIS KEGIATAN",
+        judul="Proporsi Jenis Kegiatan POKLAHSAR",
+        ringan=FIGURE_RINGAN,
+    )
+
+
+def fig_catplot_poklahsar(data):
+    return cached_figure(
+        "catplot_poklahsar", data["kunci_filter"],
+        plot_upi_jenis_proses_jenis_ikan_catplot,
+        data["poklahsar"].proyeksi(["JENIS KEGIATAN", "JENIS IKAN"]),
+        ringan=FIGURE_RINGAN,
+    )
+
+
+def fig_donut_kontak_poklahsar(data):
+    return cached_figure(
+        "donut_kontak_poklahsar", data["kunci_filter"], donut_plot_binary,
+        data["poklahsar"].proyeksi(["NO TELP HASH"]),
+        kolom="NO TELP HASH",
+        label_true="Memiliki Kontak",
+        label_false="Tidak Memiliki Kontak",
+        judul="Persentase Poklahsar yang Memiliki Kontak",
+        ringan=FIGURE_RINGAN,
+    )
+
+
+def fig_donut_bantuan_poklahsar(data):
+    return cached_figure(
+        "donut_bantuan_poklahsar", data["kunci_filter"], donut_plot_kategori,
+        data["poklahsar"].proyeksi(["PENERIMAAN BANTUAN"]),
+        "PENERIMAAN BANTUAN",
+        kategori_urutan=["sudah", "belum"],
+        label_tampil=["Sudah Menerima Bantuan", "Belum Menerima Bantuan"],
+        judul="Persentase Penerimaan Bantuan",
+        ringan=FIGURE_RINGAN,
+    )
+
+
+def fig_tren_poklahsar(data, kolom_grup):
+    return cached_figure(
+        "tren_poklahsar", data["kunci_filter"], plot_line_chart,
+        data["cube_poklahsar"],
+        x_axis='TANGGAL',
+        y_axis='PRODUKSI_BERSIH',
+        y_label='Jumlah Produksi',
+        kolom_grup=kolom_grup,
+        judul='Trend Produksi Terfilter',
+        figsize=(10, 5),
+        tampil_legend=True,
+        watermark_text="Data Dummy",
+        ringan=FIGURE_RINGAN,
+    )
+
+
+# ============================================================
+# FIGURE TAB UPI
+# ============================================================
+def fig_bedah_upi(data, stack_col):
+    return cached_figure(
+        "bedah_upi_stack", data["kunci_filter"], plot_bedah_upi_stack,
+        data["upi"].proyeksi(["tahun bedah upi", "NAMA UPI", stack_col]),
+        stack_col,
+        ringan=FIGURE_RINGAN,
+    )
+
+
+def fig_produksi_stack_upi(data, stack_col):
+    return cached_figure(
+        "produksi_stack_upi", data["kunci_filter"], plot_produksi_stack_tahun,
+        data["cube_upi"],
+        stack_col,
+        ringan=FIGURE_RINGAN,
+    )
+
+
+def fig_tren_upi(data, kolom_grup):
+    return cached_figure(
+        "tren_upi", data["kunci_filter"], plot_line_chart,
+        data["cube_upi"],
+        x_axis='TANGGAL',
+        y_axis='PRODUKSI_BERSIH',
+        y_label='Jumlah Produksi',
+        kolom_grup=kolom_grup,
+        judul='Trend Produksi Terfilter',
+        figsize=(10, 5),
+        tampil_legend=True,
+        watermark_text="Data Dummy",
+        ringan=FIGURE_RINGAN,
+    )
+
+
+# ============================================================
+# PREFETCH
+# ============================================================
+def bangun_figure_default(path=DATA_PATH, semua_opsi=False, versi=None):
+    """
+    Memuat dataset dan membangun figure halaman PDSPKP untuk filter
+    sidebar default, sehingga kunjungan pertama langsung kena cache.
+
+    Parameters
+    ----------
+    semua_opsi : bool
+        False: hanya pilihan selectbox default. True: semua opsi
+        "Kelompokkan Berdasarkan" dan "Stack berdasarkan" di kedua tab.
+    versi : LIB.data_loader.VersiData, optional
+        Default versi aktif ``path``; refresher membangun figure versi
+        baru sebelum versi itu dipasang.
+
+    Returns
+    -------
+    int
+        Jumlah figure yang dibangun / disentuh.
+    """
+    data = siapkan_data(path=path, versi=versi)
+
+    if semua_opsi:
+        daftar_grup = [PETA_GRUP_TREN[o] for o in OPSI_GRUP_TREN]
+        daftar_stack = list(OPSI_STACK)
+    else:
+        daftar_grup = [PETA_GRUP_TREN[OPSI_GRUP_TREN[0]]]
+        daftar_stack = [OPSI_STACK[0]]
+
+    fig_tren_total(data)
+    fig_upi_per_kecamatan(data)
+    fig_donut_jenis_kegiatan(data)
+    fig_catplot_poklahsar(data)
+    fig_donut_kontak_poklahsar(data)
+    fig_donut_bantuan_poklahsar(data)
+
+    for kolom_grup in daftar_grup:
+        fig_tren_poklahsar(data, kolom_grup)
+        fig_tren_upi(data, kolom_grup)
+
+    for stack_col in daftar_stack:
+        fig_bedah_upi(data, stack_col)
+        fig_produksi_stack_upi(data, stack_col)
+
+    return 6 + 2 * len(daftar_grup) + 2 * len(daftar_stack)
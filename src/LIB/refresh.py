@@ -0,0 +1,200 @@
+# refresh.py
+#
+# Pembaruan data di latar tanpa memblokir pengguna: thread daemon memantau
+# file data (stat murah tiap INTERVAL_REFRESH detik). Saat ada perubahan,
+# versi baru (snapshot, struktur turunan, figure default PDSPKP) dibangun
+# di thread ini lalu dipasang secara atomik. Selama itu rerun tetap
+# dilayani versi lama; rerun yang sedang berjalan memegang
+# LIB.data_loader.VersiData-nya sendiri sampai selesai.
+
+import os
+import time
+import logging
+import threading
+import multiprocessing
+
+from LIB.data_loader import (
+    DATA_PATH, MODE_BERSAMA, parse_excel, pantau_latar, versi_berubah,
+    bangun_versi, pasang_versi, bangun_snapshot_paralel
+)
+from LIB.pdspkp import bangun_figure_default
+
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# KONFIGURASI
+# ============================================================
+# detik antar pengecekan file; 0 = refresher tidak dijalankan; bisa
+# diganti lewat env DASHBOARD_REFRESH_INTERVAL (dibaca saat refresher mulai)
+INTERVAL_REFRESH = 30.0
+
+_lock = threading.Lock()
+_stop = threading.Event()
+_thread = None
+_dipantau = []              # path yang didaftarkan ke pantau_latar
+_status = {
+    "state": "idle",        # idle | watching | building | error | stopped
+    "versi": {},            # {nama file: sha256 versi terpasang terakhir}
+    "terakhir": None,       # waktu pemasangan versi terakhir
+    "durasi": None,         # detik membangun versi terakhir
+    "error": None,
+}
+
+
+def interval_refresh():
+    """Nilai env DASHBOARD_REFRESH_INTERVAL, atau :data:`INTERVAL_REFRESH` jika kosong / tidak valid."""
+    nilai = os.environ.get("DASHBOARD_REFRESH_INTERVAL", "").strip()
+    if not nilai:
+        return INTERVAL_REFRESH
+    try:
+        return float(nilai)
+    except ValueError:
+        logger.warning("DASHBOARD_REFRESH_INTERVAL=%r bukan angka, pakai default %g detik",
+                       nilai, INTERVAL_REFRESH)
+        return INTERVAL_REFRESH
+
+
+def daftar_sumber():
+    """
+    File yang dipantau: ``(path, parser, siapkan)``. ``siapkan(versi)``
+    (boleh None) dijalankan pada versi baru sebelum dipasang.
+    """
+    from LIB.bedah_upi import BEDAH_PATH, parse_bedah
+
+    sumber = [(DATA_PATH, parse_excel, lambda versi: bangun_figure_default(versi=versi))]
+    if os.path.exists(BEDAH_PATH):
+        sumber.append((BEDAH_PATH, parse_bedah, None))
+    return sumber
+
+
+def refresh_sekali(sumber=None):
+    """
+    Satu putaran pengecekan, sinkron: bangun dan pasang versi baru untuk
+    setiap file yang berubah.
+
+    Jika lebih dari satu workbook berubah, snapshot-nya di-parse paralel
+    dulu (satu proses per file, :func:`LIB.data_loader.bangun_snapshot_paralel`),
+    sehingga :func:`LIB.data_loader.bangun_versi` tinggal membuka snapshot.
+
+    Kegagalan satu file (mis. workbook masih setengah tersalin) dicatat
+    dan versi aktifnya tetap dipakai; dicoba lagi di putaran berikutnya.
+    Setelah putaran, status kembali ``"watching"`` (refresher berjalan)
+    atau ``"idle"``, atau ``"error"`` jika ada file yang gagal.
+
+    Returns
+    -------
+    list of str
+        Path yang versinya diganti.
+    """
+    diganti = []
+    gagal = False
+    try:
+        sumber = daftar_sumber() if sumber is None else sumber
+
+        # mode bersama membaca versi terbit, bukan snapshot workbook
+        awal = time.perf_counter()
+        berubah = [(path, parser) for path, parser, _ in sumber if versi_berubah(path)]
+        paralel = len(berubah) > 1 and not MODE_BERSAMA
+        if paralel:
+            _status["state"] = "building"
+            # spawn: fork dari proses server yang banyak thread tidak aman
+            bangun_snapshot_paralel(berubah, mp_context=multiprocessing.get_context("spawn"))
+
+        for path, parser, siapkan in sumber:
+            # durasi file yang di-parse paralel dihitung dari awal putaran
+            mulai = awal if paralel else time.perf_counter()
+            try:
+                versi = bangun_versi(path, parser=parser)
+                if versi is None:
+                    continue
+
+                _status["state"] = "building"
+                if siapkan is not None:
+                    siapkan(versi)
+                pasang_versi(versi)
+            except Exception as err:
+                gagal = True
+                _status.update(state="error", error=repr(err))
+                logger.exception("Gagal membangun versi baru %s, versi lama tetap dipakai", path)
+                continue
+
+            diganti.append(path)
+            _status["versi"][os.path.basename(path)] = versi.sha256
+            _status.update(terakhir=time.strftime("%Y-%m-%dT%H:%M:%S"),
+                           durasi=time.perf_counter() - mulai, error=None)
+            logger.info("Versi baru %s dipasang (%s, %.2f detik)",
+                        os.path.basename(path), versi.sha256[:16], _status["durasi"])
+    except BaseException:
+        gagal = True
+        raise
+    finally:
+        if gagal:
+            _status["state"] = "error"
+        else:
+            berjalan = _thread is not None and _thread.is_alive() and not _stop.is_set()
+            _status["state"] = "watching" if berjalan else "idle"
+    return diganti
+
+
+def _loop(sumber, interval):
+    _status["state"] = "watching"
+    while not _stop.wait(interval):
+        refresh_sekali(sumber)
+    _status["state"] = "stopped"
+
+
+def mulai_refresh(interval=None, sumber=None):
+    """
+    Menjalankan refresher di thread daemon dan langsung kembali.
+
+    Aman dipanggil berulang (saat server start dan di setiap rerun Home).
+    Setelah dipanggil, rerun tidak lagi memuat ulang file yang berubah
+    sendiri (:func:`LIB.data_loader.pantau_latar`).
+
+    Parameters
+    ----------
+    interval : float, optional
+        Detik antar pengecekan; default :func:`interval_refresh`.
+
+    Returns
+    -------
+    threading.Thread or None
+        ``None`` jika ``interval`` <= 0 (refresher dimatikan).
+    """
+    global _thread
+    interval = interval_refresh() if interval is None else interval
+    if interval <= 0:
+        return None
+
+    with _lock:
+        if _thread is None or not _thread.is_alive():
+            sumber = daftar_sumber() if sumber is None else sumber
+            for path, _, _ in sumber:
+                pantau_latar(path)
+                _dipantau.append(path)
+            _stop.clear()
+            _thread = threading.Thread(
+                target=_loop,
+                args=(sumber, interval),
+                name="refresh-data",
+                daemon=True
+            )
+            _thread.start()
+        return _thread
+
+
+def berhenti_refresh(timeout=None):
+    """Menghentikan refresher; rerun kembali memuat ulang file yang berubah sendiri."""
+    with _lock:
+        _stop.set()
+        if _thread is not None:
+            _thread.join(timeout)
+        while _dipantau:
+            pantau_latar(_dipantau.pop(), aktif=False)
+
+
+def status():
+    """Status refresher (salinan dict)."""
+    return {**_status, "versi": dict(_status["versi"])}
@@ -0,0 +1,64 @@
+# tampilan.py
+#
+# View baca-saja atas DataFrame bersama (hasil load_data_upi): hanya
+# menyimpan posisi baris terpilih, bukan salinan data. Kolom baru diambil
+# (take) saat benar-benar dibutuhkan, dan hanya kolom yang diminta.
+
+import numpy as np
+import pandas as pd
+
+
+class TampilanBaris:
+    """
+    Baris terpilih dari DataFrame bersama, tanpa menyalin data.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        DataFrame bersama (tidak diubah).
+    rows : array-like of int
+        Posisi baris (hasil ``FilterIndex.select`` / ``FilterPipeline.select``).
+    kolom : list of str, optional
+        Proyeksi kolom; ``None`` = semua kolom.
+    """
+
+    def __init__(self, df, rows, kolom=None):
+        rows = np.asarray(rows, dtype=np.intp)
+        rows.flags.writeable = False
+        self.df = df
+        self.rows = rows
+        self.kolom = None if kolom is None else list(kolom)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def empty(self):
+        return len(self.rows) == 0
+
+    def proyeksi(self, kolom):
+        """View baru dengan kolom ``kolom`` saja (murah, belum mengambil data)."""
+        return TampilanBaris(self.df, self.rows, kolom)
+
+    def series(self, kolom):
+        """Satu kolom pada baris terpilih."""
+        return self.df[kolom].take(self.rows)
+
+    def ke_dataframe(self):
+        """
+        DataFrame berisi baris terpilih dan kolom proyeksi saja.
+
+        Kolom diambil langsung dari array sumber (dtype kategori / Int16
+        tetap), tanpa ``df[daftar_kolom]`` yang menyalin semua baris dulu.
+        """
+        kolom = self.df.columns if self.kolom is None else self.kolom
+        return pd.DataFrame(
+            {k: self.df[k].array.take(self.rows) for k in kolom},
+            index=self.df.index.take(self.rows),
+        )
+
+    def nbytes(self):
+        """Perkiraan ukuran :meth:`ke_dataframe` (byte) tanpa membangunnya."""
+        kolom = self.df.columns if self.kolom is None else self.kolom
+        per_baris = sum(self.df[k].array.nbytes / max(len(self.df), 1) for k in kolom)
+        return int(per_baris * len(self.rows))
@@ -0,0 +1,98 @@
+# warmup.py
+#
+# Pemanasan cache proses: parse dataset, bangun struktur turunan
+# (indeks filter, cube produksi) dan figure default halaman PDSPKP
+# di thread latar, agar pengunjung pertama setelah deploy tidak
+# menanggung biaya parse Excel + build chart.
+
+import time
+import logging
+import threading
+
+from LIB.data_loader import DATA_PATH, load_data_upi, data_version
+from LIB.pdspkp import bangun_figure_default, KOLOM_HALAMAN
+
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_thread = None
+_status = {
+    "state": "idle",        # idle | running | done | error
+    "versi": None,          # versi dataset yang terakhir selesai di-warm-up
+    "figure": 0,
+    "durasi": None,         # detik
+    "error": None,
+}
+
+
+def warm_up(path=DATA_PATH, semua_opsi=True):
+    """
+    Menjalankan warm-up secara sinkron.
+
+    Dilewati jika versi dataset yang sama sudah pernah selesai di-warm-up
+    (figure-nya masih ada di cache figure).
+
+    Parameters
+    ----------
+    path : str
+        Lokasi workbook publish.
+    semua_opsi : bool
+        Ikut bangun figure untuk semua opsi selectbox (lihat
+        :func:`LIB.pdspkp.bangun_figure_default`).
+
+    Returns
+    -------
+    dict
+        Salinan status warm-up.
+    """
+    mulai = time.perf_counter()
+    _status.update(state="running", error=None)
+
+    try:
+        load_data_upi(path, kolom=KOLOM_HALAMAN)
+        versi = data_version(path)
+
+        if versi != _status["versi"]:
+            _status["figure"] = bangun_figure_default(path, semua_opsi=semua_opsi)
+            _status["versi"] = versi
+
+        _status.update(state="done", durasi=time.perf_counter() - mulai)
+        logger.info(
+            "Warm-up selesai: %d figure dalam %.2f detik",
+            _status["figure"], _status["durasi"]
+        )
+    except Exception as err:
+        _status.update(state="error", error=repr(err), durasi=time.perf_counter() - mulai)
+        logger.exception("Warm-up dashboard gagal")
+
+    return status()
+
+
+def mulai_warmup(path=DATA_PATH, semua_opsi=True):
+    """
+    Menjalankan :func:`warm_up` di thread daemon dan langsung kembali.
+
+    Aman dipanggil berulang (saat server start dan di setiap rerun Home):
+    thread baru hanya dibuat jika tidak ada warm-up yang sedang berjalan.
+
+    Returns
+    -------
+    threading.Thread
+    """
+    global _thread
+    with _lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(
+                target=warm_up,
+                args=(path, semua_opsi),
+                name="warmup-dashboard",
+                daemon=True
+            )
+            _thread.start()
+        return _thread
+
+
+def status():
+    """Status warm-up terakhir (salinan dict)."""
+    return dict(_status)
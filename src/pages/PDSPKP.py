@@ -5,8 +5,6 @@
 import base64
 import asyncio
 
-import pandas as pd
-
 import streamlit as st
 
 import sys
@@ -15,12 +13,14 @@ import os
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))
 sys.path.append(BASE_DIR)
 
-from LIB.charts import (
-    plot_upi_per_kecamatan,plot_upi_jenis_proses_jenis_ikan_catplot,
-    handle_multiselect_all,helper_segmented_filter,
-    donut_plot_kategori,donut_plot_binary,value_count_top5_with_others,
-    donut_plot_kategori_agregat,parse_produksi,add_dynamic_noise,plot_tren_produksi_total,plot_bedah_upi_stack,
-    handle_segmented_filter,plot_line_chart,plot_produksi_stack_tahun
+from LIB.charts import handle_multiselect_all, handle_segmented_filter
+from LIB.data_loader import versi_data
+from LIB.pdspkp import (
+    siapkan_data, metrik_headline, PETA_GRUP_TREN, OPSI_GRUP_TREN, OPSI_STACK,
+    ambil_filter_pipeline,
+    fig_tren_total, fig_upi_per_kecamatan, fig_donut_jenis_kegiatan,
+    fig_catplot_poklahsar, fig_donut_kontak_poklahsar, fig_donut_bantuan_poklahsar,
+    fig_tren_poklahsar, fig_bedah_upi, fig_produksi_stack_upi, fig_tren_upi
     )
 
 
@@ -77,8 +77,13 @@ def encode_image(path):
 # ============================================================
 # LOAD DATA
 # ============================================================
-df = pd.read_excel(DATA_PATH)
-df['TANGGAL'] = pd.to_datetime(df['TANGGAL'])
+# parse Excel hanya sekali per versi file; rerun & sesi lain memakai cache.
+# satu versi dataset untuk seluruh rerun ini: versi baru dari refresher
+# latar (LIB.refresh) baru terpakai di rerun berikutnya
+versi = versi_data(DATA_PATH)
+# rantai filter sidebar; hasil tiap tahap di-cache per prefiks pilihan
+filter_pipeline = ambil_filter_pipeline(versi)
+filter_index = filter_pipeline.index
 # df["PENERIMAAN BANTUAN"] = (
 #     df["PENERIMAAN BANTUAN"]
 #     .fillna("Belum")
@@ -158,10 +163,11 @@ with tab1:
     # ============================================================
     col1, col2, col3, col4 = st.columns(4)
 
-    col1.metric("Jumlah UPI", len(df['NAMA UPI'].unique()))
-    col2.metric("Jenis Olahan", df["JENIS KEGIATAN"].nunique())
-    col3.metric("Kecamatan", df["KECAMATAN"].nunique())
-    col4.metric("Desa", df["DESA"].nunique())
+    metrik = metrik_headline(versi=versi)
+    col1.metric("Jumlah UPI", metrik["NAMA UPI"])
+    col2.metric("Jenis Olahan", metrik["JENIS KEGIATAN"])
+    col3.metric("Kecamatan", metrik["KECAMATAN"])
+    col4.metric("Desa", metrik["DESA"])
     st.divider()
 
 
@@ -176,7 +182,7 @@ with tab1:
     # =========================
     # JENIS PROSES
     # =========================
-        list_proses = sorted(df["JENIS KEGIATAN"].dropna().unique())
+        list_proses = filter_index.kategori("JENIS KEGIATAN")
         opsi_proses = ["Semua Jenis Proses"] + list_proses
         
         pilih_proses = st.multiselect(
@@ -195,12 +201,11 @@ with tab1:
             default_label="Semua Jenis Proses",
             full_list=list_proses
         )
-        df_clean_filtered = df[(df["JENIS KEGIATAN"].isin(final_jenis_proses))].copy()
         # df_clean_filtered = df_clean_filtered.loc[df_clean_filtered['jenis_proses'].isin(final_jenis_proses)]
     # =========================
     # JENIS IKAN
     # =========================
-        list_ikan = sorted(df["JENIS IKAN"].dropna().unique())
+        list_ikan = filter_index.kategori("JENIS IKAN")
         opsi_ikan = ["Semua Jenis Ikan"] + list_ikan
         
         pilih_ikan = st.sidebar.multiselect(
@@ -213,11 +218,10 @@ with tab1:
             default_label="Semua Jenis Ikan",
             full_list=list_ikan
         )
-        df_clean_filtered = df_clean_filtered.loc[df_clean_filtered['JENIS IKAN'].isin(final_jenis_ikan)]
     # =========================
     # KECAMATAN
     # =========================
-        list_kecamatan = sorted(df["KECAMATAN"].dropna().unique())
+        list_kecamatan = filter_index.kategori("KECAMATAN")
         opsi_kecamatan = ["Semua Kecamatan"] + list_kecamatan
 
         pilih_kecamatan = st.multiselect(
@@ -230,12 +234,17 @@ with tab1:
             default_label="Semua Kecamatan",
             full_list=list_kecamatan
         )
-        df_clean_filtered = df_clean_filtered.loc[df_clean_filtered['KECAMATAN'].isin(final_kecamatan)]
+        # opsi desa hanya yang ada setelah filter proses/ikan/kecamatan
+        rows_wilayah = filter_pipeline.select({
+            "JENIS KEGIATAN": final_jenis_proses,
+            "JENIS IKAN": final_jenis_ikan,
+            "KECAMATAN": final_kecamatan,
+        }, sampai="KECAMATAN")
 
     # =========================
     # DESA
     # =========================
-        list_desa = sorted(df_clean_filtered["DESA"].dropna().unique())
+        list_desa = filter_index.nilai_tersedia("DESA", rows_wilayah)
         opsi_desa = ["Semua Desa"] + list_desa
 
         pilih_desa = st.multiselect(
@@ -248,26 +257,19 @@ with tab1:
             default_label="Semua Desa",
             full_list=list_desa
         )
-        df_clean_filtered = df_clean_filtered.loc[df_clean_filtered['DESA'].isin(final_desa)]
 
     # =========================
     # Kontak
     # =========================
         options_kontak = ["Semuanya", "Memiliki Kontak", "Tidak Punya Kontak"]
 
-        kontak_conditions= {
-            "Memiliki Kontak": df_clean_filtered["NO TELP HASH"].notna(),
-            "Tidak Punya Kontak": df_clean_filtered["NO TELP HASH"].isna()
+        # opsi -> syarat kolom NO TELP HASH terisi (True) / kosong (False)
+        kontak_conditions = {
+            "Memiliki Kontak": True,
+            "Tidak Punya Kontak": False
         }
-        
-        kontak_filter_option = handle_segmented_filter(label='Filter Kontak', options=options_kontak)
 
-        
-        df_clean_filtered = helper_segmented_filter(
-            df_clean_filtered,
-            map_condition=kontak_conditions,
-            selection=kontak_filter_option
-        )
+        kontak_filter_option = handle_segmented_filter(label='Filter Kontak', options=options_kontak)
 
 
     # =========================
@@ -275,18 +277,24 @@ with tab1:
     # =========================
         options_bantuan = ["Semuanya", "Sudah Menerima Bantuan", "Belum Menerima Bantuan"]
         bantuan_conditions = {
-            "Sudah Menerima Bantuan": df_clean_filtered["PENERIMAAN BANTUAN"] == "sudah",
-            "Belum Menerima Bantuan": df_clean_filtered["PENERIMAAN BANTUAN"] == "belum"
+            "Sudah Menerima Bantuan": ["sudah"],
+            "Belum Menerima Bantuan": ["belum"]
         }
         bantuan_filter_option = handle_segmented_filter(label='Filter Bantuan', options=options_bantuan)
-        df_clean_filtered = helper_segmented_filter(
-            df_clean_filtered,
-            map_condition=bantuan_conditions,
-            selection=bantuan_filter_option
-        )
 
-        df_clean_filtered_upi = df_clean_filtered.loc[df_clean_filtered['tahun bedah upi'].notna()].copy()
-        df_clean_filtered_poklahsar = df_clean_filtered.loc[df_clean_filtered['tahun bedah upi'].isna()].copy()
+    # =========================
+    # GABUNGAN FILTER (pipeline bertahap, sekali take per tab)
+    # =========================
+        filter_kategori = {
+            "JENIS KEGIATAN": final_jenis_proses,
+            "JENIS IKAN": final_jenis_ikan,
+            "KECAMATAN": final_kecamatan,
+            "DESA": final_desa,
+            "PENERIMAAN BANTUAN": bantuan_conditions.get(bantuan_filter_option),
+        }
+        filter_kontak = kontak_conditions.get(kontak_filter_option)
+
+        data_halaman = siapkan_data(filter_kategori, filter_kontak, versi=versi)
     # =========================
     # DKP IMAGE 
     # =========================
@@ -294,39 +302,15 @@ with tab1:
 
 
     with st.container():
-        fig_lineplot = plot_tren_produksi_total(
-            df=df,
-            kolom_tanggal="TANGGAL",
-            kolom_nilai="PRODUKSI_BERSIH",
-            judul="Trend Jumlah Produksi POKLAHSAR",
-            watermark_text="DATA DUMMY",
-            # kolom_grup='KECAMATAN'
-        )
+        fig_lineplot = fig_tren_total(data_halaman)
 
         st.plotly_chart(fig_lineplot, use_container_width=True)
         # ============================================================
         # BAR CHART - JUMLAH UPI PER KECAMATAN
         # ============================================================
-        fig1 = plot_upi_per_kecamatan(df)
+        fig1 = fig_upi_per_kecamatan(data_halaman)
         # fig2 = plot_upi_per_olahan(df)
-        df_count_top_5_jenis_olahan = value_count_top5_with_others(df, group_col="JENIS KEGIATAN", value_name="jumlah_upi")
-        # df_count_top_5_jumlah_jenis_olahan_list = df_count_top_5_jenis_olahan["jumlah_upi"].tolist()
-        # df_count_top_5_jenis_olahan_list = df_count_top_5_jenis_olahan["jenis_proses"].tolist()
-        label_tampil_fig2 = [
-            f"{jenis} = {jumlah}"
-            for jumlah, jenis in zip(
-                df_count_top_5_jenis_olahan["jumlah_upi"].tolist(),
-                df_count_top_5_jenis_olahan["JENIS KEGIATAN"].tolist()
-            )
-        ]
-        
-        fig2 = donut_plot_kategori_agregat(
-            df=df_count_top_5_jenis_olahan,
-            # column_kategori="jenis_proses",
-            column_value="jumlah_upi",
-            label_tampil=df_count_top_5_jenis_olahan["JENIS KEGIATAN"].tolist(),
-            judul="Proporsi Jenis Kegiatan POKLAHSAR"
-        )
+        fig2 = fig_donut_jenis_kegiatan(data_halaman)
 
         
         col1, col2 = st.columns([2, 1])   # rasio seimbang
@@ -352,24 +336,11 @@ with tab1:
     #     (df["jenis_ikan"].isin(final_ikan))
     # ]
     # st.divider()
-    fig3 = plot_upi_jenis_proses_jenis_ikan_catplot(df_clean_filtered_poklahsar)
+    fig3 = fig_catplot_poklahsar(data_halaman)
     # fig4 = plot_persentase_upi_memiliki_kontak(df_filtered_1)
-    fig4 = donut_plot_binary(
-        df_clean_filtered_poklahsar,
-        kolom="NO TELP HASH",
-        # judul="",
-        label_true="Memiliki Kontak",
-        label_false="Tidak Memiliki Kontak",
-        judul="Persentase Poklahsar yang Memiliki Kontak"
-    )
+    fig4 = fig_donut_kontak_poklahsar(data_halaman)
 
-    fig5 = donut_plot_kategori(
-        df_clean_filtered_poklahsar,
-        "PENERIMAAN BANTUAN",
-        kategori_urutan=["sudah", "belum"],
-        label_tampil=["Sudah Menerima Bantuan", "Belum Menerima Bantuan"],
-        judul="Persentase Penerimaan Bantuan"
-    )
+    fig5 = fig_donut_bantuan_poklahsar(data_halaman)
 
     with st.container():
         col1,col2 = st.columns([1,1])
@@ -391,32 +362,14 @@ with tab1:
                 
             lineplot_filtered_hue = st.selectbox(
                 "Kelompokkan Berdasarkan",
-                ("Status Bantuan", "Jenis Olahan", "Jenis Ikan Yang Diolah",'Kecamatan','Desa','Tidak Ada'),
+                OPSI_GRUP_TREN,
                 placeholder="Pilih Metode"
                 # index=5
             )
 
-            # with col11:
-                
-            lineplot_filtered_hue_map = {
-                "Status Bantuan":'PENERIMAAN BANTUAN', 
-                "Jenis Olahan":'JENIS KEGIATAN', 
-                "Jenis Ikan Yang Diolah":'JENIS IKAN',
-                'Tidak Ada':None,
-                'Kecamatan':'KECAMATAN',
-                'Desa':'DESA'
-            }
-            fig6 = plot_line_chart(
-                df_clean_filtered_poklahsar,
-                x_axis='TANGGAL',
-                y_axis='PRODUKSI_BERSIH',
-                y_label='Jumlah Produksi',
-                kolom_grup=lineplot_filtered_hue_map.get(lineplot_filtered_hue),
-                judul='Trend Produksi Terfilter',
-                figsize=(10, 5),
-                tampil_legend=True,
-                watermark_text="Data Dummy",
-                # tampil_legend=True
+            fig6 = fig_tren_poklahsar(
+                data_halaman,
+                kolom_grup=PETA_GRUP_TREN.get(lineplot_filtered_hue)
             )
             st.plotly_chart(fig6, use_container_width=True)
 
@@ -430,69 +383,38 @@ with tab1:
 with tab2:
     col1, col2, col3, col4 = st.columns(4)
 
-    col1.metric("Jumlah UPI", len(df_clean_filtered_upi['NAMA UPI'].unique()))
-    col2.metric("Jenis Olahan", df_clean_filtered_upi["JENIS KEGIATAN"].nunique())
-    col3.metric("Kecamatan", df_clean_filtered_upi["KECAMATAN"].nunique())
-    col4.metric("Desa", df_clean_filtered_upi["DESA"].nunique())
+    metrik_upi = data_halaman["metrik_upi"]
+    col1.metric("Jumlah UPI", metrik_upi["NAMA UPI"])
+    col2.metric("Jenis Olahan", metrik_upi["JENIS KEGIATAN"])
+    col3.metric("Kecamatan", metrik_upi["KECAMATAN"])
+    col4.metric("Desa", metrik_upi["DESA"])
     st.divider()
     stack_option = st.selectbox(
         "Stack berdasarkan:",
-        [
-            "DESA",
-            "KECAMATAN",
-            "JENIS KEGIATAN",
-            "JENIS IKAN"
-        ]
+        OPSI_STACK
     )
     col1,col2 = st.columns([1,1])
     with col1:
 
-        fig_bedah_upi = plot_bedah_upi_stack(
-            df_clean_filtered_upi,
-            stack_option
-        )
-        st.plotly_chart(fig_bedah_upi, use_container_width=True)
+        fig_bedah = fig_bedah_upi(data_halaman, stack_option)
+        st.plotly_chart(fig_bedah, use_container_width=True)
 
     with col2:
-        fig = plot_produksi_stack_tahun(
-            df_clean_filtered_upi,
-            stack_option
-        )
+        fig = fig_produksi_stack_upi(data_halaman, stack_option)
 
         st.plotly_chart(fig, use_container_width=True)
 
 
     lineplot_filtered_hue_upi = st.selectbox(
         "Kelompokkan UPI Berdasarkan",
-        ("Status Bantuan", "Jenis Olahan", "Jenis Ikan Yang Diolah",'Kecamatan','Desa','Tidak Ada'),
+        OPSI_GRUP_TREN,
         placeholder="Pilih Metode"
         # index=5
     )
 
-    
-
-    # with col11:
-        
-    lineplot_filtered_hue_map_upi = {
-        "Status Bantuan":'PENERIMAAN BANTUAN', 
-        "Jenis Olahan":'JENIS KEGIATAN', 
-        "Jenis Ikan Yang Diolah":'JENIS IKAN',
-        'Tidak Ada':None,
-        'Kecamatan':'KECAMATAN',
-        'Desa':'DESA'
-    }
-
-    fig_lineplot_produksi_upi = plot_line_chart(
-        df_clean_filtered_upi,
-        x_axis='TANGGAL',
-        y_axis='PRODUKSI_BERSIH',
-        y_label='Jumlah Produksi',
-        kolom_grup=lineplot_filtered_hue_map_upi.get(lineplot_filtered_hue_upi),
-        judul='Trend Produksi Terfilter',
-        figsize=(10, 5),
-        tampil_legend=True,
-        watermark_text="Data Dummy",
-        # tampil_legend=True
+    fig_lineplot_produksi_upi = fig_tren_upi(
+        data_halaman,
+        kolom_grup=PETA_GRUP_TREN.get(lineplot_filtered_hue_upi)
     )
     st.plotly_chart(fig_lineplot_produksi_upi, use_container_width=True)
 
@@ -0,0 +1,31 @@
+# serve.py
+#
+# Menjalankan dashboard dengan warm-up cache saat server start:
+#
+#     python src/serve.py [opsi streamlit lain, mis. --server.port 8501]
+#
+# Warm-up (parse dataset + figure default PDSPKP) berjalan di thread latar
+# dalam proses yang sama dengan server, sehingga server langsung menerima
+# koneksi dan cache sudah hangat ketika pengunjung pertama datang.
+#
+# Refresher latar (LIB.refresh) memantau file data; versi baru dibangun
+# dan dipasang tanpa menunggu rerun (DASHBOARD_REFRESH_INTERVAL=0 mematikannya).
+
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(BASE_DIR)
+
+from streamlit.web import cli as stcli
+
+from LIB.refresh import mulai_refresh
+from LIB.warmup import mulai_warmup
+
+
+if __name__ == "__main__":
+    mulai_warmup()
+    mulai_refresh()
+
+    sys.argv = ["streamlit", "run", os.path.join(BASE_DIR, "Home.py"), *sys.argv[1:]]
+    sys.exit(stcli.main())
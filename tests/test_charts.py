@@ -0,0 +1,44 @@
+# test_charts.py
+#
+#     python -m pytest tests
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
+
+from LIB.charts import _agregasi_tren, plot_tren_produksi_total  # noqa: E402
+
+
+def _data_tren(grup):
+    return pd.DataFrame({
+        "TANGGAL": pd.to_datetime(["2024-01-01", "2024-02-01", "2024-01-01"]),
+        "P": [1.0, 2.0, 4.0],
+        "G": grup,
+    })
+
+
+def test_agregasi_tren_semua_grup_kosong():
+    assert _agregasi_tren(_data_tren([np.nan] * 3), "TANGGAL", "P", "G") == {}
+
+
+def test_tren_semua_grup_kosong_tampil_tidak_ada_data():
+    """Filter yang hanya menyisakan grup NaN: figure 'Tidak ada data', bukan IndexError."""
+    fig = plot_tren_produksi_total(_data_tren([np.nan] * 3), "TANGGAL", "P", kolom_grup="G")
+
+    assert len(fig.data) == 0
+    assert fig.layout.annotations[0].text == "Tidak ada data"
+
+
+def test_agregasi_tren_per_grup():
+    hasil = _agregasi_tren(_data_tren(["a", np.nan, "b"]), "TANGGAL", "P", "G")
+
+    assert list(hasil) == ["a", "b"]
+    x_vals, y_mean, y_min, y_max = hasil["b"]
+    assert list(pd.to_datetime(x_vals)) == [pd.Timestamp("2024-01-01")]
+    assert (y_mean.tolist(), y_min.tolist(), y_max.tolist()) == ([4.0], [4.0], [4.0])
@@ -0,0 +1,73 @@
+# test_data_loader.py
+#
+#     python -m pytest tests
+
+import os
+import sys
+
+import pandas as pd
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
+
+from LIB import data_loader  # noqa: E402
+
+
+def test_kolom_campuran_tanpa_snapshot(tmp_path):
+    """Kolom berisi angka dan teks tidak bisa ditulis ke Arrow: data tetap dimuat dari memori."""
+    workbook = tmp_path / "campuran.xlsx"
+    pd.DataFrame({"KODE": [123, "ABC-1", 7], "JUMLAH": [1, 2, 3]}).to_excel(workbook, index=False)
+    cache_dir = tmp_path / "cache"
+
+    try:
+        df = data_loader.load_tabel(str(workbook), pd.read_excel, cache_dir=str(cache_dir))
+        proyeksi = data_loader.load_tabel(str(workbook), pd.read_excel,
+                                          cache_dir=str(cache_dir), kolom=["JUMLAH"])
+    finally:
+        data_loader.clear_cache()
+
+    assert df["KODE"].tolist() == [123, "ABC-1", 7]
+    assert proyeksi.columns.tolist() == ["JUMLAH"]
+    assert proyeksi["JUMLAH"].tolist() == [1, 2, 3]
+    # snapshot (dan file .tmp-nya) tidak tertinggal
+    assert not any(nama.endswith((".arrow", ".tmp")) for nama in os.listdir(cache_dir))
+
+
+def test_snapshot_terpotong_dibangun_ulang(tmp_path):
+    """Snapshot .arrow yang terpotong tidak membuat muat gagal: workbook di-parse ulang."""
+    workbook = tmp_path / "data.xlsx"
+    pd.DataFrame({"KODE": ["a", "b", "c"], "JUMLAH": [1, 2, 3]}).to_excel(workbook, index=False)
+    cache_dir = tmp_path / "cache"
+
+    try:
+        data_loader.load_tabel(str(workbook), pd.read_excel, cache_dir=str(cache_dir))
+        arrow_path, _ = data_loader._snapshot_paths(str(workbook), str(cache_dir))
+        with open(arrow_path, "r+b") as f:
+            f.truncate(16)
+        data_loader.clear_cache()
+
+        df = data_loader.load_tabel(str(workbook), pd.read_excel, cache_dir=str(cache_dir))
+    finally:
+        data_loader.clear_cache()
+
+    assert df["JUMLAH"].tolist() == [1, 2, 3]
+    assert data_loader.verifikasi_snapshot(str(workbook), str(cache_dir)) == []
+
+
+def test_build_gagal_tidak_mengembalikan_meta_lama(tmp_path):
+    """Workbook berubah dan snapshot baru gagal ditulis: build melapor gagal, bukan meta lama."""
+    workbook = tmp_path / "data.xlsx"
+    cache_dir = tmp_path / "cache"
+    tanggal = pd.to_datetime(["2024-01-01", "2024-02-01"])
+    pd.DataFrame({"TANGGAL": tanggal, "KODE": ["a", "b"]}).to_excel(workbook, index=False)
+
+    try:
+        assert data_loader.bangun_snapshot(str(workbook), cache_dir=str(cache_dir)) is not None
+
+        pd.DataFrame({"TANGGAL": tanggal, "KODE": [123, "ABC-1"]}).to_excel(workbook, index=False)
+        assert data_loader.bangun_snapshot(str(workbook), cache_dir=str(cache_dir)) is None
+        assert data_loader.main(["build", "--data", str(workbook), "--bedah", "",
+                                 "--cache-dir", str(cache_dir)]) == 1
+    finally:
+        data_loader.clear_cache()